@@ -0,0 +1,63 @@
+"""Benchmark the overhead of every simulator instrumentation level.
+
+Logs at INFO to os.devnull, so enabled levels pay the full formatting and
+handler cost without flooding the terminal. "trace" traces every match,
+the worst case of sampled tracing. "profile" times every phase of the run.
+
+Usage:
+    python benchmarks/instrumentation.py [number_of_simulations]
+"""
+
+import logging
+import os
+import sys
+import time
+
+from tennis_simulator.simulation.simulator import INSTRUMENTATION_LEVELS, simulator
+
+
+def main(number_of_simulations: int = 5000, repeats: int = 5) -> None:
+    # Warm up the transition table and caches outside the timed runs
+    simulator(0.6, seed=1).run_simulation(100, engine="scalar")
+
+    configurations = {
+        level: {"instrumentation": level} for level in INSTRUMENTATION_LEVELS
+    }
+    configurations["profile"] = {"profile": True}
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    with open(os.devnull, "w") as devnull:
+        handler = logging.StreamHandler(devnull)
+        root.addHandler(handler)
+        try:
+            timings = _time_configurations(
+                configurations, number_of_simulations, repeats
+            )
+        finally:
+            root.removeHandler(handler)
+
+    for level, seconds in timings.items():
+        overhead = seconds / timings["off"] - 1
+        print(
+            f"{level:>8}: {number_of_simulations / seconds:10.0f} matches/s "
+            f"({overhead:+.1%} time vs off)"
+        )
+
+
+def _time_configurations(
+    configurations: dict[str, dict], number_of_simulations: int, repeats: int
+) -> dict[str, float]:
+    # Interleave the levels so drift in machine load affects all of them
+    timings = dict.fromkeys(configurations, float("inf"))
+    for _ in range(repeats):
+        for level, options in configurations.items():
+            simulation = simulator(0.6, seed=1, trace_every=1, **options)
+            start = time.perf_counter()
+            simulation.run_simulation(number_of_simulations, engine="scalar")
+            timings[level] = min(timings[level], time.perf_counter() - start)
+    return timings
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:2]))
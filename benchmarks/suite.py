@@ -0,0 +1,260 @@
+"""Throughput and memory benchmarks for scoring and simulation.
+
+Every case runs in a fresh process, so the reported peak resident memory
+belongs to that case alone. Results are written as JSON with sorted keys
+and one case per entry, which keeps runs easy to diff and compare.
+
+Usage:
+    python benchmarks/suite.py --output benchmarks/results.json
+    python benchmarks/suite.py --sizes 1000 10000 --compare old.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from tennis_simulator.simulation.simulator import simulator
+from tennis_simulator.tennis_scoring.tennis_score import TennisScore
+
+WINRATES = (0.5, 0.6, 0.9)
+BEST_OF_SETS = (3, 5)
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+ENGINES = ("scalar", "batch", "hierarchical")
+# The scalar engine takes minutes for a million matches
+MAX_SCALAR_SIZE = 100_000
+# Points played per case of the scoring benchmark
+SCORING_POINTS = 200_000
+# Fast cases are repeated within this budget, keeping the best time
+REPEAT_SECONDS = 1.0
+MAX_REPEATS = 5
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident memory of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS bytes
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _best_time(function: Callable[[], Any]) -> tuple[float, Any]:
+    """Best wall time of a deterministic function over a few repeats.
+
+    Args:
+        function (Callable[[], Any]): Function to time.
+
+    Returns:
+        tuple[float, Any]: Best time in seconds and the function result.
+    """
+    best, spent = float("inf"), 0.0
+    for _ in range(MAX_REPEATS):
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        best, spent = min(best, seconds), spent + seconds
+        if spent >= REPEAT_SECONDS:
+            break
+    return best, result
+
+
+def _play_points(points: list[int], best_of_sets: int) -> int:
+    """Play a fixed point sequence through TennisScore.
+
+    Args:
+        points (list[int]): Player id of the winner of every point.
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        int: Number of completed matches.
+    """
+    matches = 0
+    tennis_score = TennisScore(best_of_sets=best_of_sets)
+    for point in points:
+        tennis_score.win_point(point)
+        if tennis_score.winner_id is not None:
+            matches += 1
+            tennis_score = TennisScore(best_of_sets=best_of_sets)
+    return matches
+
+
+def _simulate(case: dict[str, Any]) -> dict[str, Any]:
+    """Run the simulation of a case.
+
+    Args:
+        case (dict[str, Any]): Engine, win rate, best_of_sets and size.
+
+    Returns:
+        dict[str, Any]: Statistics of the simulation.
+    """
+    simulation = simulator(case["winrate"], best_of_sets=case["best_of_sets"], seed=1)
+    simulation.run_simulation(case["size"], engine=case["engine"])
+    return simulation.statistics
+
+
+def _run_case(case: dict[str, Any]) -> dict[str, Any]:
+    """Run one benchmark case. Called in a fresh worker process.
+
+    Args:
+        case (dict[str, Any]): Kind, engine, win rate, best_of_sets and size.
+
+    Returns:
+        dict[str, Any]: The case with its timing and memory measurements.
+    """
+    # Warm up imports and the transition table outside the timed section
+    simulator(case["winrate"], best_of_sets=case["best_of_sets"]).run_simulation(10)
+    baseline_rss_mb = _peak_rss_mb()
+
+    if case["kind"] == "scoring":
+        rng = random.Random(1)
+        winrate = case["winrate"]
+        points = [0 if rng.random() < winrate else 1 for _ in range(case["size"])]
+        seconds, matches = _best_time(
+            lambda: _play_points(points, case["best_of_sets"])
+        )
+        number_of_points = case["size"]
+    else:
+        seconds, statistics = _best_time(lambda: _simulate(case))
+        matches = statistics["number_of_matches"]
+        number_of_points = (
+            statistics["player_1_total_points_won"]
+            + statistics["player_2_total_points_won"]
+        )
+
+    return {
+        **case,
+        "seconds": round(seconds, 4),
+        "matches_per_sec": round(matches / seconds, 1),
+        "points_per_sec": round(number_of_points / seconds, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "baseline_rss_mb": round(baseline_rss_mb, 1),
+    }
+
+
+def _case_id(case: dict[str, Any]) -> str:
+    """Stable identifier of a case, used to compare runs."""
+    return (
+        f"{case['kind']}/{case['engine']}/p={case['winrate']}"
+        f"/bo{case['best_of_sets']}/n={case['size']}"
+    )
+
+
+def plan_cases(
+    sizes: list[int], engines: list[str], max_scalar_size: int
+) -> list[dict[str, Any]]:
+    """Build the benchmark grid.
+
+    Args:
+        sizes (list[int]): Numbers of matches per simulation case.
+        engines (list[str]): Simulation engines to benchmark.
+        max_scalar_size (int): Largest size run with the scalar engine.
+
+    Returns:
+        list[dict[str, Any]]: Cases in the order they are run.
+    """
+    cases = []
+    for winrate in WINRATES:
+        for best_of_sets in BEST_OF_SETS:
+            cases.append(
+                {
+                    "kind": "scoring",
+                    "engine": "scalar",
+                    "winrate": winrate,
+                    "best_of_sets": best_of_sets,
+                    "size": SCORING_POINTS,
+                }
+            )
+            for engine in engines:
+                for size in sizes:
+                    if engine == "scalar" and size > max_scalar_size:
+                        continue
+                    cases.append(
+                        {
+                            "kind": "simulation",
+                            "engine": engine,
+                            "winrate": winrate,
+                            "best_of_sets": best_of_sets,
+                            "size": size,
+                        }
+                    )
+    return cases
+
+
+def run_suite(cases: list[dict[str, Any]]) -> dict[str, Any]:
+    """Run every case in its own process.
+
+    Args:
+        cases (list[dict[str, Any]]): Cases from `plan_cases`.
+
+    Returns:
+        dict[str, Any]: Environment metadata and the results per case.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        for result in pool.imap(_run_case, cases):
+            print(
+                f"{_case_id(result):<40} {result['matches_per_sec']:>12.0f} matches/s "
+                f"{result['points_per_sec']:>12.0f} points/s "
+                f"{result['peak_rss_mb']:>8.1f} MiB",
+                flush=True,
+            )
+            results.append({"id": _case_id(result), **result})
+
+    return {
+        "metadata": {
+            "created": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": multiprocessing.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], previous: dict[str, Any]) -> None:
+    """Print the point throughput change of every case found in both runs.
+
+    Args:
+        current (dict[str, Any]): Report of this run.
+        previous (dict[str, Any]): Report of an earlier run.
+    """
+    before = {result["id"]: result for result in previous["results"]}
+    for result in current["results"]:
+        if result["id"] not in before:
+            continue
+        change = result["points_per_sec"] / before[result["id"]]["points_per_sec"]
+        print(f"{result['id']:<40} {change - 1:+8.1%} points/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES))
+    parser.add_argument("--max-scalar-size", type=int, default=MAX_SCALAR_SIZE)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    arguments = parser.parse_args()
+
+    report = run_suite(
+        plan_cases(arguments.sizes, arguments.engines, arguments.max_scalar_size)
+    )
+    if arguments.output is not None:
+        arguments.output.parent.mkdir(parents=True, exist_ok=True)
+        arguments.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    if arguments.compare is not None:
+        compare(report, json.loads(arguments.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
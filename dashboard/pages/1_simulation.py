@@ -1,8 +1,30 @@
+import json
+
 import streamlit as st
 
+from tennis_simulator.simulation.cache import ResultCache
+from tennis_simulator.simulation.jobs import JobRunner, JobStatus
 from tennis_simulator.simulation.simulator import simulator
 
 
+# Seconds between two refreshes of a running job
+POLL_INTERVAL = 0.5
+# Matches per shard of dashboard jobs, so progress is reported often
+DASHBOARD_SHARD_SIZE = 2_000
+
+
+@st.cache_resource
+def job_runner() -> JobRunner:
+    """One runner per server process, shared by page reruns and sessions."""
+    return JobRunner(max_jobs=2)
+
+
+@st.cache_resource
+def result_cache() -> ResultCache:
+    """Results of earlier seeded runs, kept on disk between sessions."""
+    return ResultCache()
+
+
 st.title("Tennis Match Simulator")
 
 # Input: Player 1 point win rate
@@ -15,17 +37,131 @@ st.number_input(
     key="p1_point_win_rate",
 )
 
-# Number of simulations
-num_simulations = st.number_input(
-    "Number of Simulations", min_value=1, key="num_simulations", value=1000, step=1
+# Runs with the same seed and inputs are answered from the result cache
+st.number_input("Seed", min_value=0, value=0, step=1, key="seed")
+
+# Either a fixed number of simulations or a target precision
+mode = st.radio(
+    "Stopping rule", ["Target precision", "Number of simulations"], horizontal=True
 )
+if mode == "Target precision":
+    target_precision = st.number_input(
+        "Target precision of the match win rate (+- %, 95% confidence)",
+        min_value=0.05,
+        max_value=10.0,
+        value=0.5,
+        step=0.05,
+        key="target_precision",
+    )
+else:
+    num_simulations = st.number_input(
+        "Number of Simulations", min_value=1, key="num_simulations", value=1000, step=1
+    )
+
+# Time every phase of the run and show the report next to the results
+st.checkbox("Profile the run", key="profile")
 
-# Button to run simulation
+# Button to start a simulation job; the job keeps running across reruns
 if st.button("Run Simulation"):
-    with st.spinner("Running simulations..."):
-        # Initialize and run the simulator
-        simulation = simulator(winrate_player_1=st.session_state.p1_point_win_rate)
-        simulation.run_simulation(number_of_simulations=num_simulations)
+    simulation = simulator(
+        winrate_player_1=st.session_state.p1_point_win_rate,
+        seed=st.session_state.seed,
+        profile=st.session_state.profile,
+    )
+    if mode == "Target precision":
+        st.session_state.job_id = job_runner().submit(
+            simulation,
+            number_of_simulations=10_000_000,
+            adaptive=True,
+            target_half_width=target_precision / 100,
+            batch_size=DASHBOARD_SHARD_SIZE,
+        )
+    else:
+        st.session_state.job_id = job_runner().submit(
+            simulation,
+            number_of_simulations=num_simulations,
+            engine="batch",
+            shard_size=DASHBOARD_SHARD_SIZE,
+            cache=result_cache(),
+        )
+    st.session_state.win_rate_history = []
+
+
+def show_job() -> None:
+    """Show the job of this session, polling it only while it runs."""
+    job_id = st.session_state.get("job_id")
+    if job_id is None:
+        return
+    status = job_runner().status(job_id)
+    if status.finished:
+        show_status(job_id, status)
+    else:
+        poll_job(job_id)
+
+
+@st.fragment(run_every=POLL_INTERVAL)
+def poll_job(job_id: str) -> None:
+    """Refresh a running job until it finishes."""
+    status = job_runner().status(job_id)
+    if status.finished:
+        # The page draws the final state once, outside this polling fragment
+        st.rerun()
+    show_status(job_id, status)
+
+
+def show_status(job_id: str, status: JobStatus) -> None:
+    """Show the progress and the statistics so far of a job."""
+    statistics = status.statistics
+
+    st.progress(status.progress, text=f"{status.state}: {status.completed} matches")
+    if not status.finished and st.button("Cancel"):
+        job_runner().cancel(job_id)
+    if status.error:
+        st.error(status.error)
+
+    if statistics.get("number_of_matches"):
+        win_rate = statistics["player_1_wins"] / statistics["number_of_matches"]
+        history = st.session_state.win_rate_history
+        if not history or history[-1]["matches"] != statistics["number_of_matches"]:
+            history.append(
+                {"matches": statistics["number_of_matches"], "win rate": win_rate}
+            )
+        st.metric("Player 1 match win rate", f"{win_rate:.2%}")
+        st.line_chart(history, x="matches", y="win rate")
+
+    if status.finished:
+        report = statistics.get("profile")
+        if report is None:
+            # Display results
+            st.write(statistics)
+            return
+        results, profile = st.columns(2)
+        with results:
+            st.write(
+                {key: value for key, value in statistics.items() if key != "profile"}
+            )
+        with profile:
+            show_profile(report)
+
+
+def show_profile(report: dict) -> None:
+    """Show the throughput and phase timings of a profiled run."""
+    st.metric("Matches per second", f"{report['matches_per_second']:,.0f}")
+    st.metric("Points per second", f"{report['points_per_second']:,.0f}")
+    st.dataframe(
+        [{"phase": phase, **timing} for phase, timing in report["phases"].items()],
+        hide_index=True,
+    )
+    st.caption(
+        f"{report['shards']} shards in {report['wall_seconds']:.3f} s, "
+        f"garbage collections per generation: {report['gc_collections']}"
+    )
+    st.download_button(
+        "Download profile (JSON)",
+        json.dumps(report, indent=2),
+        file_name="profile.json",
+        mime="application/json",
+    )
+
 
-        # Display results
-        st.write(simulation.statistics)
+show_job()
@@ -0,0 +1,243 @@
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from tennis_simulator.analysis.confidence import z_value
+from tennis_simulator.analysis.distributions import set_score_derivatives
+from tennis_simulator.analysis.markov import (
+    match_win_derivatives,
+    match_win_probabilities,
+)
+
+# Win rates of the cached grids that start the Newton iterations
+CALIBRATION_GRID_SIZE = 2049
+# Newton steps below this size end a calibration
+CALIBRATION_TOLERANCE = 1e-12
+MAX_NEWTON_STEPS = 50
+
+
+@dataclass(frozen=True)
+class ScoreLineFit:
+    """Maximum likelihood point win rate of a set of score lines.
+
+    Attributes:
+        winrate_player_1 (float): Fitted probability that player 1 wins a
+            point.
+        standard_error (float): Standard error from the observed
+            information, NaN if the fit is on the boundary 0 or 1.
+        log_likelihood (float): Log likelihood of the score lines at the
+            fitted win rate.
+        number_of_matches (int): Number of score lines fitted.
+    """
+
+    winrate_player_1: float
+    standard_error: float
+    log_likelihood: float
+    number_of_matches: int
+
+    def interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        """Wald interval of the fitted win rate, clipped to [0, 1].
+
+        Args:
+            confidence (float): Confidence level between 0 and 1.
+
+        Returns:
+            tuple[float, float]: Lower and upper bound of the interval.
+        """
+        half_width = z_value(confidence) * self.standard_error
+        return (
+            max(self.winrate_player_1 - half_width, 0.0),
+            min(self.winrate_player_1 + half_width, 1.0),
+        )
+
+
+def implied_probability(odds_player_1: float, odds_player_2: float) -> float:
+    """Match win probability of player 1 implied by decimal odds.
+
+    The bookmaker margin is removed by scaling both implied probabilities
+    to sum to one.
+
+    Args:
+        odds_player_1 (float): Decimal odds of player 1 winning.
+        odds_player_2 (float): Decimal odds of player 2 winning.
+
+    Returns:
+        float: Match win probability of player 1.
+    """
+    if odds_player_1 < 1 or odds_player_2 < 1:
+        raise ValueError("Decimal odds must be at least 1")
+    return (1 / odds_player_1) / (1 / odds_player_1 + 1 / odds_player_2)
+
+
+@lru_cache(maxsize=8)
+def _match_curve(best_of_sets: int) -> tuple[np.ndarray, np.ndarray]:
+    """Match win probability on a grid of point win rates, built once.
+
+    Args:
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Point win rates and match win
+            probabilities, both increasing.
+    """
+    grid = np.linspace(0.0, 1.0, CALIBRATION_GRID_SIZE)
+    return grid, match_win_probabilities(grid, best_of_sets)
+
+
+def calibrate_winrate(
+    match_probability: float | np.ndarray, best_of_sets: int = 3
+) -> float | np.ndarray:
+    """Point win rate of player 1 that gives a target match win probability.
+
+    The match win probability increases with the point win rate. The
+    cached grid gives a start within a grid step, and a few Newton steps
+    with exact slopes from `match_win_derivatives` polish it to rounding.
+    Many targets, e.g. all markets of a day, are solved together.
+
+    Args:
+        match_probability (float | np.ndarray): Target probability that
+            player 1 wins the match, e.g. from `implied_probability`.
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        float | np.ndarray: Point win rate per target, a float for a float.
+    """
+    targets = np.asarray(match_probability, dtype=np.float64)
+    if np.any((targets < 0) | (targets > 1)):
+        raise ValueError("Match probability must be between 0 and 1")
+
+    grid, curve = _match_curve(best_of_sets)
+    winrates = np.interp(targets, curve, grid)
+    for _ in range(MAX_NEWTON_STEPS):
+        match, slope = match_win_derivatives(winrates, best_of_sets)
+        # The curve is flat at 0 and 1, where the grid start is exact
+        step = np.divide(
+            match - targets, slope, out=np.zeros_like(winrates), where=slope > 0
+        )
+        winrates = np.clip(winrates - step, 0.0, 1.0)
+        if np.all(np.abs(step) <= CALIBRATION_TOLERANCE):
+            break
+    return float(winrates) if winrates.ndim == 0 else winrates
+
+
+def _set_score_counts(
+    score_lines: Iterable[str], games: np.ndarray, best_of_sets: int
+) -> tuple[np.ndarray, int]:
+    """Count how often every set score occurs in complete score lines.
+
+    Sets are independent given the point win rate, so these counts are all
+    the likelihood needs.
+
+    Args:
+        score_lines (Iterable[str]): Score lines such as "6-4,3-6,7-6,".
+        games (np.ndarray): Games of both players per set score.
+        best_of_sets (int): Maximum number of sets of every match.
+
+    Returns:
+        tuple[np.ndarray, int]: Count per set score and number of matches.
+    """
+    outcomes = {(int(first), int(second)): k for k, (first, second) in enumerate(games)}
+    sets_to_win = best_of_sets // 2 + 1
+    lines = Counter(score_lines)
+    counts = np.zeros(len(games))
+    for line, count in lines.items():
+        sets_won = [0, 0]
+        for set_score in line.rstrip(",").split(","):
+            try:
+                first, second = (int(value) for value in set_score.split("-"))
+                outcome = outcomes[first, second]
+            except (KeyError, ValueError):
+                raise ValueError(f"Invalid set score in {line!r}") from None
+            if max(sets_won) == sets_to_win:
+                raise ValueError(f"Sets after the end of the match in {line!r}")
+            sets_won[first < second] += 1
+            counts[outcome] += count
+        if max(sets_won) != sets_to_win:
+            raise ValueError(f"Incomplete best of {best_of_sets} match {line!r}")
+    return counts, lines.total()
+
+
+def _log_likelihood(
+    counts: np.ndarray, winrates: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Log likelihood of set score counts and its slope per win rate.
+
+    Args:
+        counts (np.ndarray): Count per set score.
+        winrates (np.ndarray): Point win rates of player 1.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Log likelihood and its derivative.
+    """
+    _, probabilities, slopes = set_score_derivatives(winrates)
+    # Set scores that never occur do not constrain the win rate
+    observed = counts > 0
+    counts, probabilities, slopes = (
+        counts[observed],
+        probabilities[observed],
+        slopes[observed],
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Rounding leaves tiny negative probabilities near 0 and 1
+        log_likelihood = counts @ np.log(np.maximum(probabilities, 0.0))
+        slope = counts @ (slopes / probabilities)
+    return log_likelihood, slope
+
+
+def fit_score_lines(score_lines: Iterable[str], best_of_sets: int = 3) -> ScoreLineFit:
+    """Fit the point win rate of player 1 to historical score lines.
+
+    Given the point win rate, the sets of a match are independent, so the
+    likelihood of all score lines is a product over their sets and only
+    depends on how often every set score occurs. The log likelihood is
+    evaluated for a whole grid of win rates at once, and Newton steps on
+    its exact slope refine the best grid point.
+
+    Args:
+        score_lines (Iterable[str]): Complete score lines in the format of
+            `TennisScore.match_result()`, e.g. "6-4,3-6,7-6,", from the view
+            of player 1.
+        best_of_sets (int): Maximum number of sets of every match.
+
+    Returns:
+        ScoreLineFit: Fitted win rate, its standard error and likelihood.
+    """
+    grid = np.linspace(0.0, 1.0, CALIBRATION_GRID_SIZE)
+    games, _, _ = set_score_derivatives(grid[:1])
+    counts, number_of_matches = _set_score_counts(score_lines, games, best_of_sets)
+    if not number_of_matches:
+        raise ValueError("At least one score line is needed")
+
+    log_likelihood, _ = _log_likelihood(counts, grid)
+    best = int(np.argmax(log_likelihood))
+    winrate = float(grid[best])
+    if 0 < best < len(grid) - 1:
+        # The maximum lies between the neighbours of the best grid point
+        lower, upper = grid[best - 1], grid[best + 1]
+        # Central difference of the exact slope for the curvature
+        delta = 1e-6
+        for _ in range(MAX_NEWTON_STEPS):
+            _, slopes = _log_likelihood(
+                counts, np.array([winrate, winrate - delta, winrate + delta])
+            )
+            curvature = (slopes[2] - slopes[1]) / (2 * delta)
+            if curvature >= 0:
+                break
+            step = slopes[0] / curvature
+            winrate = float(np.clip(winrate - step, lower, upper))
+            if abs(step) <= CALIBRATION_TOLERANCE:
+                break
+        standard_error = float(np.sqrt(-1 / curvature)) if curvature < 0 else np.nan
+    else:
+        standard_error = np.nan
+
+    log_likelihood, _ = _log_likelihood(counts, np.array([winrate]))
+    return ScoreLineFit(
+        winrate_player_1=winrate,
+        standard_error=standard_error,
+        log_likelihood=float(log_likelihood[0]),
+        number_of_matches=number_of_matches,
+    )
@@ -0,0 +1,46 @@
+import math
+from statistics import NormalDist
+
+
+def z_value(confidence: float = 0.95) -> float:
+    """Two-sided standard normal quantile for a confidence level.
+
+    Args:
+        confidence (float): Confidence level between 0 and 1, e.g. 0.95.
+
+    Returns:
+        float: Quantile z such that P(|Z| <= z) = confidence.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(
+    successes: int, trials: int, confidence: float = 0.95
+) -> tuple[float, float]:
+    """Wilson score interval for a binomial proportion.
+
+    Unlike the normal approximation it stays inside [0, 1] and does not
+    collapse to a point when all or no trials succeed.
+
+    Args:
+        successes (int): Number of successful trials.
+        trials (int): Number of trials.
+        confidence (float): Confidence level between 0 and 1.
+
+    Returns:
+        tuple[float, float]: Lower and upper bound of the interval.
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = z_value(confidence)
+    proportion = successes / trials
+    denominator = 1 + z**2 / trials
+    center = (proportion + z**2 / (2 * trials)) / denominator
+    half_width = (
+        z
+        * math.sqrt(proportion * (1 - proportion) / trials + z**2 / (4 * trials**2))
+        / denominator
+    )
+    return max(0.0, center - half_width), min(1.0, center + half_width)
@@ -0,0 +1,230 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from tennis_simulator.analysis.markov import COMPLEX_STEP
+
+# Number of win rates whose distributions are kept
+DISTRIBUTION_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class RaceDistribution:
+    """Exact distribution of a race to `target` points won by two.
+
+    A race ends with the loser on L < target - 1 points, or at deuce
+    (target - 1 all) followed by k returns to deuce. Points conditional on
+    the winner are therefore a category (a loser score, or deuce) plus a
+    geometric number of returns that does not depend on the winner.
+
+    Attributes:
+        target (int): Points needed to win, 4 for games and 7 for tiebreaks.
+        win (float): Probability that player 1 wins the race.
+        conditional (np.ndarray): Probability of each category given the
+            winner, shape (2, target). Row 0 is for player 1 winning, row 1
+            for player 2. Column L < target - 1 is a win with the loser on L
+            points. The last column is a win from deuce.
+        deuce_resolved (float): Probability that the two points after deuce
+            decide the race (p^2 + q^2).
+    """
+
+    target: int
+    win: float
+    conditional: np.ndarray
+    deuce_resolved: float
+
+
+@dataclass(frozen=True)
+class SetDistribution:
+    """Exact distribution of set score lines.
+
+    Attributes:
+        games (np.ndarray): Games of both players per outcome, shape (k, 2).
+        probabilities (np.ndarray): Probability of every outcome.
+        tiebreak_winner (np.ndarray): Winner of the tiebreak per outcome:
+            0 or 1, or -1 if the set had no tiebreak.
+    """
+
+    games: np.ndarray
+    probabilities: np.ndarray
+    tiebreak_winner: np.ndarray
+
+
+@dataclass(frozen=True)
+class SubMatchDistributions:
+    """Cached game, tiebreak and set distributions of one point win rate.
+
+    Attributes:
+        winrate_player_1 (float): Probability that player 1 wins a point.
+        game (RaceDistribution): Points of a game given its winner.
+        tiebreak (RaceDistribution): Points of a tiebreak given its winner.
+        set (SetDistribution): Set score lines.
+    """
+
+    winrate_player_1: float
+    game: RaceDistribution
+    tiebreak: RaceDistribution
+    set: SetDistribution
+
+
+def race_distribution(winrate: float, target: int) -> RaceDistribution:
+    """Distribution of a race to `target` points that must be won by two.
+
+    Args:
+        winrate (float): Probability that player 1 wins a point.
+        target (int): Number of points needed to win.
+
+    Returns:
+        RaceDistribution: Win probability and categories given the winner.
+    """
+    lose_rate = 1 - winrate
+    deuce_resolved = winrate**2 + lose_rate**2
+    reach_deuce = comb(2 * target - 2, target - 1) * (winrate * lose_rate) ** (
+        target - 1
+    )
+
+    joint = np.zeros((2, target))
+    for row, (rate, other) in enumerate(((winrate, lose_rate), (lose_rate, winrate))):
+        for loser in range(target - 1):
+            joint[row, loser] = (
+                comb(target - 1 + loser, loser) * rate**target * other**loser
+            )
+        joint[row, -1] = reach_deuce * rate**2 / deuce_resolved
+
+    totals = joint.sum(axis=1, keepdims=True)
+    # A winner that never wins has no conditional distribution; any valid
+    # distribution will do since it is never sampled
+    conditional = np.divide(
+        joint, totals, out=np.eye(1, target).repeat(2, axis=0), where=totals > 0
+    )
+    return RaceDistribution(
+        target=target,
+        win=float(totals[0, 0]),
+        conditional=conditional,
+        deuce_resolved=deuce_resolved,
+    )
+
+
+def _race_win(winrate: np.ndarray, target: int) -> np.ndarray:
+    """Probability that player 1 wins a race, for arrays of win rates.
+
+    Args:
+        winrate (np.ndarray): Probabilities that player 1 wins a point, real
+            or complex.
+        target (int): Number of points needed to win.
+
+    Returns:
+        np.ndarray: Win probability of player 1 per win rate.
+    """
+    lose_rate = 1 - winrate
+    reach_deuce = comb(2 * target - 2, target - 1) * (winrate * lose_rate) ** (
+        target - 1
+    )
+    win = reach_deuce * winrate**2 / (winrate**2 + lose_rate**2)
+    for loser in range(target - 1):
+        win = win + comb(target - 1 + loser, loser) * winrate**target * lose_rate**loser
+    return win
+
+
+def set_score_derivatives(
+    winrates_player_1: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Set score probabilities and their slopes for many point win rates.
+
+    The slopes come from complex-step differentiation, as in
+    `match_win_derivatives`.
+
+    Args:
+        winrates_player_1 (np.ndarray): Point win rates of player 1, shape (n,).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Games of both players per
+            set score, shape (k, 2), and the probability of every set score
+            and its derivative per win rate, shape (k, n).
+    """
+    winrates = np.asarray(winrates_player_1, dtype=np.float64)
+    if np.any((winrates < 0) | (winrates > 1)):
+        raise ValueError("Win rate must be between 0 and 1")
+    shifted = winrates + COMPLEX_STEP * 1j
+    distribution = set_distribution(
+        _race_win(shifted, target=4), _race_win(shifted, target=7)
+    )
+    probabilities = distribution.probabilities
+    return (
+        distribution.games,
+        probabilities.real.copy(),
+        probabilities.imag / COMPLEX_STEP,
+    )
+
+
+def set_distribution(
+    game: float | np.ndarray, tiebreak: float | np.ndarray
+) -> SetDistribution:
+    """Distribution of set score lines with a tiebreak at 6-6.
+
+    Args:
+        game (float | np.ndarray): Probability that player 1 wins a game,
+            or an array of them.
+        tiebreak (float | np.ndarray): Probability that player 1 wins the
+            tiebreak, of the same shape as `game`.
+
+    Returns:
+        SetDistribution: Every possible set score and its probability, one
+            row per set score when given arrays.
+    """
+    lose = 1 - game
+    # Probability of reaching 5-5 and then 6-6
+    five_all = comb(10, 5) * (game * lose) ** 5
+    six_all = five_all * 2 * game * lose
+
+    games, probabilities, tiebreak_winner = [], [], []
+    for player, (rate, other, tiebreak_rate) in enumerate(
+        ((game, lose, tiebreak), (lose, game, 1 - tiebreak))
+    ):
+        outcomes = [
+            (6, loser, comb(5 + loser, loser) * rate**6 * other**loser, -1)
+            for loser in range(5)
+        ]
+        outcomes.append((7, 5, five_all * rate**2, -1))
+        outcomes.append((7, 6, six_all * tiebreak_rate, player))
+        for winner_games, loser_games, probability, tiebreak_player in outcomes:
+            games.append(
+                (winner_games, loser_games)
+                if player == 0
+                else (loser_games, winner_games)
+            )
+            probabilities.append(probability)
+            tiebreak_winner.append(tiebreak_player)
+
+    return SetDistribution(
+        games=np.array(games, dtype=np.int8),
+        probabilities=np.array(probabilities),
+        tiebreak_winner=np.array(tiebreak_winner, dtype=np.int8),
+    )
+
+
+@lru_cache(maxsize=DISTRIBUTION_CACHE_SIZE)
+def sub_match_distributions(winrate_player_1: float) -> SubMatchDistributions:
+    """Exact game, tiebreak and set distributions, memoized per win rate.
+
+    The least recently used win rates are evicted once more than
+    DISTRIBUTION_CACHE_SIZE win rates are cached.
+
+    Args:
+        winrate_player_1 (float): Probability that player 1 wins a point.
+
+    Returns:
+        SubMatchDistributions: Distributions for the hierarchical sampler.
+    """
+    if not 0 <= winrate_player_1 <= 1:
+        raise ValueError("Win rate must be between 0 and 1")
+    game = race_distribution(winrate_player_1, target=4)
+    tiebreak = race_distribution(winrate_player_1, target=7)
+    return SubMatchDistributions(
+        winrate_player_1=winrate_player_1,
+        game=game,
+        tiebreak=tiebreak,
+        set=set_distribution(game.win, tiebreak.win),
+    )
@@ -0,0 +1,437 @@
+from dataclasses import dataclass
+from functools import cache, lru_cache
+from typing import Any
+
+import numpy as np
+
+# Imaginary step of complex-step derivatives. Far below rounding, since the
+# derivative does not come from a difference of nearby values.
+COMPLEX_STEP = 1e-20
+
+
+@dataclass(frozen=True)
+class MatchProbabilities:
+    """Exact win probabilities and expected lengths for player 1.
+
+    Attributes:
+        game (float): Probability that player 1 wins a game.
+        tiebreak (float): Probability that player 1 wins a tiebreak.
+        set (float): Probability that player 1 wins a set.
+        match (float): Probability that player 1 wins the match.
+        expected_game_points (float): Expected number of points in a game.
+        expected_tiebreak_points (float): Expected number of points in a tiebreak.
+        expected_set_games (float): Expected games in a set (a tiebreak counts
+            as one game, as in a 7-6 set score).
+        expected_set_points (float): Expected number of points in a set.
+        expected_match_sets (float): Expected number of sets in the match.
+        expected_match_games (float): Expected number of games in the match.
+        expected_match_points (float): Expected number of points in the match.
+    """
+
+    game: float
+    tiebreak: float
+    set: float
+    match: float
+    expected_game_points: float
+    expected_tiebreak_points: float
+    expected_set_games: float
+    expected_set_points: float
+    expected_match_sets: float
+    expected_match_games: float
+    expected_match_points: float
+
+
+def _race[Probability: float | np.ndarray](
+    winrate: Probability, target: int
+) -> tuple[Probability, Probability]:
+    """Solve a race to `target` points that must be won by two.
+
+    Used for games (first to 4) and tiebreaks (first to 7). The recursions
+    of this module only use arithmetic, so they solve one win rate as a
+    float or many at once as an array.
+
+    Args:
+        winrate (Probability): Probability that player 1 wins a point.
+        target (int): Number of points needed to win.
+
+    Returns:
+        tuple[Probability, Probability]: Win probability of player 1 and
+            expected points.
+    """
+    lose_rate = 1 - winrate
+    # At deuce two points in a row are needed: solve the geometric series
+    deuce_rate = winrate**2 + lose_rate**2
+    last = target - 1
+
+    win: list[list[Any]] = [[0.0] * target for _ in range(target)]
+    points: list[list[Any]] = [[0.0] * target for _ in range(target)]
+    win[last][last] = winrate**2 / deuce_rate
+    points[last][last] = 2 / deuce_rate
+
+    for player_1 in range(last, -1, -1):
+        for player_2 in range(last, -1, -1):
+            if player_1 == player_2 == last:
+                continue
+            win_after_point = 1.0 if player_1 == last else win[player_1 + 1][player_2]
+            win_after_loss = 0.0 if player_2 == last else win[player_1][player_2 + 1]
+            points_after_point = (
+                0.0 if player_1 == last else points[player_1 + 1][player_2]
+            )
+            points_after_loss = (
+                0.0 if player_2 == last else points[player_1][player_2 + 1]
+            )
+            win[player_1][player_2] = (
+                winrate * win_after_point + lose_rate * win_after_loss
+            )
+            points[player_1][player_2] = 1 + (
+                winrate * points_after_point + lose_rate * points_after_loss
+            )
+    return win[0][0], points[0][0]
+
+
+def _set[Probability: float | np.ndarray](
+    game: Probability, tiebreak: Probability
+) -> tuple[Probability, Probability, Probability]:
+    """Solve a set to six games with a tiebreak at 6-6.
+
+    Args:
+        game (Probability): Probability that player 1 wins a game.
+        tiebreak (Probability): Probability that player 1 wins the tiebreak.
+
+    Returns:
+        tuple[Probability, Probability, Probability]: Win probability of
+            player 1, expected number of regular games and probability of
+            reaching a tiebreak.
+    """
+
+    # Decided scores are plain floats, the others follow the type of `game`
+    @cache
+    def solve(games_1: int, games_2: int) -> tuple[Any, Any, Any]:
+        if games_1 >= 6 and games_1 - games_2 >= 2:
+            return 1.0, 0.0, 0.0
+        if games_2 >= 6 and games_2 - games_1 >= 2:
+            return 0.0, 0.0, 0.0
+        if games_1 == games_2 == 6:
+            return tiebreak, 0.0, 1.0
+
+        win_1, games_after_win, tiebreak_after_win = solve(games_1 + 1, games_2)
+        win_2, games_after_loss, tiebreak_after_loss = solve(games_1, games_2 + 1)
+        return (
+            game * win_1 + (1 - game) * win_2,
+            1 + game * games_after_win + (1 - game) * games_after_loss,
+            game * tiebreak_after_win + (1 - game) * tiebreak_after_loss,
+        )
+
+    return solve(0, 0)
+
+
+def _match[Probability: float | np.ndarray](
+    set_win: Probability, best_of_sets: int
+) -> tuple[Probability, Probability]:
+    """Solve a best of `best_of_sets` match.
+
+    Args:
+        set_win (Probability): Probability that player 1 wins a set.
+        best_of_sets (int): Maximum number of sets.
+
+    Returns:
+        tuple[Probability, Probability]: Win probability of player 1 and expected sets.
+    """
+    sets_to_win = (best_of_sets // 2) + 1
+
+    # Decided scores are plain floats, the others follow the type of `set_win`
+    @cache
+    def solve(sets_1: int, sets_2: int) -> tuple[Any, Any]:
+        if sets_1 == sets_to_win:
+            return 1.0, 0.0
+        if sets_2 == sets_to_win:
+            return 0.0, 0.0
+        win_1, sets_after_win = solve(sets_1 + 1, sets_2)
+        win_2, sets_after_loss = solve(sets_1, sets_2 + 1)
+        return (
+            set_win * win_1 + (1 - set_win) * win_2,
+            1 + set_win * sets_after_win + (1 - set_win) * sets_after_loss,
+        )
+
+    return solve(0, 0)
+
+
+@lru_cache(maxsize=4096)
+def solve_match(winrate_player_1: float, best_of_sets: int = 3) -> MatchProbabilities:
+    """Compute exact probabilities for the rules implemented by `TennisScore`.
+
+    Every point is won by player 1 with the same probability, so the score
+    is a Markov chain: games with deuce and advantage, sets to six games with
+    a tiebreak to seven at 6-6 and a best of `best_of_sets` match. Expected
+    lengths follow from Wald's identity, since every game, tiebreak and set
+    is independent of the ones before. Results are memoized per win rate.
+
+    Args:
+        winrate_player_1 (float): Probability that player 1 wins a point.
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        MatchProbabilities: Win probabilities and expected lengths.
+    """
+    if not 0 <= winrate_player_1 <= 1:
+        raise ValueError("Win rate must be between 0 and 1")
+
+    game, game_points = _race(winrate_player_1, target=4)
+    tiebreak, tiebreak_points = _race(winrate_player_1, target=7)
+    set_win, regular_games, tiebreak_reached = _set(game, tiebreak)
+    match, match_sets = _match(set_win, best_of_sets)
+
+    set_points = regular_games * game_points + tiebreak_reached * tiebreak_points
+    set_games = regular_games + tiebreak_reached
+    return MatchProbabilities(
+        game=game,
+        tiebreak=tiebreak,
+        set=set_win,
+        match=match,
+        expected_game_points=game_points,
+        expected_tiebreak_points=tiebreak_points,
+        expected_set_games=set_games,
+        expected_set_points=set_points,
+        expected_match_sets=match_sets,
+        expected_match_games=match_sets * set_games,
+        expected_match_points=match_sets * set_points,
+    )
+
+
+def match_win_probability(winrate_player_1: float, best_of_sets: int = 3) -> float:
+    """Exact probability that player 1 wins the match.
+
+    Args:
+        winrate_player_1 (float): Probability that player 1 wins a point.
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        float: Match win probability of player 1.
+    """
+    return solve_match(winrate_player_1, best_of_sets).match
+
+
+def match_win_probabilities(
+    winrates_player_1: np.ndarray, best_of_sets: int = 3
+) -> np.ndarray:
+    """Exact match win probabilities for many point win rates at once.
+
+    The recursions of `solve_match` only use arithmetic, so they are
+    evaluated on whole arrays instead of once per win rate.
+
+    Args:
+        winrates_player_1 (np.ndarray): Point win rates of player 1.
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        np.ndarray: Match win probability of player 1 per win rate.
+    """
+    winrates = np.asarray(winrates_player_1, dtype=np.float64)
+    if np.any((winrates < 0) | (winrates > 1)):
+        raise ValueError("Win rate must be between 0 and 1")
+
+    game, _ = _race(winrates, target=4)
+    tiebreak, _ = _race(winrates, target=7)
+    set_win, _, _ = _set(game, tiebreak)
+    match, _ = _match(set_win, best_of_sets)
+    return np.broadcast_to(match, winrates.shape).copy()
+
+
+def match_win_derivatives(
+    winrates_player_1: np.ndarray, best_of_sets: int = 3
+) -> tuple[np.ndarray, np.ndarray]:
+    """Match win probabilities and their slopes in the point win rate.
+
+    The recursions are evaluated at the complex win rates p + ih. For a
+    tiny step h the imaginary part is h times the derivative, so the slope
+    is exact to rounding (complex-step differentiation).
+
+    Args:
+        winrates_player_1 (np.ndarray): Point win rates of player 1.
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Match win probability of player 1 and
+            its derivative per win rate.
+    """
+    winrates = np.asarray(winrates_player_1, dtype=np.float64)
+    if np.any((winrates < 0) | (winrates > 1)):
+        raise ValueError("Win rate must be between 0 and 1")
+
+    shifted = winrates + COMPLEX_STEP * 1j
+    game, _ = _race(shifted, target=4)
+    tiebreak, _ = _race(shifted, target=7)
+    set_win, _, _ = _set(game, tiebreak)
+    match, _ = _match(set_win, best_of_sets)
+    match = np.broadcast_to(match, winrates.shape)
+    return match.real.copy(), match.imag / COMPLEX_STEP
+
+
+@dataclass(frozen=True)
+class ServeMatchProbabilities:
+    """Exact results of the serve-aware model for player 1.
+
+    Attributes:
+        hold_player_1 (float): Probability that player 1 wins a service game.
+        hold_player_2 (float): Probability that player 2 wins a service game.
+        tiebreak (tuple[float, float]): Probability that player 1 wins a
+            tiebreak, when player 1 or player 2 serves its first point.
+        set (tuple[float, float]): Probability that player 1 wins a set,
+            when player 1 or player 2 serves its first game.
+        match (float): Probability that player 1 wins the match.
+        expected_match_sets (float): Expected number of sets in the match.
+        expected_match_games (float): Expected number of games in the match.
+        expected_match_points (float): Expected number of points in the match.
+    """
+
+    hold_player_1: float
+    hold_player_2: float
+    tiebreak: tuple[float, float]
+    set: tuple[float, float]
+    match: float
+    expected_match_sets: float
+    expected_match_games: float
+    expected_match_points: float
+
+
+def _serve_tiebreak(first: float, second: float) -> tuple[float, float]:
+    """Solve a tiebreak where the serve changes after the first point and
+    then after every two points.
+
+    Args:
+        first (float): Probability that player 1 wins a point served by the
+            player serving the first point.
+        second (float): Probability that player 1 wins a point served by
+            the other player.
+
+    Returns:
+        tuple[float, float]: Win probability of player 1 and expected points.
+    """
+    # From 6-6 on, every pair of points is served once by each player
+    both = first * second
+    neither = (1 - first) * (1 - second)
+
+    @cache
+    def solve(points_1: int, points_2: int) -> tuple[float, float]:
+        if points_1 == 7:
+            return 1.0, 0.0
+        if points_2 == 7:
+            return 0.0, 0.0
+        if points_1 == points_2 == 6:
+            return both / (both + neither), 2 / (both + neither)
+        rate = first if (points_1 + points_2 + 1) // 2 % 2 == 0 else second
+        win_1, points_after_win = solve(points_1 + 1, points_2)
+        win_2, points_after_loss = solve(points_1, points_2 + 1)
+        return (
+            rate * win_1 + (1 - rate) * win_2,
+            1 + rate * points_after_win + (1 - rate) * points_after_loss,
+        )
+
+    return solve(0, 0)
+
+
+@lru_cache(maxsize=4096)
+def solve_serve_match(
+    serve_winrates: tuple[float, float],
+    best_of_sets: int = 3,
+    first_server: int = 0,
+) -> ServeMatchProbabilities:
+    """Compute exact probabilities when the point win rate depends on the server.
+
+    Games alternate the server, tiebreaks follow the serving order of
+    `TennisScore` and the receiver of the first tiebreak point serves the
+    next set. Sets are solved per first server, and the match tracks who
+    serves first in the next set. Expected lengths are computed directly by
+    the recursions.
+
+    Args:
+        serve_winrates (tuple[float, float]): Probability that player 1
+            wins a point on its own serve, and that player 2 wins a point on
+            its own serve.
+        best_of_sets (int): Maximum number of sets in a match.
+        first_server (int): Player id serving the first game (0 or 1).
+
+    Returns:
+        ServeMatchProbabilities: Win probabilities and expected lengths.
+    """
+    serve_1, serve_2 = serve_winrates
+    if not (0 <= serve_1 <= 1 and 0 <= serve_2 <= 1):
+        raise ValueError("Serve win rates must be between 0 and 1")
+    # Probability that player 1 wins a point, by server
+    rates = (serve_1, 1 - serve_2)
+    if rates[0] * rates[1] + (1 - rates[0]) * (1 - rates[1]) == 0:
+        raise ValueError("Matches never end when every point is won by one server")
+
+    # Probability that player 1 wins a game and expected points, by server
+    games = [_race(rate, target=4) for rate in rates]
+    tiebreaks = [_serve_tiebreak(rates[server], rates[1 - server]) for server in (0, 1)]
+
+    @cache
+    def solve_set(
+        set_server: int, games_1: int, games_2: int
+    ) -> tuple[tuple[float, ...], float, float]:
+        # Outcome probabilities by 2 * set winner + next set server, then
+        # expected points and games until the end of the set
+        played = games_1 + games_2
+        if max(games_1, games_2) >= 6 and abs(games_1 - games_2) >= 2:
+            outcome = [0.0] * 4
+            winner = 0 if games_1 > games_2 else 1
+            outcome[2 * winner + (set_server ^ played % 2)] = 1.0
+            return tuple(outcome), 0.0, 0.0
+        if games_1 == games_2 == 6:
+            win, points = tiebreaks[set_server]
+            outcome = [0.0] * 4
+            outcome[1 - set_server] = win
+            outcome[2 + 1 - set_server] = 1 - win
+            return tuple(outcome), points, 1.0
+
+        server = set_server ^ played % 2
+        win, points = games[server]
+        outcome_win, points_win, games_win = solve_set(set_server, games_1 + 1, games_2)
+        outcome_loss, points_loss, games_loss = solve_set(
+            set_server, games_1, games_2 + 1
+        )
+        return (
+            tuple(
+                win * after_win + (1 - win) * after_loss
+                for after_win, after_loss in zip(outcome_win, outcome_loss)
+            ),
+            points + win * points_win + (1 - win) * points_loss,
+            1 + win * games_win + (1 - win) * games_loss,
+        )
+
+    sets_to_win = (best_of_sets // 2) + 1
+
+    @cache
+    def solve(
+        sets_1: int, sets_2: int, set_server: int
+    ) -> tuple[float, float, float, float]:
+        # Win probability and expected sets, games and points until the end
+        if sets_1 == sets_to_win:
+            return 1.0, 0.0, 0.0, 0.0
+        if sets_2 == sets_to_win:
+            return 0.0, 0.0, 0.0, 0.0
+        outcome, set_points, set_games = solve_set(set_server, 0, 0)
+        win = sets = set_games_total = points = 0.0
+        for code, probability in enumerate(outcome):
+            if not probability:
+                continue
+            winner, next_server = divmod(code, 2)
+            after = solve(sets_1 + (winner == 0), sets_2 + (winner == 1), next_server)
+            win += probability * after[0]
+            sets += probability * after[1]
+            set_games_total += probability * after[2]
+            points += probability * after[3]
+        return win, 1 + sets, set_games + set_games_total, set_points + points
+
+    match, match_sets, match_games, match_points = solve(0, 0, first_server)
+    return ServeMatchProbabilities(
+        hold_player_1=games[0][0],
+        hold_player_2=1 - games[1][0],
+        tiebreak=(tiebreaks[0][0], tiebreaks[1][0]),
+        set=(sum(solve_set(0, 0, 0)[0][:2]), sum(solve_set(1, 0, 0)[0][:2])),
+        match=match,
+        expected_match_sets=match_sets,
+        expected_match_games=match_games,
+        expected_match_points=match_points,
+    )
@@ -1,9 +1,13 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from tennis_simulator.config.constants import SHARD_SIZE
 
 
 class TennisScoring(BaseModel):
     love: str
-    fiveen: str
+    fifteen: str
     thirty: str
     forty: str
 
@@ -15,5 +19,104 @@ class Simulation(BaseModel):
 
 
 class Config(BaseModel):
-    tennis_score: TennisScoring
+    tennis_scoring: TennisScoring
     simulation_parameters: Simulation
+
+
+class Scenario(BaseModel):
+    """One simulator run of a scenario file.
+
+    Attributes:
+        name (str | None): Label of the scenario in the results, by default
+            its position in the file.
+        winrate_player_1 (float): Probability that player 1 wins a point.
+        serve_winrates (tuple[float, float] | None): Probability that each
+            player wins a point on its own serve, replacing
+            `winrate_player_1` when given.
+        best_of_sets (int): Maximum number of sets in a match.
+        number_of_simulations (int): Number of matches to simulate.
+        seed (int | None): Seed of the run. Seeded runs use the result cache.
+        engine (str): Simulation engine of `simulator.run_simulation`.
+        estimator (str): Estimator of the match-win rate.
+        track_statistics (bool): Count deuces, breaks and tiebreaks per match.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str | None = None
+    winrate_player_1: float = Field(default=0.5, ge=0, le=1)
+    serve_winrates: tuple[float, float] | None = None
+    best_of_sets: Literal[1, 3, 5] = 3
+    number_of_simulations: int = Field(default=10_000, ge=1)
+    seed: int | None = None
+    engine: Literal["scalar", "batch", "hierarchical"] = "batch"
+    estimator: Literal["plain", "antithetic", "control_variate"] = "plain"
+    track_statistics: bool = False
+
+    @model_validator(mode="after")
+    def _check_serve_winrates(self) -> "Scenario":
+        """Reject serve win rates outside [0, 1]."""
+        if self.serve_winrates is not None and not all(
+            0 <= winrate <= 1 for winrate in self.serve_winrates
+        ):
+            raise ValueError("Serve win rates must be between 0 and 1")
+        return self
+
+    @model_validator(mode="after")
+    def _check_engine(self) -> "Scenario":
+        """Reject estimators and point models the engine cannot run."""
+        if self.engine == "hierarchical" and self.serve_winrates is not None:
+            raise ValueError("The hierarchical engine needs one point win rate")
+        if self.engine == "hierarchical" and self.track_statistics:
+            raise ValueError("The hierarchical engine cannot track statistics")
+        if self.estimator == "control_variate" and self.serve_winrates is not None:
+            raise ValueError("The control variate estimator needs one point win rate")
+        if self.estimator == "antithetic" and self.engine != "batch":
+            raise ValueError("The antithetic estimator needs the batch engine")
+        if self.estimator == "antithetic" and self.number_of_simulations % 2:
+            raise ValueError("The antithetic estimator needs an even match count")
+        return self
+
+
+class ScenarioFile(BaseModel):
+    """Scenarios to run together, with the settings they share.
+
+    `defaults` are applied to every scenario before it is validated, so
+    a file can list many scenarios that only differ in a few fields.
+
+    Attributes:
+        workers (int): Number of worker processes shared by all scenarios.
+        shard_size (int): Maximum number of matches per shard.
+        defaults (dict): Fields shared by all scenarios.
+        scenarios (list[Scenario]): Scenarios in the order of the file.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    workers: int = Field(default=1, ge=1)
+    shard_size: int = Field(default=SHARD_SIZE, ge=1)
+    defaults: dict = Field(default_factory=dict)
+    scenarios: list[Scenario] = Field(min_length=1)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _apply_defaults(cls, data: dict) -> dict:
+        """Fill every scenario with the defaults it does not override."""
+        if isinstance(data, dict) and isinstance(data.get("defaults"), dict):
+            data = dict(data)
+            data["scenarios"] = [
+                {**data["defaults"], **scenario}
+                if isinstance(scenario, dict)
+                else scenario
+                for scenario in data.get("scenarios") or []
+            ]
+        return data
+
+    @model_validator(mode="after")
+    def _check_shard_size(self) -> "ScenarioFile":
+        """Reject odd shards when a scenario plays antithetic pairs."""
+        if self.shard_size % 2 and any(
+            scenario.estimator == "antithetic" for scenario in self.scenarios
+        ):
+            raise ValueError("The antithetic estimator needs an even shard size")
+        return self
@@ -0,0 +1,3 @@
+# Matches per shard. Fixed so the shard plan, and therefore the random
+# streams, do not depend on the number of workers.
+SHARD_SIZE = 10_000
@@ -5,13 +5,15 @@ from pathlib import Path
 from typing import Any, Dict, List
 from pydantic import ValidationError
 
+from tennis_simulator.config.config import Config, ScenarioFile
+
 
 logger = logging.getLogger("config")
 
 
 class ConfigManager:
     def __init__(self, config_folder_path):
-        self._config = None
+        self._config: Config | None = None
         self.config_folder_path: Path = Path(config_folder_path)
         self.config_files: List[str] = ["simulation.yml", "tennis.yml"]
 
@@ -22,28 +24,22 @@ class ConfigManager:
             return
 
         # Init merged config
-        merged_config = {}
+        merged_config: dict[str, Any] = {}
 
         for config_file in self.config_files:
             config_path = self.config_folder_path / config_file
             # Check if file exists
             if not os.path.exists(config_path):
-                print(f"Warning: Config file not found: {config_path}")
+                logger.warning(f"Config file not found: {config_path}")
                 continue  # Skip to next file
 
-            # Load YAML file if possible
-            try:
-                with open(config_path, "r") as file:
-                    config_data = yaml.safe_load(file) or {}
-                logger.info(f"Successfully loaded config file: {config_path}")
-
-                if merge_strategy == "deep":
-                    merged_config = self._deep_merge(merged_config, config_data)
-                else:
-                    merged_config.update(config_data)
+            config_data = _read_yaml(config_path)
+            logger.info(f"Successfully loaded config file: {config_path}")
 
-            except yaml.YAMLError as e:
-                raise ValueError(f"Error parsing YAML file {config_path}: {e}")
+            if merge_strategy == "deep":
+                merged_config = self._deep_merge(merged_config, config_data)
+            else:
+                merged_config.update(config_data)
 
         # Ensure at least one config was loaded
         if not merged_config:
@@ -51,10 +47,11 @@ class ConfigManager:
 
         # Validate with Pydantic
         try:
-            self._config = merged_config
+            self._config = Config.model_validate(merged_config)
             logger.info(f"Loading configuration from {self.config_folder_path}")
         except ValidationError as e:
             logger.error(f"Configuration validation error: {e}")
+            raise ValueError(f"Invalid configuration: {e}") from e
 
     def _deep_merge(
         self, base: Dict[str, Any], update: Dict[str, Any]
@@ -72,10 +69,42 @@ class ConfigManager:
                 base[key] = value
         return base
 
-    def get(self) -> Dict[str, Any]:
-        """Get the loaded configuration"""
+    def get(self) -> Config:
+        """Get the loaded and validated configuration"""
         if self._config is None:
             raise RuntimeError(
                 "Configuration not loaded. Please call load_config() first."
             )
         return self._config
+
+
+def load_scenario_file(path: str | Path) -> ScenarioFile:
+    """Parse and validate a YAML file of simulation scenarios.
+
+    Args:
+        path (str | Path): Scenario file, see `ScenarioFile`.
+
+    Returns:
+        ScenarioFile: Validated scenarios with their shared settings.
+    """
+    data = _read_yaml(path)
+    try:
+        return ScenarioFile.model_validate(data)
+    except ValidationError as e:
+        raise ValueError(f"Invalid scenario file {path}: {e}") from e
+
+
+def _read_yaml(path: str | Path) -> Any:
+    """Parse a YAML file, an empty file as an empty dict.
+
+    Args:
+        path (str | Path): YAML file.
+
+    Returns:
+        Any: Parsed content of the file.
+    """
+    try:
+        with open(path, "r") as file:
+            return yaml.safe_load(file) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(f"Error parsing YAML file {path}: {e}") from e
@@ -0,0 +1,338 @@
+import heapq
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from tennis_simulator.simulation.batch import BatchResult
+from tennis_simulator.simulation.estimators import EstimatorMoments
+from tennis_simulator.tennis_scoring.constants import PLAYER_1
+from tennis_simulator.tennis_scoring.transitions import STATISTIC_FLAGS
+
+# How raw per-match results are kept next to the running counters
+KEEP_RESULTS = ("none", "reservoir", "spill")
+# Spilled results are buffered and written in chunks of this many lines
+SPILL_CHUNK_SIZE = 10_000
+
+SetScores = tuple[tuple[int, int], ...]
+
+
+def format_score_line(set_scores: SetScores) -> str:
+    """Render set scores in the format of `TennisScore.match_result()`.
+
+    Args:
+        set_scores (SetScores): Games of both players per set.
+
+    Returns:
+        str: Score line such as "6-4,3-6,7-6,".
+    """
+    return "".join(f"{games_1}-{games_2}," for games_1, games_2 in set_scores)
+
+
+class StatisticsAggregator:
+    """Running match statistics with constant memory.
+
+    Keeps win counts, point totals, a score-line histogram and the
+    distribution of the number of sets played. Raw per-match results are
+    opt-in: either a uniform reservoir sample of at most `reservoir_size`
+    matches, or every result spilled line by line to `spill_path` in chunks
+    of SPILL_CHUNK_SIZE lines.
+
+    The reservoir is a bottom-k sample: every match gets a random key and the
+    matches with the smallest keys are kept. Merging two aggregators keeps
+    the smallest keys of both, so the merged sample is again uniform and does
+    not depend on the order in which shards are merged.
+
+    Given the point win rate of player 1, it also keeps the running sums of
+    `EstimatorMoments` to estimate the match-win rate with a standard error.
+
+    Matches added with per-match statistics (points, games and the counters
+    of STATISTIC_FLAGS) are counted in one histogram per statistic.
+    """
+
+    def __init__(
+        self,
+        keep_results: str = "none",
+        reservoir_size: int = 1000,
+        spill_path: str | Path | None = None,
+        seed: int | None = None,
+        winrate_player_1: float | None = None,
+    ) -> None:
+        if keep_results not in KEEP_RESULTS:
+            raise ValueError(
+                f"Invalid keep_results: {keep_results}. Choose from {KEEP_RESULTS}."
+            )
+        if reservoir_size < 1:
+            raise ValueError("Reservoir size must be at least 1")
+        if keep_results == "spill" and spill_path is None:
+            raise ValueError("A spill path is required to spill results")
+
+        self.keep_results = keep_results
+        self.reservoir_size = reservoir_size
+        self._rng = random.Random(seed)
+        self._spill_path = Path(spill_path) if spill_path is not None else None
+        self._spill_buffer: list[str] = []
+        # Spill files of this aggregator and of all merged aggregators
+        self.spill_paths: list[Path] = []
+        if keep_results == "spill" and self._spill_path is not None:
+            # Start from an empty file so reruns do not append to old results
+            self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill_path.write_text("")
+            self.spill_paths.append(self._spill_path)
+
+        self.number_of_matches = 0
+        self.wins = [0, 0]
+        self.total_points_won = [0, 0]
+        self.score_lines: Counter[SetScores] = Counter()
+        self.sets_played: Counter[int] = Counter()
+        # Histogram per statistic, only filled by matches with statistics
+        self.match_statistics: dict[str, Counter[int]] = {}
+        # Max-heap on the negated keys of the sampled matches
+        self._reservoir: list[tuple[float, str]] = []
+        self.moments = (
+            EstimatorMoments(winrate_player_1) if winrate_player_1 is not None else None
+        )
+
+    def add_match(
+        self,
+        winner: int,
+        set_scores: SetScores,
+        total_points_won: tuple[int, int],
+        match_statistics: dict[str, int] | None = None,
+    ) -> None:
+        """Add one finished match.
+
+        Args:
+            winner (int): Player id of the winner.
+            set_scores (SetScores): Games of both players per set.
+            total_points_won (tuple[int, int]): Points won per player.
+            match_statistics (dict[str, int] | None): Per-match counters from
+                `TennisScore.match_statistics`, if tracked.
+        """
+        self.number_of_matches += 1
+        self.wins[winner] += 1
+        self.total_points_won[0] += total_points_won[0]
+        self.total_points_won[1] += total_points_won[1]
+        self.score_lines[set_scores] += 1
+        self.sets_played[len(set_scores)] += 1
+        if self.moments is not None:
+            self.moments.add(
+                winner == PLAYER_1,
+                self.moments.control(total_points_won[0], sum(total_points_won)),
+            )
+        if match_statistics is not None:
+            for name, value in match_statistics.items():
+                self.match_statistics.setdefault(name, Counter())[value] += 1
+
+        if self.keep_results == "reservoir":
+            self._sample(self._rng.random(), set_scores)
+        elif self.keep_results == "spill":
+            self._spill_buffer.append(format_score_line(set_scores))
+            if len(self._spill_buffer) >= SPILL_CHUNK_SIZE:
+                self.flush()
+
+    def add_batch(self, result: BatchResult) -> None:
+        """Add all matches of a batch without a Python call per match.
+
+        Args:
+            result (BatchResult): Matches simulated by the batch engine.
+        """
+        number_of_matches = len(result)
+        if not number_of_matches:
+            return
+        player_1_wins = int(np.count_nonzero(result.winners == PLAYER_1))
+        self.number_of_matches += number_of_matches
+        self.wins[0] += player_1_wins
+        self.wins[1] += number_of_matches - player_1_wins
+        self.total_points_won[0] += int(result.points_won[:, 0].sum())
+        self.total_points_won[1] += int(result.points_won[:, 1].sum())
+
+        if self.moments is not None:
+            self._add_moments(result)
+        if result.statistics is not None:
+            self._add_match_statistics(result)
+
+        sets_played = np.bincount(result.sets_played)
+        for sets, count in enumerate(sets_played.tolist()):
+            if count:
+                self.sets_played[sets] += count
+
+        # Histogram over whole score lines, rendered once per distinct line.
+        # Games fit in three bits, so every score line packs into one integer.
+        shifts = 3 * np.arange(result.set_games[0].size, dtype=np.int64)
+        rows = result.set_games.reshape(number_of_matches, -1).astype(np.int64)
+        codes = (rows << shifts).sum(axis=1)
+        _, first, counts = np.unique(codes, return_index=True, return_counts=True)
+        for match, count in zip(first.tolist(), counts.tolist()):
+            line = result.set_games[match].reshape(-1)
+            sets = int(result.sets_played[match])
+            self.score_lines[_set_scores(line, sets)] += count
+
+        if self.keep_results == "reservoir":
+            # Only the matches with the smallest keys can enter the reservoir
+            keys = np.random.default_rng(self._rng.getrandbits(64)).random(
+                number_of_matches
+            )
+            candidates = np.argsort(keys)[: self.reservoir_size]
+            for match in candidates.tolist():
+                line = result.set_games[match].reshape(-1)
+                sets = int(result.sets_played[match])
+                self._sample(float(keys[match]), _set_scores(line, sets))
+        elif self.keep_results == "spill":
+            self._spill_buffer.extend(result.match_results())
+            self.flush()
+
+    def _add_moments(self, result: BatchResult) -> None:
+        """Add the estimator units of a batch, pairing antithetic matches.
+
+        Args:
+            result (BatchResult): Matches simulated by the batch engine.
+        """
+        moments = self.moments
+        assert moments is not None
+        wins = (result.winners == PLAYER_1).astype(np.float64)
+        control = moments.control(
+            result.points_won[:, 0].astype(np.float64),
+            result.points_won.sum(axis=1, dtype=np.float64),
+        )
+        if result.antithetic:
+            half = len(result) // 2
+            wins = (wins[:half] + wins[half:]) / 2
+            control = (control[:half] + control[half:]) / 2
+        moments.add_many(wins, control)
+
+    def _add_match_statistics(self, result: BatchResult) -> None:
+        """Count the per-match statistics of a batch in their histograms.
+
+        Args:
+            result (BatchResult): Matches simulated with statistics tracked.
+        """
+        columns = {
+            "points": result.points_won.sum(axis=1),
+            "games": result.set_games.reshape(len(result), -1).sum(axis=1),
+        }
+        statistics = result.statistics
+        assert statistics is not None
+        for column, (name, _) in enumerate(STATISTIC_FLAGS):
+            columns[name] = statistics[:, column]
+        for name, values in columns.items():
+            histogram = self.match_statistics.setdefault(name, Counter())
+            unique, counts = np.unique(values, return_counts=True)
+            for value, count in zip(unique.tolist(), counts.tolist()):
+                histogram[value] += count
+
+    def flush(self) -> None:
+        """Write buffered spilled results to the spill file."""
+        if not self._spill_buffer or self._spill_path is None:
+            return
+        with open(self._spill_path, "a") as file:
+            file.writelines(line + "\n" for line in self._spill_buffer)
+        self._spill_buffer.clear()
+
+    def _sample(self, key: float, set_scores: SetScores) -> None:
+        """Offer a match to the bottom-k reservoir.
+
+        Args:
+            key (float): Random key of the match.
+            set_scores (SetScores): Games of both players per set.
+        """
+        reservoir = self._reservoir
+        if len(reservoir) < self.reservoir_size or -key > reservoir[0][0]:
+            self._offer((-key, format_score_line(set_scores)))
+
+    def _offer(self, item: tuple[float, str]) -> None:
+        """Keep an item if its key is among the smallest `reservoir_size` keys.
+
+        Args:
+            item (tuple[float, str]): Negated sample key and score line.
+        """
+        if len(self._reservoir) < self.reservoir_size:
+            heapq.heappush(self._reservoir, item)
+        elif item > self._reservoir[0]:
+            heapq.heapreplace(self._reservoir, item)
+
+    def merge(self, other: "StatisticsAggregator") -> "StatisticsAggregator":
+        """Merge the counters and samples of another aggregator into this one.
+
+        Args:
+            other (StatisticsAggregator): Aggregator of another shard.
+
+        Returns:
+            StatisticsAggregator: This aggregator.
+        """
+        self.number_of_matches += other.number_of_matches
+        for player in (0, 1):
+            self.wins[player] += other.wins[player]
+            self.total_points_won[player] += other.total_points_won[player]
+        self.score_lines.update(other.score_lines)
+        self.sets_played.update(other.sets_played)
+        for name, histogram in other.match_statistics.items():
+            self.match_statistics.setdefault(name, Counter()).update(histogram)
+        if self.moments is not None and other.moments is not None:
+            self.moments.merge(other.moments)
+        other.flush()
+        self.spill_paths.extend(other.spill_paths)
+        for item in other._reservoir:
+            self._offer(item)
+        return self
+
+    def results(self) -> list[str]:
+        """Kept raw results, ordered by their random sample key.
+
+        Returns:
+            list[str]: Sampled score lines, empty unless results are sampled.
+        """
+        return [line for _, line in sorted(self._reservoir, reverse=True)]
+
+    def to_statistics(self) -> dict[str, Any]:
+        """Render the counters as the simulator statistics dictionary.
+
+        Returns:
+            dict[str, Any]: Statistics with the score-line histogram, the
+                number of sets played and the kept raw results, plus the
+                mean and histogram of every per-match statistic if tracked.
+        """
+        self.flush()
+        statistics: dict[str, Any] = {
+            "number_of_matches": self.number_of_matches,
+            "player_1_wins": self.wins[0],
+            "player_2_wins": self.wins[1],
+            "player_1_total_points_won": self.total_points_won[0],
+            "player_2_total_points_won": self.total_points_won[1],
+            "score_lines": {
+                format_score_line(set_scores): count
+                for set_scores, count in self.score_lines.most_common()
+            },
+            "sets_played": dict(sorted(self.sets_played.items())),
+            "results": self.results(),
+        }
+        if self.match_statistics:
+            statistics["match_statistics"] = {
+                name: {
+                    "mean": sum(value * count for value, count in histogram.items())
+                    / histogram.total(),
+                    "histogram": dict(sorted(histogram.items())),
+                }
+                for name, histogram in self.match_statistics.items()
+            }
+        if self.spill_paths:
+            statistics["results_paths"] = [str(path) for path in self.spill_paths]
+        return statistics
+
+
+def _set_scores(games: np.ndarray, sets_played: int) -> SetScores:
+    """Convert a flattened row of set games into set score tuples.
+
+    Args:
+        games (np.ndarray): Games per set and player, flattened.
+        sets_played (int): Number of sets actually played.
+
+    Returns:
+        SetScores: Games of both players per played set.
+    """
+    values = games.tolist()
+    return tuple(
+        (values[2 * number], values[2 * number + 1]) for number in range(sets_played)
+    )
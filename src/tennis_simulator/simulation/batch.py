@@ -0,0 +1,338 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from tennis_simulator.tennis_scoring.constants import PLAYER_1, SETS_WON
+from tennis_simulator.tennis_scoring.transitions import (
+    MATCH_WON,
+    SET_WON,
+    STATISTIC_FLAGS,
+    transition_table,
+)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch of simulated matches.
+
+    Attributes:
+        winners (np.ndarray): Winner per match (0 = player_1, 1 = player_2).
+        set_games (np.ndarray): Games per set and player, shape (n, max_sets, 2).
+        sets_played (np.ndarray): Number of sets played per match.
+        points_won (np.ndarray): Points won per match and player, shape (n, 2).
+        antithetic (bool): Whether match i and match i + n / 2 are an
+            antithetic pair.
+        statistics (np.ndarray | None): Count of every entry of
+            STATISTIC_FLAGS per match, shape (n, len(STATISTIC_FLAGS)), if
+            statistics were tracked.
+    """
+
+    winners: np.ndarray
+    set_games: np.ndarray
+    sets_played: np.ndarray
+    points_won: np.ndarray
+    antithetic: bool = False
+    statistics: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.winners)
+
+    def match_results(self) -> list[str]:
+        """Render every match in the format of `TennisScore.match_result()`.
+
+        Returns:
+            list[str]: Score lines such as "6-4,3-6,7-6,".
+        """
+        results = []
+        for games, sets_played in zip(
+            self.set_games.tolist(), self.sets_played.tolist()
+        ):
+            results.append("".join(f"{p1}-{p2}," for p1, p2 in games[:sets_played]))
+        return results
+
+
+# Bits per statistic in the packed per-match counters of the batch engine.
+# No realistic match comes close to 4096 deuces or break points.
+STATISTIC_FIELD_BITS = 12
+STATISTIC_FIELD_MASK = (1 << STATISTIC_FIELD_BITS) - 1
+
+
+def _by_server(winrate_player_1: float | tuple[float, float]) -> np.ndarray:
+    """Point win rate of player 1 on the serve of player 1 and of player 2.
+
+    Args:
+        winrate_player_1 (float | tuple[float, float]): One win rate for
+            every point, or the win rates on either player's serve.
+
+    Returns:
+        np.ndarray: Win rates indexed by the id of the server.
+    """
+    rates = np.broadcast_to(np.asarray(winrate_player_1, dtype=np.float64), (2,))
+    if rates[0] * rates[1] + (1 - rates[0]) * (1 - rates[1]) == 0:
+        raise ValueError("Matches never end when every point is won by one server")
+    return rates
+
+
+def simulate_batch(
+    number_of_matches: int,
+    winrate_player_1: float | tuple[float, float],
+    best_of_sets: int = 3,
+    rng: np.random.Generator | None = None,
+    block_size: int = 32,
+    antithetic: bool = False,
+    first_server: int = PLAYER_1,
+    track_statistics: bool = False,
+    start_state: int | None = None,
+) -> BatchResult:
+    """Simulate many matches together as NumPy state arrays.
+
+    Every match is a single index into the transition table, so a point is
+    one table lookup for all matches at once. Points are drawn in blocks of
+    `block_size` points for every match that is still running. Matches that
+    finish inside a block stay in the absorbing finished state until the
+    block ends and are then dropped from the state arrays.
+
+    With serve-dependent win rates, the point server of every state comes
+    from the transition table, so serving costs one more lookup per point.
+
+    Args:
+        number_of_matches (int): Number of matches to simulate.
+        winrate_player_1 (float | tuple[float, float]): Probability that
+            player 1 wins a point, or a pair with the probability on the
+            serve of player 1 and on the serve of player 2.
+        best_of_sets (int): Maximum number of sets in a match.
+        rng (np.random.Generator | None): Random generator to draw points from.
+        block_size (int): Number of points drawn per match at once.
+        antithetic (bool): Play the second half of the matches on the
+            mirrored random numbers 1 - u of the first half.
+        first_server (int): Player id serving the first game.
+        track_statistics (bool): Count deuces, break points and the other
+            STATISTIC_FLAGS per match, at the cost of a few more array
+            operations per point.
+        start_state (int | None): Transition table index to resume every
+            match from, e.g. from `TennisScore.state_index`. Sets finished
+            before that state are left at zero games and points are
+            counted from there. None starts at the first point.
+
+    Returns:
+        BatchResult: Per-match winners, set scores and points won.
+    """
+    rng = rng or np.random.default_rng()
+    rates = _by_server(winrate_player_1)
+    if not antithetic:
+        return _simulate(
+            number_of_matches,
+            rates[None, :],
+            best_of_sets,
+            rng,
+            block_size,
+            first_server=first_server,
+            track_statistics=track_statistics,
+            start_state=start_state,
+        )
+
+    if number_of_matches % 2:
+        raise ValueError("Antithetic batches need an even number of matches")
+    result = _simulate(
+        number_of_matches // 2,
+        np.stack([rates, rates]),
+        best_of_sets,
+        rng,
+        block_size,
+        antithetic=True,
+        first_server=first_server,
+        track_statistics=track_statistics,
+        start_state=start_state,
+    )
+    result.antithetic = True
+    return result
+
+
+def simulate_grid(
+    number_of_matches: int,
+    winrates_player_1: Sequence[float] | np.ndarray,
+    best_of_sets: int = 3,
+    rng: np.random.Generator | None = None,
+    block_size: int = 32,
+) -> list[BatchResult]:
+    """Simulate the same matches for a grid of point win rates at once.
+
+    Match i of every grid point reads the same uniform random numbers, point
+    by point (common random numbers). Differences between neighbouring grid
+    points are therefore much less noisy than with independent runs, and
+    all grid points share one pass through the batch engine.
+
+    Args:
+        number_of_matches (int): Number of matches per grid point.
+        winrates_player_1 (Sequence[float] | np.ndarray): Probability that
+            player 1 wins a point, per grid point.
+        best_of_sets (int): Maximum number of sets in a match.
+        rng (np.random.Generator | None): Random generator to draw points from.
+        block_size (int): Number of points drawn per match at once.
+
+    Returns:
+        list[BatchResult]: Results per grid point, in the order of the grid.
+    """
+    winrates = np.asarray(winrates_player_1, dtype=np.float64).reshape(-1)
+    result = _simulate(
+        number_of_matches,
+        np.stack([winrates, winrates], axis=1),
+        best_of_sets,
+        rng or np.random.default_rng(),
+        block_size,
+    )
+    return [
+        BatchResult(
+            winners=result.winners[matches],
+            set_games=result.set_games[matches],
+            sets_played=result.sets_played[matches],
+            points_won=result.points_won[matches],
+        )
+        for matches in (
+            slice(point * number_of_matches, (point + 1) * number_of_matches)
+            for point in range(winrates.size)
+        )
+    ]
+
+
+def _simulate(
+    number_of_matches: int,
+    winrates: np.ndarray,
+    best_of_sets: int,
+    rng: np.random.Generator,
+    block_size: int,
+    antithetic: bool = False,
+    first_server: int = PLAYER_1,
+    track_statistics: bool = False,
+    start_state: int | None = None,
+) -> BatchResult:
+    """Simulate `number_of_matches` matches for every row of `winrates`.
+
+    Match i of grid point g is stored at g * number_of_matches + i and uses
+    the random column of match i.
+
+    Args:
+        number_of_matches (int): Number of matches per win rate.
+        winrates (np.ndarray): Point win rates of player 1 per grid point
+            and server, shape (g, 2).
+        best_of_sets (int): Maximum number of sets in a match.
+        rng (np.random.Generator): Random generator to draw points from.
+        block_size (int): Number of points drawn per match at once.
+        antithetic (bool): Mirror the random numbers of grid point 1.
+        first_server (int): Player id serving the first game.
+        track_statistics (bool): Count the STATISTIC_FLAGS per match.
+        start_state (int | None): State index to start from instead of the
+            start state of `first_server`.
+
+    Returns:
+        BatchResult: Results of all grid points, grid point by grid point.
+    """
+    table = transition_table(best_of_sets)
+    arrays = table.arrays
+    next_state = arrays["next_state"]
+    events = arrays["events"]
+    finished_set_games = arrays["set_games"]
+    point_server = arrays["point_server"]
+    sets_won = arrays["states"][:, SETS_WON : SETS_WON + 2].sum(axis=1)
+    grid_size = len(winrates)
+    total_matches = grid_size * number_of_matches
+    serve_aware = not np.array_equal(winrates[:, 0], winrates[:, 1])
+    # Threshold of the point server per state, for a single grid point
+    state_thresholds = winrates[0][point_server]
+
+    # Global result arrays
+    winners = np.full(total_matches, -1, dtype=np.int8)
+    set_games = np.zeros((total_matches, best_of_sets, 2), dtype=np.int8)
+    sets_played = np.zeros(total_matches, dtype=np.int8)
+    points_won = np.zeros((total_matches, 2), dtype=np.int32)
+    if track_statistics:
+        # Every point adds one to the packed field of each of its flags
+        shifts = STATISTIC_FIELD_BITS * np.arange(len(STATISTIC_FLAGS))
+        flags = arrays["statistics"].astype(np.int64)
+        increments = (
+            ((flags[:, None] >> np.arange(len(STATISTIC_FLAGS))) & 1) << shifts
+        ).sum(axis=1)
+        statistics = np.zeros((total_matches, len(STATISTIC_FLAGS)), dtype=np.int16)
+
+    # State of the matches still running
+    index = np.arange(total_matches)
+    if start_state is None:
+        start_state = table.initial[first_server]
+    elif not 0 <= start_state < table.finished:
+        raise ValueError("The start state must be a running match of the table")
+    state = np.full(total_matches, start_state, dtype=np.int32)
+    total_1 = np.zeros(total_matches, dtype=np.int32)
+    total_2 = np.zeros(total_matches, dtype=np.int32)
+    if track_statistics:
+        packed = np.zeros(total_matches, dtype=np.int64)
+
+    while index.size:
+        if grid_size == 1:
+            uniforms = rng.random((block_size, index.size))
+            thresholds = winrates[0]
+        else:
+            # One random column per match still running at any grid point
+            base, column = np.unique(index % number_of_matches, return_inverse=True)
+            uniforms = rng.random((block_size, base.size))[:, column]
+            point = index // number_of_matches
+            if antithetic:
+                uniforms = np.where(point == 1, 1 - uniforms, uniforms)
+            thresholds = winrates[point].T
+        if not serve_aware:
+            # Player id of every point winner: 0 = player_1, 1 = player_2
+            block = uniforms >= thresholds[0]
+
+        for step in range(block_size):
+            if not serve_aware:
+                winner = block[step]
+            elif grid_size == 1:
+                winner = uniforms[step] >= state_thresholds[state]
+            else:
+                server = point_server[state]
+                winner = uniforms[step] >= np.where(
+                    server == PLAYER_1, thresholds[0], thresholds[1]
+                )
+            live = state != table.finished
+            total_1 += ~winner & live
+            total_2 += winner & live
+
+            transition = 2 * state + winner
+            if track_statistics:
+                # Finished matches take transitions without statistic flags
+                packed += increments[transition]
+            event = events[transition]
+            set_done = np.flatnonzero(event & SET_WON)
+            if set_done.size:
+                # Sets are numbered by the sets won before the point
+                set_number = sets_won[state[set_done]]
+                set_games[index[set_done], set_number] = finished_set_games[
+                    transition[set_done]
+                ]
+                match_done = set_done[event[set_done] & MATCH_WON != 0]
+                winners[index[match_done]] = winner[match_done]
+                sets_played[index[match_done]] = sets_won[state[match_done]] + 1
+            state = next_state[transition]
+
+        # Store point totals of finished matches and drop them from the state
+        finished = state == table.finished
+        points_won[index[finished], 0] = total_1[finished]
+        points_won[index[finished], 1] = total_2[finished]
+        live = ~finished
+        if track_statistics:
+            statistics[index[finished]] = (
+                packed[finished, None] >> shifts
+            ) & STATISTIC_FIELD_MASK
+            packed = packed[live]
+        index = index[live]
+        state = state[live]
+        total_1 = total_1[live]
+        total_2 = total_2[live]
+
+    return BatchResult(
+        winners=winners,
+        set_games=set_games,
+        sets_played=sets_played,
+        points_won=points_won,
+        statistics=statistics if track_statistics else None,
+    )
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from tennis_simulator.simulation.aggregator import StatisticsAggregator
+
+# Part of every cache key. Bump it whenever a change alters the simulated
+# results for a seed, e.g. a new random stream layout or new statistics.
+ENGINE_VERSION = 3
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "tennis_simulator"
+DEFAULT_MAX_BYTES = 256 * 1024**2
+
+
+class ResultCache:
+    """Aggregated results of seeded runs, stored on disk between sessions.
+
+    An entry holds the merged `StatisticsAggregator` of the first whole
+    shards of a run and is keyed by everything that changes the random
+    streams of those shards except their number: win rates, match format,
+    seed, engine, shard size and ENGINE_VERSION. Shard seeds only depend
+    on the shard index, so a longer run with the same key starts from the
+    cached shards and only simulates the missing ones.
+
+    Entries are pickled files. When the directory grows beyond `max_bytes`,
+    the least recently used entries are removed. Only point the cache at
+    directories written by this class.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError("The cache needs a positive size limit")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(**parameters: Any) -> str:
+        """Cache key of a run.
+
+        Args:
+            **parameters (Any): JSON serializable run parameters.
+
+        Returns:
+            str: Hex digest of the parameters and ENGINE_VERSION.
+        """
+        payload = json.dumps(
+            {"engine_version": ENGINE_VERSION, **parameters}, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def load(self, key: str) -> tuple[int, StatisticsAggregator] | None:
+        """Read an entry and mark it as recently used.
+
+        Args:
+            key (str): Key from `key`.
+
+        Returns:
+            tuple[int, StatisticsAggregator] | None: Number of cached
+                matches and their aggregator, or None if nothing is cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                entry = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except (EOFError, pickle.UnpicklingError):
+            # A broken entry is dropped and simulated again
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return entry["number_of_matches"], entry["aggregator"]
+
+    def store(self, key: str, aggregator: StatisticsAggregator) -> None:
+        """Write an entry, replacing an older one with the same key.
+
+        The aggregator is serialized at once, so it can keep changing
+        afterwards.
+
+        Args:
+            key (str): Key from `key`.
+            aggregator (StatisticsAggregator): Merged shards to cache.
+        """
+        entry = {
+            "number_of_matches": aggregator.number_of_matches,
+            "aggregator": aggregator,
+        }
+        # Write to a temporary file first so readers never see half an entry
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(file.name, self._path(key))
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for path in self.directory.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        """File of an entry.
+
+        Args:
+            key (str): Key from `key`.
+
+        Returns:
+            Path: Path of the pickled entry.
+        """
+        return self.directory / f"{key}.pkl"
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the size limit holds."""
+        entries = []
+        for path in self.directory.glob("*.pkl"):
+            try:
+                status = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((status.st_mtime, status.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
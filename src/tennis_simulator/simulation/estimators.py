@@ -0,0 +1,141 @@
+import math
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from tennis_simulator.analysis.confidence import z_value
+
+# Estimators of the player 1 match-win rate
+ESTIMATORS = ("plain", "antithetic", "control_variate")
+
+
+@dataclass
+class EstimatorMoments:
+    """Running sums to estimate the player 1 match-win rate.
+
+    Every unit contributes an outcome y and a control x. A unit is one
+    match, or one antithetic pair of matches with y and x averaged over
+    the pair. The control is `points_won_player_1 - p * points_played`. By
+    Wald's identity its expectation is exactly zero for the point win rate
+    p, so it can serve as a control variate for the match-win indicator.
+
+    The sums can be merged across shards, and every estimator can be
+    evaluated from them afterwards.
+
+    Attributes:
+        winrate_player_1 (float): Point win rate p of player 1.
+        count (int): Number of units.
+        sum_y (float): Sum of the outcomes.
+        sum_yy (float): Sum of the squared outcomes.
+        sum_x (float): Sum of the controls.
+        sum_xx (float): Sum of the squared controls.
+        sum_xy (float): Sum of the products of outcome and control.
+    """
+
+    winrate_player_1: float
+    count: int = 0
+    sum_y: float = 0.0
+    sum_yy: float = 0.0
+    sum_x: float = 0.0
+    sum_xx: float = 0.0
+    sum_xy: float = 0.0
+
+    def control[T: (float, np.ndarray)](
+        self, points_won_player_1: T, points_played: T
+    ) -> T:
+        """Control variable of one match or of an array of matches.
+
+        Args:
+            points_won_player_1 (T): Points won by player 1.
+            points_played (T): Points played.
+
+        Returns:
+            T: Control with expectation zero.
+        """
+        return points_won_player_1 - self.winrate_player_1 * points_played
+
+    def add(self, y: float, x: float) -> None:
+        """Add one unit.
+
+        Args:
+            y (float): Outcome, 1 if player 1 won.
+            x (float): Control of the unit.
+        """
+        self.count += 1
+        self.sum_y += y
+        self.sum_yy += y * y
+        self.sum_x += x
+        self.sum_xx += x * x
+        self.sum_xy += x * y
+
+    def add_many(self, y: np.ndarray, x: np.ndarray) -> None:
+        """Add many units at once.
+
+        Args:
+            y (np.ndarray): Outcomes per unit.
+            x (np.ndarray): Controls per unit.
+        """
+        self.count += len(y)
+        self.sum_y += float(y.sum())
+        self.sum_yy += float(y @ y)
+        self.sum_x += float(x.sum())
+        self.sum_xx += float(x @ x)
+        self.sum_xy += float(x @ y)
+
+    def merge(self, other: "EstimatorMoments") -> None:
+        """Add the sums of another shard.
+
+        Args:
+            other (EstimatorMoments): Moments of the same estimator setup.
+        """
+        self.count += other.count
+        self.sum_y += other.sum_y
+        self.sum_yy += other.sum_yy
+        self.sum_x += other.sum_x
+        self.sum_xx += other.sum_xx
+        self.sum_xy += other.sum_xy
+
+    def estimate(self, estimator: str, confidence: float = 0.95) -> dict[str, Any]:
+        """Estimate the match-win rate with a normal confidence interval.
+
+        Args:
+            estimator (str): "plain" or "antithetic" use the mean outcome,
+                "control_variate" corrects it with the control.
+            confidence (float): Confidence level of the interval.
+
+        Returns:
+            dict[str, Any]: Estimator name, estimate, standard error,
+                interval and the number of units.
+        """
+        if estimator not in ESTIMATORS:
+            raise ValueError(
+                f"Invalid estimator: {estimator}. Choose from {ESTIMATORS}."
+            )
+        count = self.count
+        if count < 3:
+            estimate, standard_error = float("nan"), float("nan")
+        else:
+            mean_y = self.sum_y / count
+            mean_x = self.sum_x / count
+            s_yy = self.sum_yy - count * mean_y**2
+            estimate, residual, degrees = mean_y, s_yy, count - 1
+            if estimator == "control_variate":
+                s_xx = self.sum_xx - count * mean_x**2
+                s_xy = self.sum_xy - count * mean_x * mean_y
+                beta = s_xy / s_xx if s_xx > 0 else 0.0
+                # The control has a known mean of zero
+                estimate = mean_y - beta * mean_x
+                residual, degrees = s_yy - beta * s_xy, count - 2
+            standard_error = math.sqrt(max(residual, 0.0) / degrees / count)
+
+        half_width = z_value(confidence) * standard_error
+        return {
+            "name": estimator,
+            "match_win_rate": estimate,
+            "standard_error": standard_error,
+            "ci_lower": estimate - half_width,
+            "ci_upper": estimate + half_width,
+            "confidence": confidence,
+            "units": count,
+        }
@@ -0,0 +1,178 @@
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from tennis_simulator.simulation.batch import BatchResult
+
+# Matches buffered by the scalar path before a chunk is written
+EXPORT_CHUNK_SIZE = 10_000
+SCHEMA_FILE = "schema.json"
+
+
+def _columns(best_of_sets: int) -> dict[str, tuple[np.dtype, tuple[int, ...]]]:
+    """Data type and per-match shape of every exported column.
+
+    Args:
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        dict[str, tuple[np.dtype, tuple[int, ...]]]: Column layout.
+    """
+    return {
+        "winner": (np.dtype(np.int8), ()),
+        "sets_played": (np.dtype(np.int8), ()),
+        "sets_won": (np.dtype(np.int8), (2,)),
+        "set_games": (np.dtype(np.int8), (best_of_sets, 2)),
+        "tiebreaks": (np.dtype(np.bool_), (best_of_sets,)),
+        "points_won": (np.dtype(np.int32), (2,)),
+    }
+
+
+class ResultWriter:
+    """Write per-match records as raw column files, chunk by chunk.
+
+    Every column is appended to its own binary file, so a run never holds
+    more than one chunk of records in memory. `close()` writes the schema
+    with the number of rows. Use `combine_results` to turn one or more
+    written parts into `.npy` files that can be memory-mapped.
+    """
+
+    def __init__(self, path: str | Path, best_of_sets: int = 3) -> None:
+        self.path = Path(path)
+        self.best_of_sets = best_of_sets
+        self.rows = 0
+        self._buffer: list[tuple[int, tuple[tuple[int, int], ...], tuple[int, int]]]
+        self._buffer = []
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        for column in _columns(best_of_sets):
+            (self.path / f"{column}.bin").write_bytes(b"")
+
+    def add_match(
+        self,
+        winner: int,
+        set_scores: tuple[tuple[int, int], ...],
+        total_points_won: tuple[int, int],
+    ) -> None:
+        """Buffer one match of the scalar path.
+
+        Args:
+            winner (int): Player id of the winner.
+            set_scores (tuple[tuple[int, int], ...]): Games per set.
+            total_points_won (tuple[int, int]): Points won per player.
+        """
+        self._buffer.append((winner, set_scores, total_points_won))
+        if len(self._buffer) >= EXPORT_CHUNK_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered scalar matches as one chunk."""
+        if not self._buffer:
+            return
+        number_of_matches = len(self._buffer)
+        set_games = np.zeros((number_of_matches, self.best_of_sets, 2), np.int8)
+        for match, (_, set_scores, _) in enumerate(self._buffer):
+            set_games[match, : len(set_scores)] = set_scores
+        self.write_batch(
+            BatchResult(
+                winners=np.array([match[0] for match in self._buffer], np.int8),
+                set_games=set_games,
+                sets_played=np.array([len(m[1]) for m in self._buffer], np.int8),
+                points_won=np.array([match[2] for match in self._buffer], np.int32),
+            )
+        )
+        self._buffer.clear()
+
+    def write_batch(self, result: BatchResult) -> None:
+        """Append all matches of a batch as one chunk.
+
+        Args:
+            result (BatchResult): Matches simulated by the batch engine.
+        """
+        games = result.set_games
+        set_winner_1 = games[:, :, 0] > games[:, :, 1]
+        set_winner_2 = games[:, :, 1] > games[:, :, 0]
+        chunk = {
+            "winner": result.winners,
+            "sets_played": result.sets_played,
+            "sets_won": np.stack(
+                [set_winner_1.sum(axis=1), set_winner_2.sum(axis=1)], axis=1
+            ),
+            "set_games": games,
+            "tiebreaks": (games.max(axis=2) == 7) & (games.min(axis=2) == 6),
+            "points_won": result.points_won,
+        }
+        for column, (dtype, _) in _columns(self.best_of_sets).items():
+            with open(self.path / f"{column}.bin", "ab") as file:
+                np.ascontiguousarray(chunk[column], dtype=dtype).tofile(file)
+        self.rows += len(result)
+
+    def close(self) -> None:
+        """Flush buffered matches and write the schema of the part."""
+        self.flush()
+        schema = {"best_of_sets": self.best_of_sets, "rows": self.rows}
+        (self.path / SCHEMA_FILE).write_text(json.dumps(schema))
+
+
+def combine_results(
+    parts: list[str | Path], destination: str | Path, remove_parts: bool = True
+) -> Path:
+    """Concatenate written parts, in order, into one `.npy` file per column.
+
+    Args:
+        parts (list[str | Path]): Part directories written by `ResultWriter`.
+        destination (str | Path): Directory for the combined columns.
+        remove_parts (bool): Remove the part directories afterwards.
+
+    Returns:
+        Path: The destination directory.
+    """
+    destination = Path(destination)
+    destination.mkdir(parents=True, exist_ok=True)
+    schemas = [json.loads((Path(part) / SCHEMA_FILE).read_text()) for part in parts]
+    best_of_sets = schemas[0]["best_of_sets"] if schemas else 3
+    if any(schema["best_of_sets"] != best_of_sets for schema in schemas):
+        raise ValueError("Cannot combine parts with different best_of_sets")
+    rows = sum(schema["rows"] for schema in schemas)
+
+    for column, (dtype, shape) in _columns(best_of_sets).items():
+        combined = np.lib.format.open_memmap(
+            destination / f"{column}.npy", mode="w+", dtype=dtype, shape=(rows, *shape)
+        )
+        start = 0
+        for part, schema in zip(parts, schemas):
+            if not schema["rows"]:
+                continue
+            values = np.fromfile(Path(part) / f"{column}.bin", dtype=dtype)
+            combined[start : start + schema["rows"]] = values.reshape(-1, *shape)
+            start += schema["rows"]
+        combined.flush()
+        del combined
+
+    (destination / SCHEMA_FILE).write_text(
+        json.dumps({"best_of_sets": best_of_sets, "rows": rows})
+    )
+    if remove_parts:
+        for part in parts:
+            shutil.rmtree(part)
+    return destination
+
+
+def load_results(path: str | Path, mmap: bool = True) -> dict[str, np.ndarray]:
+    """Read exported columns back, memory-mapped by default.
+
+    Args:
+        path (str | Path): Directory written by `combine_results`.
+        mmap (bool): Memory-map the columns instead of reading them.
+
+    Returns:
+        dict[str, np.ndarray]: Column name to per-match array.
+    """
+    path = Path(path)
+    schema = json.loads((path / SCHEMA_FILE).read_text())
+    return {
+        column: np.load(path / f"{column}.npy", mmap_mode="r" if mmap else None)
+        for column in _columns(schema["best_of_sets"])
+    }
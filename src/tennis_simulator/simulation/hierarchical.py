@@ -0,0 +1,107 @@
+import numpy as np
+
+from tennis_simulator.analysis.distributions import (
+    RaceDistribution,
+    sub_match_distributions,
+)
+from tennis_simulator.simulation.batch import BatchResult
+
+
+def _race_points(
+    race: RaceDistribution, winner: int, races: np.ndarray, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """Total points of `races[i]` races won by `winner`, for every match i.
+
+    Races are independent given their winners, so the category counts are
+    multinomial and the returns to deuce negative binomial.
+
+    Args:
+        race (RaceDistribution): Game or tiebreak distribution.
+        winner (int): Player id of the winner of all races.
+        races (np.ndarray): Number of races won per match.
+        rng (np.random.Generator): Random generator.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Points of the winner and the loser.
+    """
+    target = race.target
+    counts = rng.multinomial(races, race.conditional[winner])
+    deuces = counts[:, -1]
+    returns = rng.negative_binomial(np.maximum(deuces, 1), race.deuce_resolved)
+    returns *= deuces > 0
+
+    # From deuce the winner ends on target + 1 + k points, the loser on
+    # target - 1 + k points after k returns to deuce
+    winner_points = target * races + deuces + returns
+    loser_points = counts[:, :-1] @ np.arange(target - 1) + (target - 1) * deuces
+    return winner_points, loser_points + returns
+
+
+def simulate_hierarchical(
+    number_of_matches: int,
+    winrate_player_1: float,
+    best_of_sets: int = 3,
+    rng: np.random.Generator | None = None,
+) -> BatchResult:
+    """Simulate matches set by set from cached exact distributions.
+
+    Every set score line is drawn directly from its exact distribution.
+    Points are then drawn per match from the number of games and tiebreaks
+    each player won, conditional on those winners. The joint distribution of
+    score lines and points won equals point-by-point simulation, with a
+    handful of random draws per match instead of one per point.
+
+    Args:
+        number_of_matches (int): Number of matches to simulate.
+        winrate_player_1 (float): Probability that player 1 wins a point.
+        best_of_sets (int): Maximum number of sets in a match.
+        rng (np.random.Generator | None): Random generator.
+
+    Returns:
+        BatchResult: Per-match winners, set scores and points won.
+    """
+    rng = rng or np.random.default_rng()
+    distributions = sub_match_distributions(winrate_player_1)
+    sets = distributions.set
+    sets_to_win = best_of_sets // 2 + 1
+
+    # Draw every possible set, then cut each match after its deciding set
+    cumulative = np.cumsum(sets.probabilities)
+    outcome = np.searchsorted(
+        cumulative, rng.random((number_of_matches, best_of_sets)) * cumulative[-1]
+    )
+    outcome = np.minimum(outcome, len(cumulative) - 1)
+    games = sets.games[outcome]
+    won_by_1 = np.cumsum(games[:, :, 0] > games[:, :, 1], axis=1)
+    won_by_2 = np.arange(1, best_of_sets + 1) - won_by_1
+    decided = (won_by_1 == sets_to_win) | (won_by_2 == sets_to_win)
+    sets_played = (decided.argmax(axis=1) + 1).astype(np.int8)
+    played = np.arange(best_of_sets) < sets_played[:, None]
+    set_games = np.where(played[:, :, None], games, 0).astype(np.int8)
+    winners = won_by_2[np.arange(number_of_matches), sets_played - 1] == sets_to_win
+
+    # Games won outside tiebreaks and tiebreaks won, per match and player
+    tiebreak_winner = np.where(played, sets.tiebreak_winner[outcome], -1)
+    tiebreaks = np.stack(
+        [(tiebreak_winner == player).sum(axis=1) for player in (0, 1)], axis=1
+    )
+    regular_games = set_games.sum(axis=1, dtype=np.int64) - tiebreaks
+
+    points_won = np.zeros((number_of_matches, 2), dtype=np.int64)
+    for race, races in (
+        (distributions.game, regular_games),
+        (distributions.tiebreak, tiebreaks),
+    ):
+        for player in (0, 1):
+            winner_points, loser_points = _race_points(
+                race, player, races[:, player], rng
+            )
+            points_won[:, player] += winner_points
+            points_won[:, 1 - player] += loser_points
+
+    return BatchResult(
+        winners=winners.astype(np.int8),
+        set_games=set_games,
+        sets_played=sets_played,
+        points_won=points_won.astype(np.int32),
+    )
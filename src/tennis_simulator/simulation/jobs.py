@@ -0,0 +1,219 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from tennis_simulator.simulation.simulator import simulator
+
+# Life cycle of a job: queued -> running -> done, cancelled or failed
+JOB_STATES = ("queued", "running", "done", "cancelled", "failed")
+FINISHED_STATES = ("done", "cancelled", "failed")
+
+logger = logging.getLogger("simulation")
+
+
+@dataclass(frozen=True)
+class JobStatus:
+    """Snapshot of a simulation job.
+
+    Attributes:
+        job_id (str): Id returned by `JobRunner.submit`.
+        state (str): One of JOB_STATES.
+        completed (int): Matches simulated so far.
+        total (int): Matches planned, the upper bound for adaptive jobs.
+        statistics (dict[str, Any]): Statistics of the finished shards, the
+            final statistics once the job is finished.
+        error (str | None): Error message of a failed job.
+    """
+
+    job_id: str
+    state: str = "queued"
+    completed: int = 0
+    total: int = 0
+    statistics: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def progress(self) -> float:
+        """Share of the planned matches simulated so far."""
+        if self.state == "done":
+            return 1.0
+        return self.completed / self.total if self.total else 0.0
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job will not change anymore."""
+        return self.state in FINISHED_STATES
+
+
+class JobRunner:
+    """Run simulation jobs in the background and report their progress.
+
+    Jobs are queued on a thread pool of `max_jobs` threads, so submitting
+    returns at once. A job runs `simulator.run_simulation` or, for adaptive
+    jobs, `simulator.run_adaptive`, and publishes a new `JobStatus` after
+    every shard. Cancelling stops a job after its current shard and keeps
+    the statistics of the shards already done. To use several cores, pass
+    `workers` to the job; shards then run in worker processes.
+    """
+
+    def __init__(self, max_jobs: int = 1) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_jobs, thread_name_prefix="simulation-job"
+        )
+        self._lock = threading.Lock()
+        self._statuses: dict[str, JobStatus] = {}
+        self._cancel_events: dict[str, threading.Event] = {}
+        self._futures: dict[str, Future] = {}
+
+    def submit(
+        self,
+        simulation: simulator,
+        number_of_simulations: int = 10_000,
+        adaptive: bool = False,
+        **options: Any,
+    ) -> str:
+        """Queue a simulation job.
+
+        Args:
+            simulation (simulator): Simulator to run. Its statistics hold
+                the final result once the job is done.
+            number_of_simulations (int): Number of matches, or the maximum
+                number of matches of an adaptive job.
+            adaptive (bool): Run until the target precision is reached, see
+                `simulator.run_adaptive`.
+            **options (Any): Further arguments of `run_simulation` or
+                `run_adaptive`, e.g. engine, workers or shard_size.
+
+        Returns:
+            str: Id of the job.
+        """
+        job_id = uuid.uuid4().hex
+        cancel = threading.Event()
+        with self._lock:
+            self._statuses[job_id] = JobStatus(job_id, total=number_of_simulations)
+            self._cancel_events[job_id] = cancel
+            self._futures[job_id] = self._executor.submit(
+                self._run,
+                job_id,
+                simulation,
+                number_of_simulations,
+                adaptive,
+                cancel,
+                options,
+            )
+        return job_id
+
+    def status(self, job_id: str) -> JobStatus:
+        """Latest snapshot of a job.
+
+        Args:
+            job_id (str): Id returned by `submit`.
+
+        Returns:
+            JobStatus: State, progress and statistics so far.
+        """
+        with self._lock:
+            if job_id not in self._statuses:
+                raise KeyError(f"Unknown job: {job_id}")
+            return self._statuses[job_id]
+
+    def cancel(self, job_id: str) -> None:
+        """Ask a job to stop after its current shard.
+
+        Args:
+            job_id (str): Id returned by `submit`.
+        """
+        self.status(job_id)
+        self._cancel_events[job_id].set()
+
+    def wait(self, job_id: str, timeout: float | None = None) -> JobStatus:
+        """Block until a job is finished or the timeout passes.
+
+        Args:
+            job_id (str): Id returned by `submit`.
+            timeout (float | None): Seconds to wait at most.
+
+        Returns:
+            JobStatus: Latest snapshot of the job.
+        """
+        self.status(job_id)
+        wait([self._futures[job_id]], timeout=timeout)
+        return self.status(job_id)
+
+    def shutdown(self, cancel: bool = True) -> None:
+        """Stop the runner and wait for running jobs.
+
+        Args:
+            cancel (bool): Cancel queued and running jobs first.
+        """
+        if cancel:
+            for event in self._cancel_events.values():
+                event.set()
+        self._executor.shutdown(wait=True)
+
+    def _update(self, job_id: str, **changes: Any) -> None:
+        """Publish a new snapshot of a job.
+
+        Args:
+            job_id (str): Id of the job.
+            **changes (Any): Fields of `JobStatus` to change.
+        """
+        with self._lock:
+            self._statuses[job_id] = replace(self._statuses[job_id], **changes)
+
+    def _run(
+        self,
+        job_id: str,
+        simulation: simulator,
+        number_of_simulations: int,
+        adaptive: bool,
+        cancel: threading.Event,
+        options: dict[str, Any],
+    ) -> None:
+        """Run one job on a pool thread.
+
+        Args:
+            job_id (str): Id of the job.
+            simulation (simulator): Simulator to run.
+            number_of_simulations (int): Number of matches, or the maximum.
+            adaptive (bool): Run `run_adaptive` instead of `run_simulation`.
+            cancel (threading.Event): Set to stop the job.
+            options (dict[str, Any]): Further run arguments.
+        """
+        if cancel.is_set():
+            self._update(job_id, state="cancelled")
+            return
+        self._update(job_id, state="running")
+
+        def progress(completed: int, total: int, statistics: dict[str, Any]) -> None:
+            self._update(
+                job_id, completed=completed, total=total, statistics=statistics
+            )
+
+        try:
+            if adaptive:
+                simulation.run_adaptive(
+                    max_simulations=number_of_simulations,
+                    progress=progress,
+                    cancel=cancel,
+                    **options,
+                )
+            else:
+                simulation.run_simulation(
+                    number_of_simulations, progress=progress, cancel=cancel, **options
+                )
+        except Exception as error:
+            logger.exception("Simulation job %s failed.", job_id)
+            self._update(job_id, state="failed", error=str(error))
+            return
+
+        statistics = simulation.statistics
+        self._update(
+            job_id,
+            state="cancelled" if statistics.get("cancelled") else "done",
+            completed=statistics["number_of_matches"],
+            statistics=statistics,
+        )
@@ -0,0 +1,369 @@
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from tennis_simulator.simulation.aggregator import SetScores, format_score_line
+from tennis_simulator.simulation.batch import simulate_batch
+from tennis_simulator.tennis_scoring.constants import SERVER, SETS_WON
+from tennis_simulator.tennis_scoring.tennis_score import TennisScore
+from tennis_simulator.tennis_scoring.transitions import (
+    SET_WON,
+    transition_table,
+)
+
+# Number of point win rates whose state-value tables are kept
+STATE_VALUE_CACHE_SIZE = 256
+# Score lines are enumerated exactly while at most this many sets remain.
+# Longer outlooks have too many score lines and are simulated instead.
+MAX_EXACT_SETS = 3
+
+
+@dataclass(frozen=True)
+class SetOutlook:
+    """Exact distribution of how the set in play ends, per score in the set.
+
+    Scores within a set do not depend on the sets won before, so the table
+    is solved once on the states of the first set and shared by every set.
+
+    Attributes:
+        best_of_sets (int): Maximum number of sets in a match.
+        rows (dict[int, int]): Row per state index of the first set.
+        games (tuple[tuple[int, int], ...]): Games of both players per set
+            outcome.
+        next_server (tuple[int, ...]): Server of the next set per outcome.
+        probabilities (np.ndarray): Probability of every outcome per row,
+            shape (rows, outcomes).
+    """
+
+    best_of_sets: int
+    rows: dict[int, int]
+    games: tuple[tuple[int, int], ...]
+    next_server: tuple[int, ...]
+    probabilities: np.ndarray
+
+
+@dataclass(frozen=True)
+class LiveForecast:
+    """Outlook of a match from its current score.
+
+    Attributes:
+        win (float): Probability that player 1 wins the match.
+        score_lines (dict[str, float]): Probability of every final score
+            line, most likely first.
+        number_of_matches (int): Number of matches simulated for the score
+            lines, 0 if they are exact.
+    """
+
+    win: float
+    score_lines: dict[str, float]
+    number_of_matches: int
+
+
+def _check_winrates(winrates: tuple[float, float]) -> None:
+    """Reject win rates outside [0, 1] and matches that never end.
+
+    Args:
+        winrates (tuple[float, float]): Point win rate of player 1 on the
+            serve of player 1 and of player 2.
+    """
+    if not all(0 <= rate <= 1 for rate in winrates):
+        raise ValueError("Win rates must be between 0 and 1")
+    if winrates[0] * winrates[1] + (1 - winrates[0]) * (1 - winrates[1]) == 0:
+        raise ValueError("Matches never end when every point is won by one server")
+
+
+@lru_cache(maxsize=STATE_VALUE_CACHE_SIZE)
+def set_outlook(winrates: tuple[float, float], best_of_sets: int = 3) -> SetOutlook:
+    """Solve how the set in play ends from every score within a set.
+
+    The first set is an absorbing Markov chain whose absorbing transitions
+    are the points that win the set. Its absorption probabilities solve one
+    linear system over the states of the first set.
+
+    Args:
+        winrates (tuple[float, float]): Point win rate of player 1 on the
+            serve of player 1 and of player 2.
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        SetOutlook: Outcome probabilities per state of the first set.
+    """
+    _check_winrates(winrates)
+    table = transition_table(best_of_sets)
+    states = [
+        state
+        for state, values in enumerate(table.states)
+        if values[SETS_WON] == values[SETS_WON + 1] == 0
+    ]
+    rows = {state: row for row, state in enumerate(states)}
+    outcomes: dict[tuple[int, int, int], int] = {}
+    staying = np.zeros((len(states), len(states)))
+    leaving: dict[tuple[int, int], float] = {}
+
+    for row, state in enumerate(states):
+        player_1 = winrates[table.point_server[state]]
+        for player, probability in ((0, player_1), (1, 1 - player_1)):
+            transition = 2 * state + player
+            if table.events[transition] & SET_WON:
+                # The receiver of the last game or first tiebreak point serves
+                games = table.set_games[transition]
+                assert games is not None
+                outcome = (*games, 1 - table.states[state][SERVER])
+                column = outcomes.setdefault(outcome, len(outcomes))
+                leaving[row, column] = leaving.get((row, column), 0.0) + probability
+            else:
+                staying[row, rows[table.next_state[transition]]] += probability
+
+    absorbing = np.zeros((len(states), len(outcomes)))
+    for (row, column), probability in leaving.items():
+        absorbing[row, column] = probability
+    probabilities = np.linalg.solve(np.eye(len(states)) - staying, absorbing)
+    return SetOutlook(
+        best_of_sets=best_of_sets,
+        rows=rows,
+        games=tuple((games_1, games_2) for games_1, games_2, _ in outcomes),
+        next_server=tuple(server for _, _, server in outcomes),
+        probabilities=probabilities,
+    )
+
+
+def _within_set(best_of_sets: int, state: int) -> tuple[int, int, int]:
+    """Split a state index into its first-set state and the sets won.
+
+    Args:
+        best_of_sets (int): Maximum number of sets in a match.
+        state (int): State index of a running match.
+
+    Returns:
+        tuple[int, int, int]: State index with no sets won and the sets won
+            by player 1 and player 2.
+    """
+    table = transition_table(best_of_sets)
+    values = list(table.states[state])
+    sets = values[SETS_WON], values[SETS_WON + 1]
+    values[SETS_WON] = values[SETS_WON + 1] = 0
+    return table.index[tuple(values)], sets[0], sets[1]
+
+
+@lru_cache(maxsize=STATE_VALUE_CACHE_SIZE)
+def outcome_values(
+    winrates: tuple[float, float], best_of_sets: int = 3
+) -> dict[tuple[int, int], np.ndarray]:
+    """Probability that player 1 wins the match after each set outcome.
+
+    Args:
+        winrates (tuple[float, float]): Point win rate of player 1 on the
+            serve of player 1 and of player 2.
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        dict[tuple[int, int], np.ndarray]: Win probability per outcome of
+            the set in play, per sets won by player 1 and player 2 before
+            that set.
+    """
+    sets_to_win = best_of_sets // 2 + 1
+    outlook = set_outlook(winrates, best_of_sets)
+    initial = transition_table(best_of_sets).initial
+    # Win probability from the start of a set, per sets won and server
+    starts: dict[tuple[int, int, int], float] = {}
+    values: dict[tuple[int, int], np.ndarray] = {}
+    # Later sets first, so every set only needs the set starts after it
+    for total in range(2 * sets_to_win - 2, -1, -1):
+        for sets_1 in range(
+            max(total - sets_to_win + 1, 0), min(total, sets_to_win - 1) + 1
+        ):
+            sets_2 = total - sets_1
+            continuations = np.empty(len(outlook.games))
+            for outcome, ((games_1, games_2), server) in enumerate(
+                zip(outlook.games, outlook.next_server)
+            ):
+                won_1 = sets_1 + (games_1 > games_2)
+                won_2 = sets_2 + (games_2 > games_1)
+                if won_1 == sets_to_win:
+                    continuations[outcome] = 1.0
+                elif won_2 == sets_to_win:
+                    continuations[outcome] = 0.0
+                else:
+                    continuations[outcome] = starts[won_1, won_2, server]
+            values[sets_1, sets_2] = continuations
+            for server in (0, 1):
+                row = outlook.probabilities[outlook.rows[initial[server]]]
+                starts[sets_1, sets_2, server] = float(row @ continuations)
+    return values
+
+
+def live_win_probability(
+    tennis_score: TennisScore, winrate_player_1: float | tuple[float, float]
+) -> float:
+    """Probability that player 1 wins a match from its current score.
+
+    After the first call for a win rate, this is a dictionary lookup and a
+    dot product over the outcomes of the set in play.
+
+    Args:
+        tennis_score (TennisScore): Current score of the match.
+        winrate_player_1 (float | tuple[float, float]): Probability that
+            player 1 wins a point, or a pair with the probability on the
+            serve of player 1 and on the serve of player 2.
+
+    Returns:
+        float: Win probability of player 1.
+    """
+    if tennis_score.winner_id is not None:
+        return float(tennis_score.winner_id == 0)
+    winrates = _as_pair(winrate_player_1)
+    best_of_sets = tennis_score.best_of_sets
+    state, sets_1, sets_2 = _within_set(best_of_sets, _state_index(tennis_score))
+    outlook = set_outlook(winrates, best_of_sets)
+    row = outlook.probabilities[outlook.rows[state]]
+    return float(row @ outcome_values(winrates, best_of_sets)[sets_1, sets_2])
+
+
+@lru_cache(maxsize=STATE_VALUE_CACHE_SIZE)
+def _remaining_score_lines(
+    winrates: tuple[float, float],
+    best_of_sets: int,
+    state: int,
+    sets_1: int,
+    sets_2: int,
+) -> dict[SetScores, float]:
+    """Exact distribution of the sets still to be played.
+
+    Args:
+        winrates (tuple[float, float]): Point win rate of player 1 on the
+            serve of player 1 and of player 2.
+        best_of_sets (int): Maximum number of sets in a match.
+        state (int): First-set state index of the score in the set in play.
+        sets_1 (int): Sets won by player 1 before the set in play.
+        sets_2 (int): Sets won by player 2 before the set in play.
+
+    Returns:
+        dict[SetScores, float]: Probability of the games of every
+            remaining set.
+    """
+    sets_to_win = best_of_sets // 2 + 1
+    outlook = set_outlook(winrates, best_of_sets)
+    initial = transition_table(best_of_sets).initial
+    lines: dict[SetScores, float] = {}
+    row = outlook.probabilities[outlook.rows[state]]
+    for outcome in np.flatnonzero(row).tolist():
+        games = outlook.games[outcome]
+        won_1 = sets_1 + (games[0] > games[1])
+        won_2 = sets_2 + (games[1] > games[0])
+        if sets_to_win in (won_1, won_2):
+            lines[(games,)] = lines.get((games,), 0.0) + float(row[outcome])
+            continue
+        later = _remaining_score_lines(
+            winrates,
+            best_of_sets,
+            initial[outlook.next_server[outcome]],
+            won_1,
+            won_2,
+        )
+        for line, probability in later.items():
+            key = (games, *line)
+            lines[key] = lines.get(key, 0.0) + float(row[outcome]) * probability
+    return lines
+
+
+def forecast(
+    tennis_score: TennisScore,
+    winrate_player_1: float | tuple[float, float],
+    number_of_matches: int = 10_000,
+    rng: np.random.Generator | None = None,
+) -> LiveForecast:
+    """Win probability and final score lines of a match from its current score.
+
+    The win probability is exact. Score lines are enumerated exactly from
+    the cached set outlook while at most MAX_EXACT_SETS sets remain, e.g.
+    for every best of 3 match. Otherwise `number_of_matches` matches are
+    simulated with the batch engine, resumed from the current score.
+
+    Args:
+        tennis_score (TennisScore): Current score of the match.
+        winrate_player_1 (float | tuple[float, float]): Probability that
+            player 1 wins a point, or a pair with the probability on the
+            serve of player 1 and on the serve of player 2.
+        number_of_matches (int): Number of matches to simulate when the
+            score lines are not enumerated.
+        rng (np.random.Generator | None): Random generator of the
+            simulation.
+
+    Returns:
+        LiveForecast: Win probability and score line distribution.
+    """
+    played = tennis_score.set_scores
+    if tennis_score.winner_id is not None:
+        return LiveForecast(
+            win=float(tennis_score.winner_id == 0),
+            score_lines={format_score_line(played): 1.0},
+            number_of_matches=0,
+        )
+    winrates = _as_pair(winrate_player_1)
+    best_of_sets = tennis_score.best_of_sets
+    state = _state_index(tennis_score)
+    win = live_win_probability(tennis_score, winrates)
+
+    if best_of_sets - len(played) <= MAX_EXACT_SETS:
+        lines = _remaining_score_lines(
+            winrates, best_of_sets, *_within_set(best_of_sets, state)
+        )
+        score_lines = {
+            format_score_line(played + line): probability
+            for line, probability in sorted(
+                lines.items(), key=lambda item: item[1], reverse=True
+            )
+        }
+        return LiveForecast(win=win, score_lines=score_lines, number_of_matches=0)
+
+    if number_of_matches < 1:
+        raise ValueError("At least one match must be simulated")
+    result = simulate_batch(
+        number_of_matches,
+        winrate_player_1=winrates,
+        best_of_sets=best_of_sets,
+        rng=rng,
+        start_state=state,
+    )
+    if played:
+        result.set_games[:, : len(played)] = played
+    counts = Counter(result.match_results())
+    return LiveForecast(
+        win=win,
+        score_lines={
+            line: count / number_of_matches for line, count in counts.most_common()
+        },
+        number_of_matches=number_of_matches,
+    )
+
+
+def _as_pair(winrate_player_1: float | tuple[float, float]) -> tuple[float, float]:
+    """Point win rates of player 1 per server as a hashable pair.
+
+    Args:
+        winrate_player_1 (float | tuple[float, float]): One win rate for
+            every point, or the win rates on either player's serve.
+
+    Returns:
+        tuple[float, float]: Win rates indexed by the id of the server.
+    """
+    if isinstance(winrate_player_1, tuple | list):
+        return float(winrate_player_1[0]), float(winrate_player_1[1])
+    return float(winrate_player_1), float(winrate_player_1)
+
+
+def _state_index(tennis_score: TennisScore) -> int:
+    """Transition table index of a running match.
+
+    Args:
+        tennis_score (TennisScore): Current score of the match.
+
+    Returns:
+        int: State index of the score.
+    """
+    state = tennis_score.state_index()
+    if state < 0:
+        raise ValueError("The score cannot be reached in a match")
+    return state
@@ -0,0 +1,74 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import numpy as np
+
+from tennis_simulator.config.constants import SHARD_SIZE
+
+
+def plan_shards(
+    number_of_simulations: int,
+    seed: int | None = None,
+    shard_size: int = SHARD_SIZE,
+) -> list[tuple[int, np.random.SeedSequence]]:
+    """Split a run into shards, each with its own independent seed.
+
+    Args:
+        number_of_simulations (int): Total number of matches to simulate.
+        seed (int | None): Root seed of the run. None draws fresh entropy.
+        shard_size (int): Maximum number of matches per shard.
+
+    Returns:
+        list[tuple[int, np.random.SeedSequence]]: Number of matches and seed
+            sequence per shard.
+    """
+    if shard_size < 1:
+        raise ValueError("Shard size must be at least 1")
+
+    sizes = [shard_size] * (number_of_simulations // shard_size)
+    if number_of_simulations % shard_size:
+        sizes.append(number_of_simulations % shard_size)
+
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(sizes))
+    return list(zip(sizes, seed_sequences))
+
+
+def run_shards[T, R](
+    function: Callable[[T], R],
+    tasks: Iterable[T],
+    workers: int = 1,
+    executor: Executor | None = None,
+) -> Iterator[R]:
+    """Run shard tasks in a process pool and yield the results in task order.
+
+    Args:
+        function (Callable[[T], R]): Picklable module-level function.
+        tasks (Iterable[T]): Arguments for every shard.
+        workers (int): Number of worker processes. 1 runs in this process.
+        executor (Executor | None): Pool shared with other runs, used
+            instead of a pool of `workers` processes. It is not shut down.
+
+    Yields:
+        R: Result of every shard, in the order of `tasks`. Closing the
+            generator early cancels the shards that have not started.
+    """
+    if executor is not None:
+        futures = [executor.submit(function, task) for task in tasks]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            # Only the shards of this run are dropped from the shared pool
+            for future in futures:
+                future.cancel()
+        return
+    if workers <= 1:
+        yield from map(function, tasks)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        yield from executor.map(function, tasks)
+    finally:
+        # A caller that stops early, e.g. a cancelled run, drops queued shards
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,86 @@
+import numpy as np
+
+from tennis_simulator.simulation.profiling import RunProfile
+from tennis_simulator.tennis_scoring.tennis_score import TennisScore
+
+# Points drawn per block, enough for a few hundred matches
+POINT_BLOCK_SIZE = 65_536
+
+
+class PointStream:
+    """Point outcomes of the scalar engine, drawn in preallocated blocks.
+
+    A block of uniforms is drawn with one NumPy call and turned into one
+    byte per point: bit 0 is the winner if player 1 serves and bit 1 the
+    winner if player 2 serves (0 = player 1, 1 = player 2). `TennisScore`
+    consumes the bytes with `play_points`, so there is no Python call per
+    point and the points won are counted per block.
+    """
+
+    def __init__(
+        self,
+        rng: np.random.Generator,
+        winrates: tuple[float, float],
+        block_size: int = POINT_BLOCK_SIZE,
+        profile: RunProfile | None = None,
+    ) -> None:
+        """Create a stream for fixed point win rates.
+
+        Args:
+            rng (np.random.Generator): Random generator to draw points from.
+            winrates (tuple[float, float]): Probability that player 1 wins a
+                point on the serve of player 1 and of player 2.
+            block_size (int): Number of points drawn at once.
+            profile (RunProfile | None): Profile to time every drawn block
+                in, as the "points" phase.
+        """
+        if block_size < 1:
+            raise ValueError("Block size must be at least 1")
+        self._rng = rng
+        self._winrates = winrates
+        self._profile = profile
+        self.serve_aware = winrates[0] != winrates[1]
+        # Buffers are reused for every block
+        self._uniforms = np.empty(block_size, dtype=np.float64)
+        self._winners = np.empty(block_size, dtype=np.bool_)
+        self._codes = np.empty(block_size, dtype=np.uint8)
+        self._block = b""
+        self._position = 0
+
+    def _refill(self) -> None:
+        """Draw the next block of point outcomes."""
+        if self._profile is not None:
+            with self._profile.measure("points"):
+                self._draw()
+        else:
+            self._draw()
+
+    def _draw(self) -> None:
+        """Fill the block with point outcomes from the random generator."""
+        self._rng.random(out=self._uniforms)
+        np.greater_equal(self._uniforms, self._winrates[0], out=self._winners)
+        np.copyto(self._codes, self._winners)
+        if self.serve_aware:
+            np.greater_equal(self._uniforms, self._winrates[1], out=self._winners)
+            self._codes += self._winners.view(np.uint8) << 1
+        else:
+            self._codes *= 3
+        self._block = self._codes.tobytes()
+        self._position = 0
+
+    def play(self, tennis_score: TennisScore) -> TennisScore:
+        """Play a match to the end.
+
+        Args:
+            tennis_score (TennisScore): Score to continue from.
+
+        Returns:
+            TennisScore: The finished score.
+        """
+        while tennis_score.winner_id is None:
+            if self._position >= len(self._block):
+                self._refill()
+            self._position = tennis_score.play_points(
+                self._block, self._position, self.serve_aware
+            )
+        return tennis_score
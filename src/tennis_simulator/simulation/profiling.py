@@ -0,0 +1,219 @@
+import cProfile
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+# Phases of a run, in pipeline order:
+# points      scalar engine: drawing point outcomes from the random generator
+# scoring     scalar engine: `TennisScore` playing the drawn points
+# simulate    batch and hierarchical engines: drawing and scoring together
+# statistics  adding finished matches to the shard aggregator
+# export      writing matches to exported `.npy` parts
+# merge       merging shard aggregators in the coordinator
+# score_lines rendering the score-line histogram into statistics
+PROFILE_PHASES = (
+    "points",
+    "scoring",
+    "simulate",
+    "statistics",
+    "export",
+    "merge",
+    "score_lines",
+)
+
+
+def _gc_collections() -> list[int]:
+    """Number of garbage collections so far, per generation."""
+    return [generation["collections"] for generation in gc.get_stats()]
+
+
+class RunProfile:
+    """Wall time, call counts and allocations per phase of a run.
+
+    Every shard records into its own profile, also in worker processes,
+    and the coordinator merges them like the shard aggregators. Phase
+    times are therefore summed over all workers, while `wall_seconds` is
+    the elapsed time of the whole run.
+
+    Allocations are counted as the net growth of the memory blocks of the
+    interpreter per phase and as the garbage collections per generation
+    while shards ran, which follow the number of container allocations.
+    If `tracemalloc` is tracing, e.g. with `python -X tracemalloc`, the
+    peak traced memory is reported too.
+    """
+
+    def __init__(self) -> None:
+        # Nanoseconds, calls and net allocated blocks per phase
+        self.phases: dict[str, list[int]] = {}
+        self.shards = 0
+        self.matches = 0
+        self.points = 0
+        self.gc_collections = [0] * len(gc.get_stats())
+        self.peak_traced_bytes: int | None = None
+        self.wall_seconds = 0.0
+
+    def add(
+        self, phase: str, nanoseconds: int, calls: int = 1, allocated_blocks: int = 0
+    ) -> None:
+        """Add measured time to a phase.
+
+        Args:
+            phase (str): Name of the phase, see PROFILE_PHASES.
+            nanoseconds (int): Wall time spent in the phase.
+            calls (int): Number of calls covered by the time.
+            allocated_blocks (int): Net growth of allocated memory blocks.
+        """
+        totals = self.phases.setdefault(phase, [0, 0, 0])
+        totals[0] += nanoseconds
+        totals[1] += calls
+        totals[2] += allocated_blocks
+
+    @contextmanager
+    def measure(self, phase: str, calls: int = 1) -> Iterator[None]:
+        """Time the enclosed block as one or more calls of a phase.
+
+        Args:
+            phase (str): Name of the phase, see PROFILE_PHASES.
+            calls (int): Number of calls the block stands for.
+        """
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(
+                phase,
+                time.perf_counter_ns() - start,
+                calls,
+                sys.getallocatedblocks() - blocks,
+            )
+
+    @contextmanager
+    def shard(self) -> Iterator[None]:
+        """Count a shard and the garbage collections while it runs."""
+        collections = _gc_collections()
+        try:
+            yield
+        finally:
+            self.shards += 1
+            for generation, count in enumerate(_gc_collections()):
+                self.gc_collections[generation] += count - collections[generation]
+            if tracemalloc.is_tracing():
+                self.peak_traced_bytes = max(
+                    self.peak_traced_bytes or 0, tracemalloc.get_traced_memory()[1]
+                )
+
+    def merge(self, other: "RunProfile") -> "RunProfile":
+        """Add the measurements of another profile, e.g. of a shard.
+
+        Args:
+            other (RunProfile): Profile to merge into this one.
+
+        Returns:
+            RunProfile: This profile, for chaining.
+        """
+        for phase, (nanoseconds, calls, allocated_blocks) in other.phases.items():
+            self.add(phase, nanoseconds, calls, allocated_blocks)
+        self.shards += other.shards
+        self.matches += other.matches
+        self.points += other.points
+        for generation, count in enumerate(other.gc_collections):
+            self.gc_collections[generation] += count
+        if other.peak_traced_bytes is not None:
+            self.peak_traced_bytes = max(
+                self.peak_traced_bytes or 0, other.peak_traced_bytes
+            )
+        return self
+
+    def to_report(self) -> dict[str, Any]:
+        """Render the profile as a JSON-serializable report.
+
+        Returns:
+            dict[str, Any]: Throughput of the run and, per phase in the
+                order of PROFILE_PHASES, its seconds, calls, share of the
+                profiled time and net allocated blocks.
+        """
+        profiled = sum(nanoseconds for nanoseconds, _, _ in self.phases.values())
+        order = {phase: rank for rank, phase in enumerate(PROFILE_PHASES)}
+        report: dict[str, Any] = {
+            "wall_seconds": self.wall_seconds,
+            "shards": self.shards,
+            "matches": self.matches,
+            "points": self.points,
+            "matches_per_second": (
+                self.matches / self.wall_seconds if self.wall_seconds else 0.0
+            ),
+            "points_per_second": (
+                self.points / self.wall_seconds if self.wall_seconds else 0.0
+            ),
+            "phases": {
+                phase: {
+                    "seconds": nanoseconds / 1e9,
+                    "calls": calls,
+                    "share": nanoseconds / profiled if profiled else 0.0,
+                    "allocated_blocks": allocated_blocks,
+                }
+                for phase, (nanoseconds, calls, allocated_blocks) in sorted(
+                    self.phases.items(), key=lambda item: order.get(item[0], len(order))
+                )
+            },
+            "gc_collections": list(self.gc_collections),
+        }
+        if self.peak_traced_bytes is not None:
+            report["peak_traced_bytes"] = self.peak_traced_bytes
+        return report
+
+
+def write_report(report: dict[str, Any], path: str | Path) -> None:
+    """Write a profile report, e.g. `statistics["profile"]`, as JSON.
+
+    Args:
+        report (dict[str, Any]): Report from `RunProfile.to_report`.
+        path (str | Path): Destination file.
+    """
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+
+
+@contextmanager
+def cprofile_to(path: str | Path | None) -> Iterator[None]:
+    """Run the enclosed block under cProfile and dump the stats to `path`.
+
+    The dump is read with `pstats.Stats(path)`. Only code running in this
+    process is profiled. Does nothing if `path` is None.
+
+    Args:
+        path (str | Path | None): File to dump the profile stats to.
+    """
+    if path is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def measure(
+    profile: RunProfile | None, phase: str, calls: int = 1
+) -> AbstractContextManager[None]:
+    """Time the enclosed block into `profile`, or do nothing without one.
+
+    Args:
+        profile (RunProfile | None): Profile of the run, None if disabled.
+        phase (str): Name of the phase, see PROFILE_PHASES.
+        calls (int): Number of calls the block stands for.
+
+    Returns:
+        AbstractContextManager[None]: Context timing the block.
+    """
+    return nullcontext() if profile is None else profile.measure(phase, calls)
@@ -0,0 +1,372 @@
+import argparse
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from tennis_simulator.simulation.cache import ResultCache
+
+# Only the standard library is imported here: NumPy and the engines are
+# imported when scenarios run, YAML and pydantic only for a changed file.
+
+
+# Validated scenario files, keyed by their path, modification time and size
+DEFAULT_CONFIG_CACHE_DIR = Path.home() / ".cache" / "tennis_simulator" / "scenarios"
+
+logger = logging.getLogger("simulation")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One validated simulator run of a scenario file.
+
+    Attributes:
+        name (str): Label of the scenario in the results.
+        winrate_player_1 (float): Probability that player 1 wins a point.
+        serve_winrates (tuple[float, float] | None): Probability that each
+            player wins a point on its own serve.
+        best_of_sets (int): Maximum number of sets in a match.
+        number_of_simulations (int): Number of matches to simulate.
+        seed (int | None): Seed of the run.
+        engine (str): Simulation engine.
+        estimator (str): Estimator of the match-win rate.
+        track_statistics (bool): Count deuces, breaks and tiebreaks per match.
+    """
+
+    name: str
+    winrate_player_1: float = 0.5
+    serve_winrates: tuple[float, float] | None = None
+    best_of_sets: int = 3
+    number_of_simulations: int = 10_000
+    seed: int | None = None
+    engine: str = "batch"
+    estimator: str = "plain"
+    track_statistics: bool = False
+
+
+@dataclass(frozen=True)
+class ScenarioPlan:
+    """Scenarios of a file and the settings they share.
+
+    Attributes:
+        workers (int): Number of worker processes shared by all scenarios.
+        shard_size (int): Maximum number of matches per shard.
+        scenarios (tuple[Scenario, ...]): Scenarios in the order of the file.
+    """
+
+    workers: int
+    shard_size: int
+    scenarios: tuple[Scenario, ...]
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """Statistics of one finished scenario.
+
+    Attributes:
+        scenario (Scenario): Scenario that was run.
+        statistics (dict[str, Any]): Statistics of `simulator.run_simulation`.
+        seconds (float): Wall time of the scenario.
+    """
+
+    scenario: Scenario
+    statistics: dict[str, Any]
+    seconds: float
+
+    def summary(self) -> dict[str, Any]:
+        """Scenario with its match-win estimate, without the histograms.
+
+        Returns:
+            dict[str, Any]: JSON-serializable row of the scenario.
+        """
+        statistics = self.statistics
+        number_of_matches = statistics["number_of_matches"]
+        return {
+            **asdict(self.scenario),
+            "number_of_matches": number_of_matches,
+            "player_1_wins": statistics["player_1_wins"],
+            "mean_points": (
+                (
+                    statistics["player_1_total_points_won"]
+                    + statistics["player_2_total_points_won"]
+                )
+                / number_of_matches
+                if number_of_matches
+                else None
+            ),
+            "estimate": statistics["estimator"],
+            "seconds": self.seconds,
+        }
+
+
+# Plans loaded by this process, by path, with the stamp they were read at
+_loaded: dict[Path, tuple[tuple[int, int], ScenarioPlan]] = {}
+
+
+def load_scenarios(
+    path: str | Path, cache_dir: str | Path | None = DEFAULT_CONFIG_CACHE_DIR
+) -> ScenarioPlan:
+    """Read a YAML scenario file, validating it only when it changed.
+
+    The validated file is kept in memory and as JSON in `cache_dir`, keyed
+    by the path, modification time and size of the file. Until the file
+    changes, later loads, also from new processes, skip YAML parsing and
+    pydantic validation and do not even import them.
+
+    Args:
+        path (str | Path): Scenario file, see `config.ScenarioFile`.
+        cache_dir (str | Path | None): Directory of validated files, None
+            to only cache in memory.
+
+    Returns:
+        ScenarioPlan: Validated scenarios with their shared settings.
+    """
+    path = Path(path).resolve()
+    status = path.stat()
+    stamp = (status.st_mtime_ns, status.st_size)
+    loaded = _loaded.get(path)
+    if loaded is not None and loaded[0] == stamp:
+        return loaded[1]
+
+    cache_path = None
+    data = None
+    if cache_dir is not None:
+        digest = hashlib.sha256(str(path).encode()).hexdigest()
+        cache_path = Path(cache_dir) / f"{digest}.json"
+        data = _read_cached(cache_path, stamp)
+    if data is None:
+        from tennis_simulator.config.read import load_scenario_file
+
+        data = load_scenario_file(path).model_dump(mode="json")
+        if cache_path is not None:
+            _write_cached(cache_path, stamp, data)
+        logger.info("Validated scenario file %s.", path)
+
+    plan = ScenarioPlan(
+        workers=data["workers"],
+        shard_size=data["shard_size"],
+        scenarios=tuple(
+            Scenario(
+                **{
+                    **scenario,
+                    "name": scenario["name"] or str(number),
+                    "serve_winrates": (
+                        tuple(scenario["serve_winrates"])
+                        if scenario["serve_winrates"] is not None
+                        else None
+                    ),
+                }
+            )
+            for number, scenario in enumerate(data["scenarios"])
+        ),
+    )
+    _loaded[path] = (stamp, plan)
+    return plan
+
+
+def _read_cached(cache_path: Path, stamp: tuple[int, int]) -> dict[str, Any] | None:
+    """Validated scenario file from the cache, if it has the given stamp.
+
+    Args:
+        cache_path (Path): Cache file of the scenario file.
+        stamp (tuple[int, int]): Modification time and size of the file.
+
+    Returns:
+        dict[str, Any] | None: Validated file, None if not cached.
+    """
+    try:
+        with open(cache_path) as file:
+            entry = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return entry["data"] if tuple(entry.get("stamp", ())) == stamp else None
+
+
+def _write_cached(
+    cache_path: Path, stamp: tuple[int, int], data: dict[str, Any]
+) -> None:
+    """Store a validated scenario file so readers never see half an entry.
+
+    Args:
+        cache_path (Path): Cache file of the scenario file.
+        stamp (tuple[int, int]): Modification time and size of the file.
+        data (dict[str, Any]): Validated file.
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=cache_path.parent, suffix=".tmp", delete=False
+    ) as file:
+        json.dump({"stamp": list(stamp), "data": data}, file)
+    os.replace(file.name, cache_path)
+
+
+def _run_scenario(
+    scenario: Scenario,
+    shard_size: int,
+    cache: "ResultCache | None" = None,
+    executor: Executor | None = None,
+) -> ScenarioResult:
+    """Run one scenario, on the shared pool if given.
+
+    Args:
+        scenario (Scenario): Scenario to run.
+        shard_size (int): Maximum number of matches per shard.
+        cache (ResultCache | None): Cache of seeded runs.
+        executor (Executor | None): Process pool shared by all scenarios.
+
+    Returns:
+        ScenarioResult: Statistics of the scenario.
+    """
+    from tennis_simulator.simulation.simulator import simulator
+
+    start = time.perf_counter()
+    simulation = simulator(
+        scenario.winrate_player_1,
+        best_of_sets=scenario.best_of_sets,
+        seed=scenario.seed,
+        serve_winrates=scenario.serve_winrates,
+        track_statistics=scenario.track_statistics,
+    )
+    simulation.run_simulation(
+        scenario.number_of_simulations,
+        engine=scenario.engine,
+        shard_size=shard_size,
+        estimator=scenario.estimator,
+        cache=cache,
+        executor=executor,
+    )
+    return ScenarioResult(scenario, simulation.statistics, time.perf_counter() - start)
+
+
+def run_scenarios(
+    plan: ScenarioPlan, workers: int | None = None, cache: "ResultCache | None" = None
+) -> Iterator[ScenarioResult]:
+    """Run all scenarios of a plan and yield each one as soon as it is done.
+
+    All scenarios share one pool of worker processes. Every scenario is
+    driven by its own thread, which queues its shards on the pool and
+    merges them in order, so a seeded scenario gives the statistics of
+    `simulator.run_simulation` with the same seed and shard size. With one
+    worker, the scenarios run one after the other in this process.
+
+    Args:
+        plan (ScenarioPlan): Scenarios from `load_scenarios`.
+        workers (int | None): Number of worker processes, by default the
+            number of the plan.
+        cache (ResultCache | None): Cache of seeded runs.
+
+    Yields:
+        ScenarioResult: Statistics of every scenario, in finishing order.
+    """
+    workers = plan.workers if workers is None else workers
+    if workers <= 1:
+        for scenario in plan.scenarios:
+            yield _run_scenario(scenario, plan.shard_size, cache)
+        return
+
+    # The scenario threads exist before the pool starts its processes, which
+    # is not safe with fork
+    context = multiprocessing.get_context("forkserver")
+    with (
+        ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool,
+        ThreadPoolExecutor(max_workers=workers) as threads,
+    ):
+        futures = [
+            threads.submit(_run_scenario, scenario, plan.shard_size, cache, pool)
+            for scenario in plan.scenarios
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # A caller that stops early drops the scenarios that have not started
+            for future in futures:
+                future.cancel()
+
+
+def _finite(value: Any) -> Any:
+    """Replace NaN and infinite floats with None, which JSON can represent.
+
+    Args:
+        value (Any): JSON-like value of nested dicts, lists and numbers.
+
+    Returns:
+        Any: The value with every non-finite float replaced by None.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def main(arguments: list[str] | None = None) -> None:
+    """Command line interface: run a scenario file, one JSON line per scenario."""
+    parser = argparse.ArgumentParser(
+        description="Run the simulation scenarios of a YAML file."
+    )
+    parser.add_argument("path", help="YAML file with the scenarios")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Override the workers of the file"
+    )
+    parser.add_argument(
+        "--statistics",
+        action="store_true",
+        help="Write the full statistics instead of a summary",
+    )
+    parser.add_argument(
+        "--config-cache-dir",
+        default=DEFAULT_CONFIG_CACHE_DIR,
+        help="Directory of validated scenario files",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not answer seeded scenarios from the result cache",
+    )
+    parser.add_argument(
+        "--output", default=None, help="JSON lines file, default stdout"
+    )
+    options = parser.parse_args(arguments)
+
+    plan = load_scenarios(options.path, options.config_cache_dir)
+    cache = None
+    if not options.no_cache:
+        from tennis_simulator.simulation.cache import ResultCache
+
+        cache = ResultCache()
+
+    with (
+        open(options.output, "w") if options.output else nullcontext(sys.stdout)
+    ) as file:
+        for result in run_scenarios(plan, workers=options.workers, cache=cache):
+            row = (
+                {"name": result.scenario.name, **result.statistics}
+                if options.statistics
+                else result.summary()
+            )
+            file.write(json.dumps(_finite(row), allow_nan=False) + "\n")
+            file.flush()
+
+
+if __name__ == "__main__":
+    main()
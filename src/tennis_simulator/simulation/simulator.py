@@ -1,85 +1,1001 @@
 import logging
-import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
-from tennis_simulator.tennis_scoring.tennis_score import TennisScore
+
+import numpy as np
+
+from tennis_simulator.analysis.confidence import wilson_interval
+from tennis_simulator.analysis.markov import (
+    MatchProbabilities,
+    ServeMatchProbabilities,
+    solve_match,
+    solve_serve_match,
+)
+from tennis_simulator.simulation.aggregator import StatisticsAggregator
+from tennis_simulator.simulation.batch import simulate_batch
+from tennis_simulator.simulation.cache import ENGINE_VERSION, ResultCache
+from tennis_simulator.simulation.estimators import ESTIMATORS
+from tennis_simulator.simulation.export import ResultWriter, combine_results
+from tennis_simulator.simulation.hierarchical import simulate_hierarchical
+from tennis_simulator.simulation.live import LiveForecast, forecast
+from tennis_simulator.simulation.parallel import SHARD_SIZE, plan_shards, run_shards
+from tennis_simulator.simulation.point_stream import PointStream
+from tennis_simulator.simulation.profiling import RunProfile, cprofile_to, measure
+from tennis_simulator.simulation.spool import (
+    DEFAULT_LEASE_SECONDS,
+    POLL_INTERVAL,
+    Spool,
+    work_in_pool,
+)
+from tennis_simulator.tennis_scoring.tennis_score import (
+    PLAYER_1,
+    PLAYER_2,
+    TennisScore,
+)
+
+
+ENGINES = ("scalar", "batch", "hierarchical")
+# "off" logs nothing, "summary" logs once per run and shard, "trace" also
+# logs every `trace_every`-th match of the scalar engine
+INSTRUMENTATION_LEVELS = ("off", "summary", "trace")
+
+logger = logging.getLogger("simulation")
+
+
+def _empty_statistics() -> dict[str, Any]:
+    """Create the initial statistics dictionary."""
+    return StatisticsAggregator().to_statistics()
+
+
+@dataclass(frozen=True)
+class _ShardTask:
+    """Everything a worker process needs to simulate one shard."""
+
+    winrate_player_1: float
+    best_of_sets: int
+    engine: str
+    number_of_simulations: int
+    seed_sequence: np.random.SeedSequence
+    keep_results: str = "none"
+    reservoir_size: int = 1000
+    spill_path: Path | None = None
+    export_path: Path | None = None
+    instrumentation: str = "off"
+    trace_every: int = 1000
+    antithetic: bool = False
+    serve_winrates: tuple[float, float] | None = None
+    first_server: int = PLAYER_1
+    track_statistics: bool = False
+    profile: bool = False
+
+
+def _shard_simulator(task: _ShardTask) -> "simulator":
+    """Create the simulator that runs one shard.
+
+    Args:
+        task (_ShardTask): Simulation parameters and seed of the shard.
+
+    Returns:
+        simulator: Simulator with the point model of the task.
+    """
+    return simulator(
+        task.winrate_player_1,
+        best_of_sets=task.best_of_sets,
+        instrumentation=task.instrumentation,
+        trace_every=task.trace_every,
+        serve_winrates=task.serve_winrates,
+        first_server=task.first_server,
+        track_statistics=task.track_statistics,
+        profile=task.profile,
+    )
+
+
+def _simulate_shard(task: _ShardTask) -> StatisticsAggregator:
+    """Simulate one shard of a run. Module level so worker processes can use it.
+
+    Args:
+        task (_ShardTask): Simulation parameters and seed of the shard.
+
+    Returns:
+        StatisticsAggregator: Aggregated statistics of the shard.
+    """
+    return _shard_simulator(task)._run_shard(task)
+
+
+def _profile_shard(task: _ShardTask) -> tuple[StatisticsAggregator, RunProfile]:
+    """Simulate one shard and profile its phases, like `_simulate_shard`.
+
+    Args:
+        task (_ShardTask): Simulation parameters and seed of the shard.
+
+    Returns:
+        tuple[StatisticsAggregator, RunProfile]: Aggregated statistics and
+            profile of the shard.
+    """
+    simulation = _shard_simulator(task)
+    profile = simulation._profile or RunProfile()
+    with profile.shard():
+        aggregator = simulation._run_shard(task)
+    profile.matches = aggregator.number_of_matches
+    profile.points = sum(aggregator.total_points_won)
+    return aggregator, profile
 
 
 class simulator:
-    def __init__(self, winrate_player_1: float = 0.5) -> None:
+    def __init__(
+        self,
+        winrate_player_1: float = 0.5,
+        best_of_sets: int = 3,
+        seed: int | None = None,
+        instrumentation: str = "off",
+        trace_every: int = 1000,
+        serve_winrates: tuple[float, float] | None = None,
+        first_server: int = PLAYER_1,
+        track_statistics: bool = False,
+        profile: bool = False,
+        pstats_path: str | Path | None = None,
+    ) -> None:
+        """Create a simulator for one pairing of players.
+
+        Args:
+            winrate_player_1 (float): Probability that player 1 wins a point.
+            best_of_sets (int): Maximum number of sets in a match.
+            seed (int | None): Seed of all random streams of a run.
+            instrumentation (str): Logging level, see INSTRUMENTATION_LEVELS.
+            trace_every (int): Log every n-th match at the "trace" level.
+            serve_winrates (tuple[float, float] | None): Probability that
+                player 1 wins a point on its own serve and that player 2
+                wins a point on its own serve. Replaces `winrate_player_1`
+                for the point model when given.
+            first_server (int): Player id serving the first game.
+            track_statistics (bool): Count points, games, deuces, break
+                points, breaks and tiebreaks per match and add their
+                histograms to the statistics under "match_statistics".
+            profile (bool): Time every phase of `run_simulation` and
+                `run_adaptive` runs, count calls and allocations, and add
+                the report of `RunProfile.to_report` to the statistics
+                under "profile". Write it to JSON with `write_report`.
+            pstats_path (str | Path | None): Dump a cProfile of the shards
+                run in this process to this file after every run, readable
+                with `pstats`. Shards in worker processes are not included,
+                so profile with `workers=1`.
+        """
+        if instrumentation not in INSTRUMENTATION_LEVELS:
+            raise ValueError(
+                f"Invalid instrumentation: {instrumentation}. "
+                f"Choose from {INSTRUMENTATION_LEVELS}."
+            )
+        if trace_every < 1:
+            raise ValueError("trace_every must be at least 1")
+        if first_server not in (PLAYER_1, PLAYER_2):
+            raise ValueError("first_server must be PLAYER_1 or PLAYER_2")
         self._winrate_player_1 = winrate_player_1  # Default win rate for player 1
-        self.statistics: dict[str, Any] = {
-            "number_of_matches": 0,
-            "player_1_wins": 0,
-            "player_2_wins": 0,
-            "player_1_total_points_won": 0,
-            "player_2_total_points_won": 0,
-            "results": [],
-        }
+        self._serve_winrates = serve_winrates
+        self._first_server = first_server
+        self._track_statistics = track_statistics
+        # Point win rate of player 1 by the id of the server
+        self._point_winrates = (
+            (serve_winrates[0], 1 - serve_winrates[1])
+            if serve_winrates is not None
+            else (winrate_player_1, winrate_player_1)
+        )
+        self._best_of_sets = best_of_sets
+        self._seed = seed
+        self._instrumentation = instrumentation
+        self._trace_every = trace_every
+        self._profiling = profile
+        self._pstats_path = pstats_path
+        # Profile of the shard this simulator runs, None when not profiling
+        self._profile = RunProfile() if profile else None
+        self._points = PointStream(np.random.default_rng(seed), self._point_winrates)
+        self._aggregator = StatisticsAggregator()
+        self._writer: ResultWriter | None = None
+        self.statistics: dict[str, Any] = _empty_statistics()
 
     def _simulate_game(self) -> TennisScore:
         """Run a simulation of a tennis game."""
-        tennis_score = TennisScore()
+        tennis_score = TennisScore(
+            best_of_sets=self._best_of_sets,
+            server=self._first_server,
+            track_statistics=self._track_statistics,
+        )
+
+        # Points come in blocks from the stream until there is a winner
+        return self._points.play(tennis_score)
+
+    def _gather_statistics(self, tennis_score: TennisScore) -> None:
+        """Gather statistics from the completed tennis score."""
+        winner = tennis_score.winner_id
+        assert winner is not None
+        self._aggregator.add_match(
+            winner,
+            tennis_score.set_scores,
+            tennis_score.total_points_won,
+            tennis_score.match_statistics,
+        )
+        if self._writer is not None:
+            self._writer.add_match(
+                winner,
+                tennis_score.set_scores,
+                tennis_score.total_points_won,
+            )
+
+    def run_simulation(
+        self,
+        number_of_simulations: int = 10,
+        engine: str = "scalar",
+        workers: int = 1,
+        shard_size: int = SHARD_SIZE,
+        keep_results: str = "none",
+        reservoir_size: int = 1000,
+        results_dir: str | Path | None = None,
+        export_dir: str | Path | None = None,
+        estimator: str = "plain",
+        confidence: float = 0.95,
+        progress: Callable[[int, int, dict[str, Any]], None] | None = None,
+        cancel: threading.Event | None = None,
+        cache: ResultCache | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        """Run the full tennis match simulation.
+
+        The run is split into shards of `shard_size` matches, each with its own
+        random stream derived from the simulator seed. The same seed therefore
+        gives the same statistics for any number of workers.
+
+        Statistics are aggregated as running counters, so memory does not grow
+        with the number of matches. Raw per-match results are only kept on
+        request, as a reservoir sample or spilled to one file per shard.
+        Every run spills into a new `run_*` directory inside `results_dir`,
+        so files of earlier runs are never mixed into its results.
+
+        Args:
+            number_of_simulations (int): Number of matches to simulate.
+            engine (str): "scalar" plays one match at a time, "batch" plays
+                all matches of a shard together as NumPy arrays and
+                "hierarchical" draws whole sets from cached exact set
+                distributions instead of single points.
+            workers (int): Number of worker processes to run shards on.
+            shard_size (int): Maximum number of matches per shard.
+            keep_results (str): "none", "reservoir" to keep a uniform sample
+                of `reservoir_size` results, or "spill" to write every result
+                to `results_dir`, listed under "results_paths" in the
+                statistics.
+            reservoir_size (int): Maximum number of sampled results.
+            results_dir (str | Path | None): Directory for spilled results.
+            export_dir (str | Path | None): Directory to export every match
+                to as columnar `.npy` files. Shards write their parts in
+                chunks while they run; the parts are combined at the end.
+                Read the export back with `load_results`.
+            estimator (str): Estimator of the player 1 match-win rate,
+                reported with its standard error under "estimator" in the
+                statistics. "plain" is the share of matches won.
+                "antithetic" (batch engine only) plays every second match
+                on mirrored random numbers and averages each pair.
+                "control_variate" corrects the share with the points won
+                by player 1, whose expectation is known exactly. It is not
+                available with serve win rates.
+            confidence (float): Confidence level of the estimator interval.
+            progress (Callable[[int, int, dict[str, Any]], None] | None):
+                Called after every merged shard with the number of matches
+                done, the total and the statistics so far.
+            cancel (threading.Event | None): Stops the run after the current
+                shard once set. The statistics then cover the finished
+                shards and get "cancelled": True.
+            cache (ResultCache | None): Cache of aggregated shards. Seeded
+                runs without raw results start from the cached whole shards
+                of the same parameters and only simulate the missing ones;
+                the statistics are the same as without the cache.
+            executor (Executor | None): Process pool shared with other
+                runs, e.g. the scenarios of `run_scenarios`, used instead of
+                `workers` new processes.
+        """
+        if keep_results == "spill" and results_dir is None:
+            raise ValueError("A results directory is required to spill results")
+        antithetic = self._check_estimator(
+            engine, estimator, number_of_simulations, shard_size
+        )
+        spill_dir = None
+        if keep_results == "spill" and results_dir is not None:
+            Path(results_dir).mkdir(parents=True, exist_ok=True)
+            spill_dir = Path(tempfile.mkdtemp(prefix="run_", dir=results_dir))
+
+        # Reset statistics before starting simulations
+        self._reset_statistics()
+        start = time.perf_counter()
+
+        tasks = [
+            self._shard_task(
+                engine,
+                size,
+                seed_sequence,
+                keep_results=keep_results,
+                reservoir_size=reservoir_size,
+                spill_path=(
+                    spill_dir / f"results_{shard:05d}.txt"
+                    if spill_dir is not None
+                    else None
+                ),
+                export_path=(
+                    Path(export_dir) / "parts" / f"{shard:05d}"
+                    if export_dir is not None
+                    else None
+                ),
+                antithetic=antithetic,
+            )
+            for shard, (size, seed_sequence) in enumerate(
+                plan_shards(
+                    number_of_simulations, seed=self._seed, shard_size=shard_size
+                )
+            )
+        ]
+        # Spilled results stay in the shard files; only their paths are merged
+        aggregator = StatisticsAggregator(
+            keep_results="reservoir" if keep_results == "reservoir" else "none",
+            reservoir_size=reservoir_size,
+            winrate_player_1=self._winrate_player_1,
+        )
+        cache_key = None
+        # Shards skipped thanks to the cache, and whole shards in the cache
+        finished = cached_shards = stored_shards = 0
+        if (
+            cache is not None
+            and self._seed is not None
+            and keep_results == "none"
+            and export_dir is None
+        ):
+            cache_key = cache.key(
+                winrate_player_1=self._winrate_player_1,
+                serve_winrates=self._serve_winrates,
+                first_server=self._first_server,
+                track_statistics=self._track_statistics,
+                best_of_sets=self._best_of_sets,
+                seed=self._seed,
+                engine=engine,
+                shard_size=shard_size,
+                antithetic=antithetic,
+            )
+            cached = cache.load(cache_key)
+            if cached is not None:
+                stored_shards = cached[0] // shard_size
+                # Entries only hold whole shards; a larger entry cannot be cut
+                if cached[0] <= number_of_simulations:
+                    cached_shards = finished = stored_shards
+                    aggregator = cached[1]
+
+        profile = RunProfile() if self._profiling else None
+        with cprofile_to(self._pstats_path):
+            for task, shard_aggregator in zip(
+                tasks[cached_shards:],
+                self._run_shards(tasks[cached_shards:], workers, profile, executor),
+            ):
+                if (
+                    cache is not None
+                    and cache_key is not None
+                    and task.number_of_simulations < shard_size
+                    and finished > stored_shards
+                ):
+                    # Only the last shard can be partial; cache the whole ones
+                    cache.store(cache_key, aggregator)
+                    stored_shards = finished
+                with measure(profile, "merge"):
+                    aggregator.merge(shard_aggregator)
+                finished += 1
+                if progress is not None:
+                    with measure(profile, "score_lines"):
+                        statistics = aggregator.to_statistics()
+                    progress(
+                        aggregator.number_of_matches, number_of_simulations, statistics
+                    )
+                if cancel is not None and cancel.is_set():
+                    break
+        if cache is not None and cache_key is not None:
+            whole_shards = min(finished, number_of_simulations // shard_size)
+            if whole_shards > stored_shards and whole_shards == finished:
+                cache.store(cache_key, aggregator)
+        cancelled = finished < len(tasks)
+        self._aggregator = aggregator
+        with measure(profile, "score_lines"):
+            self.statistics = aggregator.to_statistics()
+        assert aggregator.moments is not None
+        self.statistics["estimator"] = aggregator.moments.estimate(
+            estimator, confidence
+        )
+        if cancelled:
+            self.statistics["cancelled"] = True
+        if profile is not None:
+            profile.wall_seconds = time.perf_counter() - start
+            self.statistics["profile"] = profile.to_report()
+        if self._instrumentation != "off":
+            logger.info(
+                "Simulated %d matches in %d shards with the %s engine in %.3f s.",
+                aggregator.number_of_matches,
+                len(tasks),
+                engine,
+                time.perf_counter() - start,
+            )
+
+        if export_dir is not None:
+            combine_results(
+                [
+                    task.export_path
+                    for task in tasks[:finished]
+                    if task.export_path is not None
+                ],
+                export_dir,
+            )
+            parts_dir = Path(export_dir) / "parts"
+            if parts_dir.exists():
+                # Parts of shards that were still running when cancelled
+                shutil.rmtree(parts_dir)
+
+    def run_spooled(
+        self,
+        spool_dir: str | Path,
+        number_of_simulations: int = 10_000,
+        engine: str = "batch",
+        workers: int = 1,
+        shard_size: int = SHARD_SIZE,
+        estimator: str = "plain",
+        confidence: float = 0.95,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = POLL_INTERVAL,
+        cancel: threading.Event | None = None,
+    ) -> None:
+        """Run the simulation as a resumable job in a spool directory.
+
+        The seeded shards of the run are written to `spool_dir` together
+        with the simulator parameters. Local workers, and workers started on
+        other nodes with `python -m tennis_simulator.simulation.spool
+        <spool_dir>`, claim shards and store each shard aggregate as soon as
+        it is done. Once every shard is done, the shards are merged in
+        order, so the statistics equal those of `run_simulation` with the
+        same seed and shard size.
+
+        Calling this again with the same parameters resumes an interrupted
+        job and only simulates the shards that are not done. The seed is
+        part of these parameters, so only seeded runs can be spooled. While other
+        nodes still hold claims, the run waits for them and takes over
+        claims older than `lease_seconds`.
+
+        Args:
+            spool_dir (str | Path): Spool directory, shared by all nodes.
+            number_of_simulations (int): Number of matches to simulate.
+            engine (str): Simulation engine, see `run_simulation`.
+            workers (int): Number of local worker processes.
+            shard_size (int): Maximum number of matches per shard, and the
+                amount of work lost when a worker is interrupted.
+            estimator (str): Estimator of the match-win rate, see
+                `run_simulation`.
+            confidence (float): Confidence level of the estimator interval.
+            lease_seconds (float): Age after which the claim of a shard that
+                is not done is taken over.
+            poll_interval (float): Seconds between checks for shards of
+                other nodes.
+            cancel (threading.Event | None): Stops the run after the current
+                shard once set. The statistics then cover the shards done so
+                far and get "cancelled": True; the spool can be resumed.
+        """
+        if self._seed is None:
+            raise ValueError("A seed is required to spool a run")
+        antithetic = self._check_estimator(
+            engine, estimator, number_of_simulations, shard_size
+        )
+        self._reset_statistics()
+        start = time.perf_counter()
+        tasks = [
+            self._shard_task(engine, size, seed_sequence, antithetic=antithetic)
+            for size, seed_sequence in plan_shards(
+                number_of_simulations, seed=self._seed, shard_size=shard_size
+            )
+        ]
+        spool = Spool(spool_dir, lease_seconds)
+        spool.create(
+            _simulate_shard,
+            tasks,
+            {
+                "engine_version": ENGINE_VERSION,
+                "winrate_player_1": self._winrate_player_1,
+                "serve_winrates": self._serve_winrates,
+                "first_server": self._first_server,
+                "track_statistics": self._track_statistics,
+                "best_of_sets": self._best_of_sets,
+                "seed": self._seed,
+                "number_of_simulations": number_of_simulations,
+                "engine": engine,
+                "shard_size": shard_size,
+                "antithetic": antithetic,
+            },
+        )
+
+        # One pool for the whole job, also while waiting for other nodes
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while True:
+                if executor is None:
+                    spool.work(cancel=cancel)
+                else:
+                    work_in_pool(spool, executor, workers, cancel)
+                status = spool.status()
+                if status.complete or (cancel is not None and cancel.is_set()):
+                    break
+                # The remaining shards are claimed by workers on other nodes
+                time.sleep(poll_interval)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        aggregator = StatisticsAggregator(winrate_player_1=self._winrate_player_1)
+        for shard_aggregator in spool.results():
+            aggregator.merge(shard_aggregator)
+        self._aggregator = aggregator
+        self.statistics = aggregator.to_statistics()
+        assert aggregator.moments is not None
+        self.statistics["estimator"] = aggregator.moments.estimate(
+            estimator, confidence
+        )
+        if not status.complete:
+            self.statistics["cancelled"] = True
+        if self._instrumentation != "off":
+            logger.info(
+                "Merged %d of %d spooled shards with %d matches in %.3f s.",
+                status.done,
+                status.total,
+                aggregator.number_of_matches,
+                time.perf_counter() - start,
+            )
+
+    def run_adaptive(
+        self,
+        target_half_width: float = 0.002,
+        confidence: float = 0.95,
+        engine: str = "batch",
+        workers: int = 1,
+        batch_size: int = 5_000,
+        max_simulations: int = 10_000_000,
+        progress: Callable[[int, int, dict[str, Any]], None] | None = None,
+        cancel: threading.Event | None = None,
+    ) -> None:
+        """Simulate until the player 1 match-win rate is precise enough.
 
-        # Run as long as there is no winner
-        while not tennis_score.winner:
-            winner = self._simulate_points(win_rate_player_1=self._winrate_player_1)
-            tennis_score._update_score(winner)
-        logging.info("Simulation complete.")
-        return tennis_score
+        Matches are simulated in seeded batches of `batch_size`. After every
+        batch the Wilson interval of the player 1 match-win rate is updated
+        and the run stops once its half width is at most `target_half_width`
+        or `max_simulations` matches were played. Batches are checked in
+        order, so a seeded run uses the same number of matches for any
+        number of workers; batches simulated past the stopping point by
+        other workers are discarded.
 
-    def _simulate_points(self, win_rate_player_1: float) -> str:
-        """Simulate win or loss based on the given win rate.
+        The statistics get an "adaptive" entry with the estimate, its
+        interval and whether the target was met, and the "plain" entry
+        under "estimator" of `run_simulation`. "number_of_matches" is the
+        number of matches actually used.
 
         Args:
-            win_rate_player_1 (float): Win rate of player 1 (between 0 and 1).
-            tennis_score (TennisScore): Current tennis score object.
+            target_half_width (float): Target half width of the interval,
+                e.g. 0.002 for +-0.2%.
+            confidence (float): Confidence level of the interval.
+            engine (str): Simulation engine, see `run_simulation`.
+            workers (int): Number of worker processes to run batches on.
+            batch_size (int): Number of matches between stopping checks.
+            max_simulations (int): Upper bound on the number of matches.
+            progress (Callable[[int, int, dict[str, Any]], None] | None):
+                Called after every merged batch with the number of matches
+                done, `max_simulations` and the statistics so far.
+            cancel (threading.Event | None): Stops the run after the current
+                batch once set, with "cancelled": True in the statistics.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Invalid engine: {engine}. Choose from {ENGINES}.")
+        if target_half_width <= 0:
+            raise ValueError("Target half width must be positive")
+        if batch_size < 1 or max_simulations < 1:
+            raise ValueError("Batch size and max_simulations must be at least 1")
+        self._check_point_model(engine)
+
+        self._reset_statistics()
+        # Spawning from one root gives batch k the same seed as shard k of a
+        # fixed run with shard_size == batch_size
+        root = np.random.SeedSequence(self._seed)
+        aggregator = StatisticsAggregator(winrate_player_1=self._winrate_player_1)
+        half_width = float("inf")
+        interval = (0.0, 1.0)
+
+        def converged() -> bool:
+            return (
+                half_width <= target_half_width
+                or aggregator.number_of_matches >= max_simulations
+                or (cancel is not None and cancel.is_set())
+            )
+
+        start = time.perf_counter()
+        profile = RunProfile() if self._profiling else None
+        # One pool for all batches instead of new processes per round
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            with cprofile_to(self._pstats_path):
+                while not converged():
+                    # One batch per worker, without overshooting max_simulations
+                    remaining = max_simulations - aggregator.number_of_matches
+                    sizes = [
+                        min(batch_size, remaining - number * batch_size)
+                        for number in range(max(1, workers))
+                        if remaining > number * batch_size
+                    ]
+                    tasks = [
+                        self._shard_task(engine, size, seed_sequence)
+                        for size, seed_sequence in zip(sizes, root.spawn(len(sizes)))
+                    ]
+                    for shard_aggregator in self._run_shards(
+                        tasks, workers, profile, executor
+                    ):
+                        if converged():
+                            break
+                        with measure(profile, "merge"):
+                            aggregator.merge(shard_aggregator)
+                        interval = wilson_interval(
+                            aggregator.wins[0], aggregator.number_of_matches, confidence
+                        )
+                        half_width = (interval[1] - interval[0]) / 2
+                        if progress is not None:
+                            with measure(profile, "score_lines"):
+                                statistics = aggregator.to_statistics()
+                            progress(
+                                aggregator.number_of_matches,
+                                max_simulations,
+                                statistics,
+                            )
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        self._aggregator = aggregator
+        with measure(profile, "score_lines"):
+            self.statistics = aggregator.to_statistics()
+        assert aggregator.moments is not None
+        self.statistics["estimator"] = aggregator.moments.estimate("plain", confidence)
+        self.statistics["adaptive"] = {
+            "target_half_width": target_half_width,
+            "confidence": confidence,
+            "match_win_rate": (
+                aggregator.wins[0] / aggregator.number_of_matches
+                if aggregator.number_of_matches
+                else float("nan")
+            ),
+            "ci_lower": interval[0],
+            "ci_upper": interval[1],
+            "half_width": half_width,
+            "converged": half_width <= target_half_width,
+        }
+        if (
+            cancel is not None
+            and cancel.is_set()
+            and half_width > target_half_width
+            and aggregator.number_of_matches < max_simulations
+        ):
+            self.statistics["cancelled"] = True
+        if profile is not None:
+            profile.wall_seconds = time.perf_counter() - start
+            self.statistics["profile"] = profile.to_report()
+        if self._instrumentation != "off":
+            logger.info(
+                "Adaptive run used %d matches for a half width of %.5f.",
+                aggregator.number_of_matches,
+                half_width,
+            )
+
+    def exact_probabilities(self) -> MatchProbabilities | ServeMatchProbabilities:
+        """Exact game, set and match probabilities without simulating.
 
         Returns:
-            str:  Identifier of the winning player ("player_1" or "player_2").
+            MatchProbabilities | ServeMatchProbabilities: Win probabilities
+                and expected lengths for player 1 from the Markov chain
+                solver, per server when serve win rates are given.
         """
-        if random.random() < win_rate_player_1:
-            self.statistics["player_1_total_points_won"] += 1
-            return "player_1"
+        if self._serve_winrates is not None:
+            return solve_serve_match(
+                tuple(self._serve_winrates), self._best_of_sets, self._first_server
+            )
+        return solve_match(self._winrate_player_1, self._best_of_sets)
 
-        self.statistics["player_2_total_points_won"] += 1
-        return "player_2"
+    def forecast(
+        self, tennis_score: TennisScore, number_of_matches: int = 10_000
+    ) -> LiveForecast:
+        """Win probability and final score lines from the score of a live match.
 
-    def _gather_statistics(self, tennis_score: TennisScore) -> None:
-        """Gather statistics from the completed tennis score."""
-        if tennis_score.winner == "player_1":
-            self.statistics["player_1_wins"] += 1
+        Args:
+            tennis_score (TennisScore): Current score, with the match format
+                of this simulator.
+            number_of_matches (int): Number of matches to simulate when the
+                score lines are not enumerated exactly, see `live.forecast`.
+
+        Returns:
+            LiveForecast: Win probability of player 1 and score lines.
+        """
+        if tennis_score.best_of_sets != self._best_of_sets:
+            raise ValueError("The score must have the match format of the simulator")
+        return forecast(
+            tennis_score,
+            self._point_winrates,
+            number_of_matches=number_of_matches,
+            rng=np.random.default_rng(self._seed),
+        )
+
+    def _shard_task(
+        self,
+        engine: str,
+        number_of_simulations: int,
+        seed_sequence: np.random.SeedSequence,
+        **options: Any,
+    ) -> _ShardTask:
+        """Describe one shard with the point model of this simulator.
+
+        Args:
+            engine (str): Simulation engine of the run.
+            number_of_simulations (int): Number of matches of the shard.
+            seed_sequence (np.random.SeedSequence): Seed of the shard.
+            **options (Any): Further fields of `_ShardTask`.
+
+        Returns:
+            _ShardTask: Task for `_simulate_shard`.
+        """
+        return _ShardTask(
+            winrate_player_1=self._winrate_player_1,
+            best_of_sets=self._best_of_sets,
+            engine=engine,
+            number_of_simulations=number_of_simulations,
+            seed_sequence=seed_sequence,
+            instrumentation=self._instrumentation,
+            trace_every=self._trace_every,
+            serve_winrates=self._serve_winrates,
+            first_server=self._first_server,
+            track_statistics=self._track_statistics,
+            profile=self._profiling,
+            **options,
+        )
+
+    def _run_shards(
+        self,
+        tasks: list[_ShardTask],
+        workers: int,
+        profile: RunProfile | None,
+        executor: Executor | None = None,
+    ) -> Iterator[StatisticsAggregator]:
+        """Run shards in order, merging their profiles into `profile`.
+
+        Args:
+            tasks (list[_ShardTask]): Shards to run.
+            workers (int): Number of worker processes.
+            profile (RunProfile | None): Profile of the run, None if disabled.
+            executor (Executor | None): Shared pool to run the shards on.
+
+        Yields:
+            StatisticsAggregator: Aggregated statistics of every shard.
+        """
+        if profile is None:
+            yield from run_shards(
+                _simulate_shard, tasks, workers=workers, executor=executor
+            )
+            return
+        for shard_aggregator, shard_profile in run_shards(
+            _profile_shard, tasks, workers=workers, executor=executor
+        ):
+            profile.merge(shard_profile)
+            yield shard_aggregator
+
+    def _check_estimator(
+        self,
+        engine: str,
+        estimator: str,
+        number_of_simulations: int,
+        shard_size: int,
+    ) -> bool:
+        """Validate the engine and estimator of a fixed-size run.
+
+        Args:
+            engine (str): Simulation engine of the run.
+            estimator (str): Estimator of the match-win rate.
+            number_of_simulations (int): Number of matches of the run.
+            shard_size (int): Maximum number of matches per shard.
+
+        Returns:
+            bool: Whether the run plays antithetic pairs.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Invalid engine: {engine}. Choose from {ENGINES}.")
+        if estimator not in ESTIMATORS:
+            raise ValueError(
+                f"Invalid estimator: {estimator}. Choose from {ESTIMATORS}."
+            )
+        self._check_point_model(engine)
+        if estimator == "control_variate" and self._serve_winrates is not None:
+            raise ValueError("The control variate estimator needs one point win rate")
+        antithetic = estimator == "antithetic"
+        if antithetic and engine != "batch":
+            raise ValueError("The antithetic estimator needs the batch engine")
+        if antithetic and (number_of_simulations % 2 or shard_size % 2):
+            raise ValueError(
+                "The antithetic estimator needs an even number of simulations "
+                "and an even shard size"
+            )
+        return antithetic
+
+    def _check_point_model(self, engine: str) -> None:
+        """Reject engines that cannot play the point model or statistics.
+
+        Args:
+            engine (str): Simulation engine of the run.
+        """
+        if engine != "hierarchical":
+            return
+        if self._serve_winrates is not None:
+            raise ValueError(
+                "The hierarchical engine needs one point win rate; "
+                "use the scalar or batch engine with serve win rates"
+            )
+        if self._track_statistics:
+            raise ValueError(
+                "The hierarchical engine does not play single points; "
+                "use the scalar or batch engine to track statistics"
+            )
+
+    def _run_shard(self, task: _ShardTask) -> StatisticsAggregator:
+        """Simulate one shard with its own random stream.
+
+        Args:
+            task (_ShardTask): Simulation parameters and seed of the shard.
+
+        Returns:
+            StatisticsAggregator: Aggregated statistics of the shard.
+        """
+        points_seed, sample_seed = task.seed_sequence.spawn(2)
+        self._aggregator = StatisticsAggregator(
+            keep_results=task.keep_results,
+            reservoir_size=task.reservoir_size,
+            spill_path=task.spill_path,
+            seed=int(sample_seed.generate_state(1, np.uint64)[0]),
+            winrate_player_1=self._winrate_player_1,
+        )
+        if task.export_path is not None:
+            self._writer = ResultWriter(task.export_path, self._best_of_sets)
+        number_of_simulations = task.number_of_simulations
+
+        if task.engine != "scalar":
+            self._run_batch(
+                number_of_simulations,
+                rng=np.random.default_rng(points_seed),
+                antithetic=task.antithetic,
+                engine=task.engine,
+            )
         else:
-            self.statistics["player_2_wins"] += 1
-        # TODO: Get points per match and games per match. How many Deuces and so on.
-        self.statistics["results"].append(tennis_score.match_result())
+            self._points = PointStream(
+                np.random.default_rng(points_seed),
+                self._point_winrates,
+                profile=self._profile,
+            )
+            # Sampled tracing only; 0 skips it without any per-match logging
+            trace_every = self._trace_every if self._instrumentation == "trace" else 0
+            if self._profile is not None:
+                self._play_profiled(number_of_simulations, trace_every)
+            else:
+                # Run the specified number of simulations
+                for i in range(number_of_simulations):
+                    tennis_score = self._simulate_game()
+                    self._gather_statistics(tennis_score)
+                    if trace_every and i % trace_every == 0:
+                        self._trace(i, number_of_simulations, tennis_score)
 
-    def run_simulation(self, number_of_simulations: int = 10) -> None:
-        """Run the full tennis match simulation."""
+        # Flushing spilled results is part of the statistics of the matches
+        with measure(self._profile, "statistics", calls=0):
+            self._aggregator.flush()
+        if self._instrumentation != "off":
+            logger.info(
+                "Shard of %d matches complete.", self._aggregator.number_of_matches
+            )
+        if self._writer is not None:
+            with measure(self._profile, "export"):
+                self._writer.close()
+            self._writer = None
+        return self._aggregator
 
-        # Reset statistics before starting simulations
-        self._reset_statistics()
+    def _play_profiled(self, number_of_simulations: int, trace_every: int) -> None:
+        """Play the matches of a scalar shard, timing scoring and statistics.
+
+        The point stream times its own blocks as the "points" phase, which
+        is taken out of the time spent playing matches. Counting allocated
+        blocks walks the heap, so it is done once for the whole loop; the
+        net growth stays in the aggregator and counts as "statistics".
 
-        # Run the specified number of simulations
+        Args:
+            number_of_simulations (int): Number of matches to play.
+            trace_every (int): Log every n-th match, 0 for none.
+        """
+        profile = self._profile
+        assert profile is not None
+        drawn_before = profile.phases.get("points", [0, 0, 0])[:]
+        blocks = sys.getallocatedblocks()
+        played = gathered = 0
+        start = time.perf_counter_ns()
         for i in range(number_of_simulations):
-            logging.info(f"Starting simulation {i + 1}/{number_of_simulations}.")
             tennis_score = self._simulate_game()
-            logging.info(
-                f"Simulation {i + 1} complete. Winner: {tennis_score.winner}. Final Score: {tennis_score.match_result()}."
-            )
+            finished = time.perf_counter_ns()
             self._gather_statistics(tennis_score)
+            if trace_every and i % trace_every == 0:
+                self._trace(i, number_of_simulations, tennis_score)
+            end = time.perf_counter_ns()
+            played += finished - start
+            gathered += end - finished
+            start = end
+        drawn = profile.phases.get("points", [0, 0, 0])
+        profile.add(
+            "scoring", played - (drawn[0] - drawn_before[0]), number_of_simulations
+        )
+        profile.add(
+            "statistics",
+            gathered,
+            number_of_simulations,
+            sys.getallocatedblocks() - blocks - (drawn[2] - drawn_before[2]),
+        )
+
+    def _trace(
+        self, i: int, number_of_simulations: int, tennis_score: TennisScore
+    ) -> None:
+        """Log a sampled match at the "trace" instrumentation level."""
+        logger.info(
+            "Simulation %d/%d complete. Winner: %s. Final Score: %s.",
+            i + 1,
+            number_of_simulations,
+            tennis_score.winner,
+            tennis_score.match_result(),
+        )
 
-        self.statistics["number_of_matches"] = number_of_simulations
+    def _run_batch(
+        self,
+        number_of_simulations: int,
+        rng: np.random.Generator,
+        antithetic: bool = False,
+        engine: str = "batch",
+    ) -> None:
+        """Run simulations with the vectorized batch or hierarchical engine."""
+        with measure(self._profile, "simulate", number_of_simulations):
+            if engine == "hierarchical":
+                result = simulate_hierarchical(
+                    number_of_matches=number_of_simulations,
+                    winrate_player_1=self._winrate_player_1,
+                    best_of_sets=self._best_of_sets,
+                    rng=rng,
+                )
+            else:
+                result = simulate_batch(
+                    number_of_matches=number_of_simulations,
+                    winrate_player_1=(
+                        self._point_winrates
+                        if self._serve_winrates is not None
+                        else self._winrate_player_1
+                    ),
+                    best_of_sets=self._best_of_sets,
+                    rng=rng,
+                    antithetic=antithetic,
+                    first_server=self._first_server,
+                    track_statistics=self._track_statistics,
+                )
+        with measure(self._profile, "statistics", number_of_simulations):
+            self._aggregator.add_batch(result)
+        if self._writer is not None:
+            with measure(self._profile, "export"):
+                self._writer.write_batch(result)
 
     def _reset_statistics(self) -> None:
         """Reset the statistics to initial state."""
-        self.statistics = {
-            "number_of_matches": 0,
-            "player_1_wins": 0,
-            "player_2_wins": 0,
-            "player_1_total_points_won": 0,
-            "player_2_total_points_won": 0,
-            "results": [],
-        }
+        self.statistics = _empty_statistics()
 
     def _create_plots(self) -> None:
         """Create plots for the simulation results."""
@@ -0,0 +1,332 @@
+import argparse
+import logging
+import os
+import pickle
+import socket
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+# Seconds after which the claim of a shard that is not done may be taken
+# over. Must be longer than the slowest shard takes to run.
+DEFAULT_LEASE_SECONDS = 3600.0
+# Seconds between two checks for shards finished on other nodes
+POLL_INTERVAL = 5.0
+
+logger = logging.getLogger("simulation")
+
+
+@dataclass(frozen=True)
+class SpoolJob:
+    """Description of a spooled job, written once by the coordinator.
+
+    Attributes:
+        function (Callable[[Any], Any]): Picklable module-level function
+            that runs one shard task.
+        tasks (tuple[Any, ...]): Task per shard, with its own seed.
+        parameters (dict[str, Any]): Parameters the job was created with.
+            A restarted coordinator must pass the same parameters.
+    """
+
+    function: Callable[[Any], Any]
+    tasks: tuple[Any, ...]
+    parameters: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class SpoolStatus:
+    """Progress of a spooled job.
+
+    Attributes:
+        total (int): Number of shards of the job.
+        done (int): Number of shards with a stored result.
+        claimed (int): Number of shards claimed by a worker but not done.
+    """
+
+    total: int
+    done: int
+    claimed: int
+
+    @property
+    def complete(self) -> bool:
+        """Whether every shard has a result."""
+        return self.done == self.total
+
+
+class Spool:
+    """Directory through which the shards of one job are claimed and collected.
+
+    The coordinator writes the job with `create`. Workers on any node that
+    sees the directory, e.g. over a shared file system, claim shards with
+    `work`. A claim is a file created exclusively, so two workers never
+    run the same shard at the same time. Every finished shard is written
+    atomically as its own pickled result, which is the checkpoint of the
+    job: restarted workers and coordinators skip shards that are done.
+
+    A claim older than `lease_seconds` belongs to a worker that died and
+    is taken over. Shards run from their own seed, so a shard that still
+    runs twice yields the same result both times.
+
+    Only point the spool at directories written by this class.
+    """
+
+    def __init__(
+        self, directory: str | Path, lease_seconds: float = DEFAULT_LEASE_SECONDS
+    ) -> None:
+        if lease_seconds <= 0:
+            raise ValueError("The lease must be positive")
+        self.directory = Path(directory)
+        self.lease_seconds = lease_seconds
+        self._job: SpoolJob | None = None
+
+    def create(
+        self,
+        function: Callable[[Any], Any],
+        tasks: list[Any],
+        parameters: dict[str, Any],
+    ) -> None:
+        """Write the job, or check that it matches an existing one.
+
+        Args:
+            function (Callable[[Any], Any]): Picklable module-level function
+                that runs one task.
+            tasks (list[Any]): Task per shard.
+            parameters (dict[str, Any]): Parameters of the job.
+        """
+        path = self.directory / "job.pkl"
+        if path.exists():
+            if self.job.parameters != parameters:
+                raise ValueError(
+                    f"The spool {self.directory} holds a job with other parameters"
+                )
+            return
+        for name in ("claims", "done"):
+            (self.directory / name).mkdir(parents=True, exist_ok=True)
+        self._write(path, SpoolJob(function, tuple(tasks), parameters))
+
+    @property
+    def job(self) -> SpoolJob:
+        """Job of the spool, read once."""
+        if self._job is None:
+            try:
+                with open(self.directory / "job.pkl", "rb") as file:
+                    self._job = pickle.load(file)
+            except FileNotFoundError:
+                raise ValueError(f"No job in the spool {self.directory}") from None
+        return self._job
+
+    def status(self) -> SpoolStatus:
+        """Count the shards that are done and claimed.
+
+        Returns:
+            SpoolStatus: Progress of the job.
+        """
+        done = {path.stem for path in (self.directory / "done").glob("*.pkl")}
+        claims = {path.name for path in (self.directory / "claims").iterdir()}
+        return SpoolStatus(
+            total=len(self.job.tasks), done=len(done), claimed=len(claims - done)
+        )
+
+    def work(
+        self,
+        worker_id: str | None = None,
+        max_shards: int | None = None,
+        cancel: threading.Event | None = None,
+    ) -> int:
+        """Claim and run shards until none is left to claim.
+
+        Args:
+            worker_id (str | None): Name written into the claims, by
+                default the host name and process id.
+            max_shards (int | None): Stop after this many shards.
+            cancel (threading.Event | None): Stop after the current shard
+                once set.
+
+        Returns:
+            int: Number of shards run by this call.
+        """
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        job = self.job
+        finished = 0
+        for shard, task in enumerate(job.tasks):
+            if max_shards is not None and finished >= max_shards:
+                break
+            if cancel is not None and cancel.is_set():
+                break
+            if self._done_path(shard).exists() or not self._claim(shard, worker_id):
+                continue
+            start = time.perf_counter()
+            self._write(self._done_path(shard), job.function(task))
+            self._claim_path(shard).unlink(missing_ok=True)
+            finished += 1
+            logger.info(
+                "Worker %s finished shard %d in %.3f s.",
+                worker_id,
+                shard,
+                time.perf_counter() - start,
+            )
+        return finished
+
+    def results(self) -> Iterator[Any]:
+        """Read the results of the shards that are done, in shard order.
+
+        Check `status` first to reduce only complete jobs.
+
+        Yields:
+            Any: Result of every shard that is done.
+        """
+        for shard in range(len(self.job.tasks)):
+            path = self._done_path(shard)
+            if not path.exists():
+                continue
+            with open(path, "rb") as file:
+                result = pickle.load(file)
+            yield result
+
+    def _claim(self, shard: int, worker_id: str) -> bool:
+        """Claim a shard, taking over an expired claim.
+
+        Args:
+            shard (int): Shard index.
+            worker_id (str): Name of the claiming worker.
+
+        Returns:
+            bool: Whether this worker now holds the claim.
+        """
+        path = self._claim_path(shard)
+        for _ in range(2):
+            try:
+                descriptor = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    age = time.time() - path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if age < self.lease_seconds:
+                    return False
+                logger.warning("Taking over the expired claim of shard %d.", shard)
+                path.unlink(missing_ok=True)
+                continue
+            with os.fdopen(descriptor, "w") as file:
+                file.write(worker_id)
+            return True
+        return False
+
+    def _claim_path(self, shard: int) -> Path:
+        """Claim file of a shard."""
+        return self.directory / "claims" / f"{shard:06d}"
+
+    def _done_path(self, shard: int) -> Path:
+        """Result file of a shard."""
+        return self.directory / "done" / f"{shard:06d}.pkl"
+
+    def _write(self, path: Path, value: Any) -> None:
+        """Pickle a value so that readers never see half a file.
+
+        Args:
+            path (Path): Destination file.
+            value (Any): Value to pickle.
+        """
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, suffix=".tmp", delete=False
+        ) as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(file.name, path)
+
+
+def work_spool(
+    directory: str | Path,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    max_shards: int | None = None,
+) -> int:
+    """Run a worker on a spool. Module level for worker processes.
+
+    Args:
+        directory (str | Path): Spool directory.
+        lease_seconds (float): Age after which claims are taken over.
+        max_shards (int | None): Stop after this many shards.
+
+    Returns:
+        int: Number of shards run by the worker.
+    """
+    return Spool(directory, lease_seconds).work(max_shards=max_shards)
+
+
+def work_in_pool(
+    spool: Spool,
+    executor: Executor,
+    workers: int,
+    cancel: threading.Event | None = None,
+) -> int:
+    """Run workers on a spool in a process pool until none is left to claim.
+
+    An event cannot be passed to worker processes, so every submitted
+    worker runs a single shard and is only submitted again while `cancel`
+    is not set. A cancelled run stops once the running shards are done.
+
+    Args:
+        spool (Spool): Spool with a job.
+        executor (Executor): Process pool to run the workers on.
+        workers (int): Number of workers running at the same time.
+        cancel (threading.Event | None): Stop after the running shards
+            once set.
+
+    Returns:
+        int: Number of shards run by the workers.
+    """
+
+    def cancelled() -> bool:
+        return cancel is not None and cancel.is_set()
+
+    worker = partial(
+        work_spool, spool.directory, lease_seconds=spool.lease_seconds, max_shards=1
+    )
+    running = (
+        set() if cancelled() else {executor.submit(worker) for _ in range(workers)}
+    )
+    finished = 0
+    try:
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                shards = future.result()
+                finished += shards
+                # A worker that found no shard to claim is not replaced
+                if shards and not cancelled():
+                    running.add(executor.submit(worker))
+    finally:
+        for future in running:
+            future.cancel()
+    return finished
+
+
+def main(arguments: list[str] | None = None) -> None:
+    """Command line interface: work on a spool created by a coordinator."""
+    parser = argparse.ArgumentParser(
+        description="Claim and run shards of a spooled simulation job."
+    )
+    parser.add_argument("directory", help="Spool directory of the job")
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS)
+    parser.add_argument("--max-shards", type=int, default=None)
+    options = parser.parse_args(arguments)
+
+    logging.basicConfig(level=logging.INFO)
+    spool = Spool(options.directory, options.lease)
+    finished = spool.work(max_shards=options.max_shards)
+    status = spool.status()
+    logger.info(
+        "Ran %d shards; %d of %d shards of the job are done.",
+        finished,
+        status.done,
+        status.total,
+    )
+
+
+if __name__ == "__main__":
+    main()
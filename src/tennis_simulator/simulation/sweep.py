@@ -0,0 +1,199 @@
+import argparse
+import csv
+import sys
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from tennis_simulator.analysis.confidence import wilson_interval
+from tennis_simulator.analysis.markov import match_win_probability
+from tennis_simulator.simulation.batch import simulate_grid
+from tennis_simulator.simulation.parallel import SHARD_SIZE, plan_shards, run_shards
+from tennis_simulator.tennis_scoring.constants import PLAYER_1
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """Simulated match-win probability of player 1 at one grid point.
+
+    Attributes:
+        winrate_player_1 (float): Probability that player 1 wins a point.
+        best_of_sets (int): Maximum number of sets in a match.
+        number_of_matches (int): Number of simulated matches.
+        player_1_wins (int): Matches won by player 1.
+        match_win_probability (float): Share of matches won by player 1.
+        ci_lower (float): Lower bound of the Wilson confidence interval.
+        ci_upper (float): Upper bound of the Wilson confidence interval.
+        mean_points (float): Average number of points per match.
+        exact_match_win_probability (float): Exact value from the Markov
+            chain solver, for reference.
+    """
+
+    winrate_player_1: float
+    best_of_sets: int
+    number_of_matches: int
+    player_1_wins: int
+    match_win_probability: float
+    ci_lower: float
+    ci_upper: float
+    mean_points: float
+    exact_match_win_probability: float
+
+
+@dataclass(frozen=True)
+class _SweepTask:
+    """One shard of matches, simulated for every win rate of the grid."""
+
+    winrates_player_1: tuple[float, ...]
+    best_of_sets: int
+    number_of_matches: int
+    seed_sequence: np.random.SeedSequence
+
+
+def _sweep_shard(task: _SweepTask) -> np.ndarray:
+    """Simulate one shard for the whole grid. Module level for worker processes.
+
+    Args:
+        task (_SweepTask): Grid, match format and seed of the shard.
+
+    Returns:
+        np.ndarray: Player 1 wins and total points per grid point, shape (g, 2).
+    """
+    results = simulate_grid(
+        task.number_of_matches,
+        task.winrates_player_1,
+        best_of_sets=task.best_of_sets,
+        rng=np.random.default_rng(task.seed_sequence),
+    )
+    return np.array(
+        [
+            (np.count_nonzero(result.winners == PLAYER_1), result.points_won.sum())
+            for result in results
+        ],
+        dtype=np.int64,
+    )
+
+
+def winrate_grid(start: float, stop: float, step: float) -> list[float]:
+    """Evenly spaced win rates from `start` to `stop`, both included.
+
+    Args:
+        start (float): First win rate.
+        stop (float): Last win rate.
+        step (float): Distance between grid points.
+
+    Returns:
+        list[float]: Win rates rounded to remove floating point noise.
+    """
+    if step <= 0:
+        raise ValueError("Step must be positive")
+    number_of_points = round((stop - start) / step) + 1
+    return [round(start + point * step, 10) for point in range(number_of_points)]
+
+
+def sweep(
+    winrates_player_1: list[float],
+    best_of_sets: tuple[int, ...] = (3,),
+    number_of_simulations: int = 10_000,
+    seed: int | None = None,
+    workers: int = 1,
+    shard_size: int = SHARD_SIZE,
+    confidence: float = 0.95,
+) -> list[SweepPoint]:
+    """Estimate the match-win probability for a grid of point win rates.
+
+    The run is split into shards of matches. Every shard simulates its
+    matches for all grid points at once with common random numbers, so the
+    grid points share one random stream and one pass through the batch
+    engine. Shards run in parallel on `workers` processes and a seeded sweep
+    gives the same table for any number of workers.
+
+    Args:
+        winrates_player_1 (list[float]): Point win rates of player 1.
+        best_of_sets (tuple[int, ...]): Match formats to evaluate.
+        number_of_simulations (int): Number of matches per grid point.
+        seed (int | None): Root seed of the sweep.
+        workers (int): Number of worker processes to run shards on.
+        shard_size (int): Maximum number of matches per shard.
+        confidence (float): Confidence level of the intervals.
+
+    Returns:
+        list[SweepPoint]: One row per match format and win rate.
+    """
+    if number_of_simulations < 1:
+        raise ValueError("A sweep needs at least one simulation per grid point")
+    winrates = tuple(float(winrate) for winrate in winrates_player_1)
+    if any(not 0 <= winrate <= 1 for winrate in winrates):
+        raise ValueError("Win rates must be between 0 and 1")
+
+    shards = plan_shards(number_of_simulations, seed=seed, shard_size=shard_size)
+    tasks = [
+        _SweepTask(winrates, sets, size, seed_sequence)
+        for sets in best_of_sets
+        for size, seed_sequence in shards
+    ]
+    totals = {
+        sets: np.zeros((len(winrates), 2), dtype=np.int64) for sets in best_of_sets
+    }
+    for task, counts in zip(tasks, run_shards(_sweep_shard, tasks, workers=workers)):
+        totals[task.best_of_sets] += counts
+
+    points = []
+    for sets in best_of_sets:
+        for winrate, (wins, total_points) in zip(winrates, totals[sets].tolist()):
+            ci_lower, ci_upper = wilson_interval(
+                wins, number_of_simulations, confidence
+            )
+            points.append(
+                SweepPoint(
+                    winrate_player_1=winrate,
+                    best_of_sets=sets,
+                    number_of_matches=number_of_simulations,
+                    player_1_wins=wins,
+                    match_win_probability=wins / number_of_simulations,
+                    ci_lower=ci_lower,
+                    ci_upper=ci_upper,
+                    mean_points=total_points / number_of_simulations,
+                    exact_match_win_probability=match_win_probability(winrate, sets),
+                )
+            )
+    return points
+
+
+def main(arguments: list[str] | None = None) -> None:
+    """Command line interface: write a sweep as CSV."""
+    parser = argparse.ArgumentParser(
+        description="Simulate the match-win probability over a win-rate grid."
+    )
+    parser.add_argument("--start", type=float, default=0.40)
+    parser.add_argument("--stop", type=float, default=0.70)
+    parser.add_argument("--step", type=float, default=0.005)
+    parser.add_argument("--best-of-sets", type=int, nargs="+", default=[3])
+    parser.add_argument("--simulations", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--output", default=None, help="CSV file, default stdout")
+    options = parser.parse_args(arguments)
+
+    points = sweep(
+        winrate_grid(options.start, options.stop, options.step),
+        best_of_sets=tuple(options.best_of_sets),
+        number_of_simulations=options.simulations,
+        seed=options.seed,
+        workers=options.workers,
+        confidence=options.confidence,
+    )
+    with (
+        open(options.output, "w", newline="")
+        if options.output
+        else nullcontext(sys.stdout)
+    ) as file:
+        writer = csv.DictWriter(file, fieldnames=list(SweepPoint.__annotations__))
+        writer.writeheader()
+        writer.writerows(asdict(point) for point in points)
+
+
+if __name__ == "__main__":
+    main()
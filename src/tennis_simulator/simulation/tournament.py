@@ -0,0 +1,272 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from tennis_simulator.analysis.markov import (
+    match_win_probabilities,
+    solve_serve_match,
+)
+from tennis_simulator.simulation.parallel import SHARD_SIZE, plan_shards, run_shards
+
+# Bracket entry of an empty slot; the opponent advances without playing
+BYE = -1
+
+
+@dataclass(frozen=True)
+class TournamentResult:
+    """Advancement probabilities of every player of a knockout draw.
+
+    Attributes:
+        number_of_tournaments (int): Number of simulated tournaments, 0 for
+            exact results.
+        advancement (np.ndarray): Probability that a player reaches each
+            round, shape (players, rounds + 1). Column 0 is the first
+            round and the last column is winning the tournament.
+    """
+
+    number_of_tournaments: int
+    advancement: np.ndarray
+
+    @property
+    def rounds(self) -> int:
+        """Number of rounds of the draw."""
+        return self.advancement.shape[1] - 1
+
+    @property
+    def title(self) -> np.ndarray:
+        """Probability that each player wins the tournament."""
+        return self.advancement[:, -1]
+
+
+@dataclass(frozen=True)
+class _TournamentTask:
+    """One shard of tournaments played on the same draw."""
+
+    match_probabilities: np.ndarray
+    bracket: tuple[int, ...]
+    number_of_tournaments: int
+    seed_sequence: np.random.SeedSequence
+
+
+def head_to_head(
+    strengths: np.ndarray, best_of_sets: int = 3, serve: bool = False
+) -> np.ndarray:
+    """Match-win probabilities of every pairing from point win rates.
+
+    Every pairing is solved once with the exact Markov chain solver. The
+    matrix is computed once per draw and shared by all simulated
+    tournaments and shards.
+
+    Args:
+        strengths (np.ndarray): Square matrix of point win rates. Entry
+            (i, j) is the probability that player i wins a point against
+            player j, so entries (i, j) and (j, i) must add up to one. With
+            `serve` it is the probability that player i wins a point on
+            its own serve, and the entries are independent.
+        best_of_sets (int): Maximum number of sets in a match.
+        serve (bool): Read the strengths as serve win rates. The first
+            server of each match is drawn with equal probability. Pairings
+            are then solved one by one with the cached serve-aware solver.
+
+    Returns:
+        np.ndarray: Matrix whose entry (i, j) is the probability that
+            player i beats player j.
+    """
+    strengths = np.asarray(strengths, dtype=np.float64)
+    players = len(strengths)
+    if strengths.shape != (players, players):
+        raise ValueError("The strength matrix must be square")
+
+    first, second = np.triu_indices(players, k=1)
+    if not serve and not np.allclose(
+        strengths[first, second] + strengths[second, first], 1.0
+    ):
+        raise ValueError("Point win rates of a pairing must add up to one")
+    if serve:
+        matches = np.array(
+            [
+                sum(
+                    solve_serve_match(
+                        (strengths[player, opponent], strengths[opponent, player]),
+                        best_of_sets,
+                        server,
+                    ).match
+                    for server in (0, 1)
+                )
+                / 2
+                for player, opponent in zip(first.tolist(), second.tolist())
+            ]
+        )
+    else:
+        matches = match_win_probabilities(strengths[first, second], best_of_sets)
+
+    probabilities = np.full((players, players), 0.5)
+    probabilities[first, second] = matches
+    probabilities[second, first] = 1 - matches
+    return probabilities
+
+
+def _check_bracket(bracket: list[int] | tuple[int, ...], players: int) -> None:
+    """Validate a draw against the number of players.
+
+    Args:
+        bracket (list[int] | tuple[int, ...]): Player id per draw slot.
+        players (int): Number of players with match probabilities.
+    """
+    size = len(bracket)
+    if size < 2 or size & (size - 1):
+        raise ValueError("The bracket size must be a power of two")
+    entrants = [player for player in bracket if player != BYE]
+    if len(set(entrants)) != len(entrants):
+        raise ValueError("A player can only enter the bracket once")
+    if any(not 0 <= player < players for player in entrants):
+        raise ValueError("Bracket entries must be player ids or BYE")
+
+
+def _with_bye(match_probabilities: np.ndarray) -> np.ndarray:
+    """Append a bye as the last player, who loses every match.
+
+    Two byes meeting each other stand for one empty slot of the next round,
+    so either of them advances with probability one half.
+
+    Args:
+        match_probabilities (np.ndarray): Head-to-head match probabilities.
+
+    Returns:
+        np.ndarray: Probabilities with one more row and column for the bye.
+    """
+    players = len(match_probabilities)
+    probabilities = np.zeros((players + 1, players + 1))
+    probabilities[:players, :players] = match_probabilities
+    probabilities[:players, players] = 1.0
+    probabilities[players, players] = 0.5
+    return probabilities
+
+
+def _simulate_tournaments(task: _TournamentTask) -> np.ndarray:
+    """Play one shard of tournaments. Module level for worker processes.
+
+    All tournaments of the shard play a round together: every match is one
+    lookup in the head-to-head matrix and one uniform draw.
+
+    Args:
+        task (_TournamentTask): Draw, probabilities and seed of the shard.
+
+    Returns:
+        np.ndarray: Number of tournaments in which each player reached each
+            round, shape (players, rounds + 1).
+    """
+    rng = np.random.default_rng(task.seed_sequence)
+    players = len(task.match_probabilities)
+    probabilities = _with_bye(task.match_probabilities)
+    slots = np.array(task.bracket, dtype=np.int32)
+    slots[slots == BYE] = players
+    rounds = len(slots).bit_length() - 1
+
+    counts = np.zeros((players + 1, rounds + 1), dtype=np.int64)
+    counts[:, 0] = np.bincount(slots, minlength=players + 1) * (
+        task.number_of_tournaments
+    )
+    alive = np.broadcast_to(slots, (task.number_of_tournaments, len(slots)))
+    for round_number in range(1, rounds + 1):
+        first, second = alive[:, 0::2], alive[:, 1::2]
+        first_wins = rng.random(first.shape) < probabilities[first, second]
+        alive = np.where(first_wins, first, second)
+        counts[:, round_number] = np.bincount(alive.ravel(), minlength=players + 1)
+    return counts[:players]
+
+
+def simulate_tournament(
+    match_probabilities: np.ndarray,
+    bracket: list[int] | None = None,
+    number_of_tournaments: int = 10_000,
+    seed: int | None = None,
+    workers: int = 1,
+    shard_size: int = SHARD_SIZE,
+) -> TournamentResult:
+    """Simulate a knockout draw many times and count how far players get.
+
+    Tournaments are split into seeded shards like match runs, so a seeded
+    simulation gives the same result for any number of workers.
+
+    Args:
+        match_probabilities (np.ndarray): Head-to-head match-win
+            probabilities, e.g. from `head_to_head`.
+        bracket (list[int] | None): Player id per draw slot, in draw order,
+            with BYE for empty slots. Slots 2k and 2k + 1 meet in the first
+            round. None enters all players in id order.
+        number_of_tournaments (int): Number of tournaments to simulate.
+        seed (int | None): Root seed of the simulation.
+        workers (int): Number of worker processes to run shards on.
+        shard_size (int): Maximum number of tournaments per shard.
+
+    Returns:
+        TournamentResult: Advancement probabilities per player and round.
+    """
+    match_probabilities = np.asarray(match_probabilities, dtype=np.float64)
+    players = len(match_probabilities)
+    draw = tuple(range(players) if bracket is None else bracket)
+    _check_bracket(draw, players)
+    if number_of_tournaments < 1:
+        raise ValueError("At least one tournament must be simulated")
+
+    tasks = [
+        _TournamentTask(match_probabilities, draw, size, seed_sequence)
+        for size, seed_sequence in plan_shards(
+            number_of_tournaments, seed=seed, shard_size=shard_size
+        )
+    ]
+    rounds = len(draw).bit_length() - 1
+    counts = np.zeros((players, rounds + 1), dtype=np.int64)
+    for shard_counts in run_shards(_simulate_tournaments, tasks, workers=workers):
+        counts += shard_counts
+    return TournamentResult(number_of_tournaments, counts / number_of_tournaments)
+
+
+def exact_advancement(
+    match_probabilities: np.ndarray, bracket: list[int] | None = None
+) -> TournamentResult:
+    """Exact advancement probabilities of a knockout draw.
+
+    A player reaches the next round by winning the current one against
+    whoever comes out of the other half of its section, so each round is
+    one product of reach probabilities with the head-to-head matrix.
+
+    Args:
+        match_probabilities (np.ndarray): Head-to-head match-win
+            probabilities, e.g. from `head_to_head`.
+        bracket (list[int] | None): Draw as in `simulate_tournament`.
+
+    Returns:
+        TournamentResult: Advancement probabilities per player and round.
+    """
+    match_probabilities = np.asarray(match_probabilities, dtype=np.float64)
+    players = len(match_probabilities)
+    draw = tuple(range(players) if bracket is None else bracket)
+    _check_bracket(draw, players)
+    probabilities = _with_bye(match_probabilities)
+    slots = np.array(draw)
+    slots[slots == BYE] = players
+    rounds = len(slots).bit_length() - 1
+
+    # Probability that the player of each slot reaches the current round
+    reach = np.ones(len(slots))
+    by_slot = [reach]
+    for round_number in range(rounds):
+        section = 2**round_number
+        win = np.empty(len(slots))
+        for start in range(0, len(slots), 2 * section):
+            upper = slice(start, start + section)
+            lower = slice(start + section, start + 2 * section)
+            win[upper] = (
+                probabilities[np.ix_(slots[upper], slots[lower])] @ reach[lower]
+            )
+            win[lower] = (
+                probabilities[np.ix_(slots[lower], slots[upper])] @ reach[upper]
+            )
+        reach = reach * win
+        by_slot.append(reach)
+
+    advancement = np.zeros((players + 1, rounds + 1))
+    advancement[slots] = np.stack(by_slot, axis=1)
+    return TournamentResult(0, advancement[:players])
@@ -0,0 +1,18 @@
+# Integer player ids
+PLAYER_1 = 0
+PLAYER_2 = 1
+PLAYERS = ("player_1", "player_2")
+
+# Point states are indices into SCORE_MAP
+SCORE_MAP = (0, 15, 30, 40, "Advantage", "Game")
+ADVANTAGE = 4
+GAME = 5
+
+# Offsets of the per-player counters in the flat score state
+POINTS = 0
+GAMES = 2
+TIEBREAK_POINTS = 4
+SETS_WON = 6
+# Player serving the current game, or the first point of a tiebreak
+SERVER = 8
+TOTAL_POINTS_WON = 9
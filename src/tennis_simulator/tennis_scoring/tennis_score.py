@@ -1,34 +1,349 @@
+from collections.abc import Iterator, MutableMapping
 from typing import Any
 
+from tennis_simulator.tennis_scoring.constants import (
+    ADVANTAGE,
+    GAME,
+    GAMES,
+    PLAYER_1,
+    PLAYER_2,
+    PLAYERS,
+    POINTS,
+    SCORE_MAP,
+    SERVER,
+    SETS_WON,
+    TIEBREAK_POINTS,
+    TOTAL_POINTS_WON,
+)
+from tennis_simulator.tennis_scoring.transitions import (
+    MATCH_WON,
+    SET_WON,
+    STATE_SIZE,
+    STATISTIC_FLAGS,
+    TIEBREAK_DEUCE,
+    TransitionTable,
+    point_server,
+    point_statistics,
+    transition_table,
+)
+
+_PLAYER_IDS = {name: player for player, name in enumerate(PLAYERS)}
+# Length of the flat state list: the packed counters plus total points won
+_FLAT_STATE_SIZE = TOTAL_POINTS_WON + 2
+# Number of distinct combinations of the statistic flags
+_FLAG_COMBINATIONS = 2 ** len(STATISTIC_FLAGS)
+
+# Per-player counters exposed through the score view
+_COUNTERS = {
+    "_games": GAMES,
+    "_tiebreak_points": TIEBREAK_POINTS,
+    "_sets_won": SETS_WON,
+    "_total_points_won": TOTAL_POINTS_WON,
+}
+# Keys of the score dict, in the order of earlier versions
+_SUFFIXES = (
+    "",
+    "_games",
+    "_tiebreak_points",
+    "_sets",
+    "_sets_won",
+    "_total_points_won",
+)
+_SCORE_KEYS = tuple(f"{name}{suffix}" for suffix in _SUFFIXES for name in PLAYERS)
+_SCORE_KEY_SET = frozenset(_SCORE_KEYS)
+
+
+class _ScoreView(MutableMapping):
+    """Live dict view of a `TennisScore`, rendered only when a key is read."""
+
+    __slots__ = ("_tennis_score",)
+
+    def __init__(self, tennis_score: "TennisScore") -> None:
+        self._tennis_score = tennis_score
+
+    @staticmethod
+    def _split_key(key: str) -> tuple[int, str]:
+        """Split a score key into player id and counter suffix."""
+        if key not in _SCORE_KEY_SET:
+            raise KeyError(key)
+        return _PLAYER_IDS[key[:8]], key[8:]
+
+    def __getitem__(self, key: str) -> Any:
+        player, suffix = self._split_key(key)
+        tennis_score = self._tennis_score
+        tennis_score._unpack()
+        if suffix == "":
+            return SCORE_MAP[tennis_score._state[POINTS + player]]
+        if suffix == "_sets":
+            return [games[player] for games in tennis_score._set_games]
+        return tennis_score._state[_COUNTERS[suffix] + player]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        player, suffix = self._split_key(key)
+        tennis_score = self._tennis_score
+        tennis_score._unpack()
+        if suffix == "":
+            tennis_score._state[POINTS + player] = tennis_score._score_to_index(value)
+        elif suffix == "_sets":
+            raise TypeError("Set scores are read-only. Pass them to TennisScore().")
+        else:
+            tennis_score._state[_COUNTERS[suffix] + player] = value
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("Score keys cannot be deleted")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_SCORE_KEYS)
+
+    def __len__(self) -> int:
+        return len(_SCORE_KEYS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
 
 class TennisScore:
-    """Class to represent and manage tennis scoring."""
+    """Class to represent and manage tennis scoring.
+
+    The score is kept in one flat list of integers indexed by counter offset
+    and player id. The `score` dict of earlier versions is available as a
+    live view that is only rendered when it is read.
+
+    While a match is played through `win_point`, points, games, tiebreak
+    points and sets are packed into a single index of the transition table,
+    so every point is one table lookup. The flat list is only written back
+    when the score is read or changed by hand. Scores outside the table,
+    such as a finished set that has not been recorded yet, fall back to the
+    scoring rules.
+
+    The score also tracks the server. It alternates every game; in a
+    tiebreak the first server serves one point, then both players serve two
+    points in turn, and the receiver of the first tiebreak point serves the
+    next set.
+
+    With `track_statistics`, the score also counts deuces, advantages
+    converted, break points, breaks and tiebreaks. Every point adds one to
+    the counter of its statistic flags from the transition table, so
+    tracking costs one lookup per point; `match_statistics` decodes the
+    counters into per-match totals.
+    """
+
+    __slots__ = (
+        "_flag_counts",
+        "_index",
+        "_set_games",
+        "_state",
+        "_table",
+        "_tiebreak_offset",
+        "_winner",
+        "best_of_sets",
+    )
+
+    score_map = SCORE_MAP
 
     def __init__(
         self,
         score: dict[str, Any] | None = None,
-        player_1_score_index: int = 0,
-        player_2_score_index: int = 0,
+        player_1_score_index: int | None = None,
+        player_2_score_index: int | None = None,
+        best_of_sets: int = 3,
+        server: int = PLAYER_1,
+        track_statistics: bool = False,
     ) -> None:
-        self.score = score or {
-            "player_1": 0,
-            "player_2": 0,
-            "player_1_games": 0,
-            "player_2_games": 0,
-            "player_1_tiebreak_points": 0,
-            "player_2_tiebreak_points": 0,
-            "player_1_sets": [],
-            "player_2_sets": [],
-            "player_1_sets_won": 0,
-            "player_2_sets_won": 0,
-            "player_1_total_points_won": 0,
-            "player_2_total_points_won": 0,
-        }
-        self.score_map = [0, 15, 30, 40, "Advantage", "Game"]
-        self.player_1_score_index = player_1_score_index
-        self.player_2_score_index = player_2_score_index
-        self.best_of_sets = 3  # Default best of 3 sets
-        self.winner: str | None = None
+        self._state = [0] * _FLAT_STATE_SIZE
+        # Server of the current game, or of the first point of a tiebreak
+        self._state[SERVER] = server
+        self._set_games: list[tuple[int, int]] = []
+        self._winner = -1
+        # Packed state index, -1 while the flat state list is up to date
+        self._index = -1
+        self._table: TransitionTable | None = None
+        # Tiebreak points per player removed when a long tiebreak was packed
+        self._tiebreak_offset = 0
+        # Points per combination of statistic flags, None when not tracked
+        self._flag_counts = [0] * _FLAG_COMBINATIONS if track_statistics else None
+        self.best_of_sets = best_of_sets  # Default best of 3 sets
+        if score:
+            self._load(score)
+        # Explicit point indices take precedence over the points in `score`
+        if player_1_score_index is not None:
+            self._state[POINTS + PLAYER_1] = player_1_score_index
+        if player_2_score_index is not None:
+            self._state[POINTS + PLAYER_2] = player_2_score_index
+
+    def _load(self, score: dict[str, Any]) -> None:
+        """Load the state from a score dict with the keys of `score`.
+
+        Args:
+            score (dict[str, Any]): Score dict. Missing keys default to zero.
+        """
+        sets = (score.get("player_1_sets", []), score.get("player_2_sets", []))
+        if len(sets[0]) != len(sets[1]):
+            raise ValueError("Sets length mismatch")
+        self._set_games = list(zip(*sets))
+
+        view = self.score
+        for key, value in score.items():
+            if not key.endswith("_sets"):
+                view[key] = value
+
+    @property
+    def score(self) -> MutableMapping[str, Any]:
+        """Live dict view of the score."""
+        return _ScoreView(self)
+
+    @property
+    def player_1_score_index(self) -> int:
+        self._unpack()
+        return self._state[POINTS + PLAYER_1]
+
+    @player_1_score_index.setter
+    def player_1_score_index(self, index: int) -> None:
+        self._unpack()
+        self._state[POINTS + PLAYER_1] = index
+
+    @property
+    def player_2_score_index(self) -> int:
+        self._unpack()
+        return self._state[POINTS + PLAYER_2]
+
+    @player_2_score_index.setter
+    def player_2_score_index(self, index: int) -> None:
+        self._unpack()
+        self._state[POINTS + PLAYER_2] = index
+
+    @property
+    def server(self) -> int:
+        """Player id serving the next point."""
+        index = self._index
+        if index >= 0:
+            assert self._table is not None
+            # Packed tiebreaks are shifted by whole serving rounds of 4 points
+            return self._table.point_server[index]
+        return point_server(self._state)
+
+    @property
+    def set_scores(self) -> tuple[tuple[int, int], ...]:
+        """Games of both players per finished set."""
+        return tuple(self._set_games)
+
+    @property
+    def total_points_won(self) -> tuple[int, int]:
+        """Points won per player."""
+        state = self._state
+        return state[TOTAL_POINTS_WON], state[TOTAL_POINTS_WON + 1]
+
+    @property
+    def match_statistics(self) -> dict[str, int] | None:
+        """Per-match counters, or None if statistics are not tracked.
+
+        Returns:
+            dict[str, int] | None: Points and games played and the count of
+                every entry of STATISTIC_FLAGS.
+        """
+        if self._flag_counts is None:
+            return None
+        state = self._state
+        points = state[TOTAL_POINTS_WON] + state[TOTAL_POINTS_WON + 1]
+        self._unpack()
+        games = sum(map(sum, self._set_games)) + state[GAMES] + state[GAMES + 1]
+        statistics = {"points": points, "games": games}
+        for name, flag in STATISTIC_FLAGS:
+            statistics[name] = sum(
+                count for flags, count in enumerate(self._flag_counts) if flags & flag
+            )
+        return statistics
+
+    @property
+    def winner_id(self) -> int | None:
+        """Integer id of the match winner, None while the match is running."""
+        return None if self._winner < 0 else self._winner
+
+    @property
+    def winner(self) -> str | None:
+        """Identifier of the match winner ("player_1" or "player_2")."""
+        return None if self._winner < 0 else PLAYERS[self._winner]
+
+    @winner.setter
+    def winner(self, winner: str | None) -> None:
+        self._winner = -1 if winner is None else PLAYERS.index(winner)
+
+    def copy(self) -> "TennisScore":
+        """Create an independent snapshot of the current score.
+
+        Returns:
+            TennisScore: Copy of this score.
+        """
+        snapshot = TennisScore.__new__(TennisScore)
+        snapshot._state = self._state.copy()
+        snapshot._set_games = self._set_games.copy()
+        snapshot._winner = self._winner
+        snapshot._index = self._index
+        snapshot._table = self._table
+        snapshot._tiebreak_offset = self._tiebreak_offset
+        snapshot._flag_counts = (
+            self._flag_counts.copy() if self._flag_counts is not None else None
+        )
+        snapshot.best_of_sets = self.best_of_sets
+        return snapshot
+
+    def state_index(self) -> int:
+        """Transition table index of the current score.
+
+        Long tiebreaks map to the equivalent state at 6-6 or 7-7, which has
+        the same serving order and outlook.
+
+        Returns:
+            int: State index of `transition_table(best_of_sets)`, its
+                finished state once the match is won, or -1 if the score is
+                not reachable from the start of a match.
+        """
+        if self._winner >= 0:
+            return transition_table(self.best_of_sets).finished
+        table = self._table
+        if (
+            self._index >= 0
+            and table is not None
+            and table.best_of_sets == self.best_of_sets
+        ):
+            return self._index
+        self._unpack()
+        return self._pack()
+
+    def _pack(self) -> int:
+        """Pack the flat state into a transition table index.
+
+        Returns:
+            int: State index, or -1 if the state is not in the table.
+        """
+        if self._table is None or self._table.best_of_sets != self.best_of_sets:
+            self._table = transition_table(self.best_of_sets)
+
+        state = self._state[:STATE_SIZE]
+        # Long tiebreaks are stored relative to 6-6 or 7-7, shifted by two
+        # points per player so the serving order is kept
+        lower = min(state[TIEBREAK_POINTS], state[TIEBREAK_POINTS + 1])
+        offset = 2 * max((lower - 6) // 2, 0)
+        state[TIEBREAK_POINTS] -= offset
+        state[TIEBREAK_POINTS + 1] -= offset
+
+        index = self._table.index.get(tuple(state), -1)
+        if index >= 0:
+            self._index = index
+            self._tiebreak_offset = offset
+        return index
+
+    def _unpack(self) -> None:
+        """Write the packed state back into the flat state list."""
+        if self._index < 0:
+            return
+        assert self._table is not None
+        state = self._state
+        state[:STATE_SIZE] = self._table.states[self._index]
+        state[TIEBREAK_POINTS] += self._tiebreak_offset
+        state[TIEBREAK_POINTS + 1] += self._tiebreak_offset
+        self._index = -1
+        self._tiebreak_offset = 0
 
     def _nr_of_sets_to_win(self) -> int:
         """Calculate the number of sets required to win the match.
@@ -38,11 +353,11 @@ class TennisScore:
         """
         return (self.best_of_sets // 2) + 1
 
-    def _score_to_index(self, score: int) -> int:
+    def _score_to_index(self, score: int | str) -> int:
         """Convert score to index in score map.
 
         Args:
-            score (int): Current score of the player.
+            score (int | str): Current score of the player.
 
         Returns:
             int: Index in the score map.
@@ -57,137 +372,262 @@ class TennisScore:
         Args:
             player (str): Identifier for the player ("player_1" or "player_2").
         """
-        # Handle advantage and deuce scenarios
-        if self._is_tiebreak():
-            if player == "player_1":
-                self.score["player_1_tiebreak_points"] += 1
+        if player not in _PLAYER_IDS:
+            raise ValueError("Invalid player identifier")
+        self.win_point(_PLAYER_IDS[player])
+
+    def win_point(self, player: int) -> None:
+        """Update the score after a point won by the given player.
+
+        Args:
+            player (int): Player id (PLAYER_1 or PLAYER_2).
+        """
+        index = self._index
+        if index < 0:
+            index = self._pack()
+            if index < 0:
+                self._win_point_by_rules(player)
+                return
+
+        table = self._table
+        assert table is not None
+        transition = 2 * index + player
+        self._index = table.next_state[transition]
+        self._state[TOTAL_POINTS_WON + player] += 1
+        if self._flag_counts is not None:
+            self._flag_counts[table.statistics[transition]] += 1
+        events = table.events[transition]
+        if events & (SET_WON | TIEBREAK_DEUCE):
+            self._apply_events(index, transition, events, player)
+
+    def play_points(
+        self, outcomes: bytes, start: int = 0, serve_aware: bool = False
+    ) -> int:
+        """Play points from a block of outcomes until the match or block ends.
+
+        Each byte holds the point winner in bit 0 if player 1 serves and in
+        bit 1 if player 2 serves. Every point is two lookups in the
+        `point_codes` of the transition table. Without serve-dependent win
+        rates both bits are equal, and the points won are counted on the
+        block instead of per point.
+
+        Args:
+            outcomes (bytes): Point outcomes, one byte per point.
+            start (int): Offset of the first point to play.
+            serve_aware (bool): The bits of a byte can differ.
+
+        Returns:
+            int: Offset of the first point that was not played.
+        """
+        end = len(outcomes)
+        index = self._index
+        if index < 0:
+            index = self._pack()
+        if index < 0:
+            # Scores outside the table are played point by point
+            position = start
+            while self._winner < 0 and position < end:
+                self.win_point((outcomes[position] >> self.server) & 1)
+                position += 1
+            return position
+
+        assert self._table is not None
+        codes = self._table.point_codes
+        next_base, winners, flags = codes["next_base"], codes["winner"], codes["events"]
+        base = 4 * index
+        player_2_points = 0
+        position = start
+        points = memoryview(outcomes)[start:]
+        flag_counts = self._flag_counts
+        if flag_counts is not None:
+            statistics = codes["statistics"]
+            for position, code in enumerate(points, start):
+                transition = base + code
+                base = next_base[transition]
+                player_2_points += winners[transition]
+                flag_counts[statistics[transition]] += 1
+                if flags[transition] and self._apply_code_events(transition):
+                    break
             else:
-                self.score["player_2_tiebreak_points"] += 1
+                position = end - 1
+        elif serve_aware:
+            for position, code in enumerate(points, start):
+                transition = base + code
+                base = next_base[transition]
+                player_2_points += winners[transition]
+                if flags[transition] and self._apply_code_events(transition):
+                    break
+            else:
+                position = end - 1
         else:
-            if self.score_map[self.player_1_score_index] == "Advantage":
-                if player == "player_1":
-                    self.player_1_score_index += 1
-                elif player == "player_2":
-                    self.player_1_score_index -= 1
-            elif self.score_map[self.player_2_score_index] == "Advantage":
-                if player == "player_1":
-                    self.player_2_score_index -= 1
-                elif player == "player_2":
-                    self.player_2_score_index += 1
+            for position, code in enumerate(points, start):
+                transition = base + code
+                base = next_base[transition]
+                if flags[transition] and self._apply_code_events(transition):
+                    break
             else:
-                if player == "player_1":
-                    self.player_1_score_index += 1
-                elif player == "player_2":
-                    self.player_2_score_index += 1
-                else:
-                    raise ValueError("Invalid player identifier")
-
-            self.score["player_1"] = self.score_map[self.player_1_score_index]
-            self.score["player_2"] = self.score_map[self.player_2_score_index]
-
-            # Update game and set after score change
-            self._update_game()
-        self._update_set()
-
-    def _update_game(self) -> None:
-        """Check if it is a game."""
-        # player 1 wins a game
-        if (self.player_1_score_index == (len(self.score_map) - 1)) | (
-            self.player_1_score_index == 4 and self.player_2_score_index <= 2
-        ):
-            self.score["player_1_games"] += 1
-            self._reset_points_to_zero()
+                position = end - 1
+            played = outcomes[start : position + 1]
+            player_2_points = len(played) - played.count(0)
+        position += 1
+
+        if self._winner < 0:
+            self._index = base // 4
+        self._state[TOTAL_POINTS_WON] += position - start - player_2_points
+        self._state[TOTAL_POINTS_WON + 1] += player_2_points
+        return position
+
+    def _apply_code_events(self, transition: int) -> bool:
+        """Apply the events of a point played with `play_points`.
+
+        Args:
+            transition (int): Index `4 * state + code` of the point.
+
+        Returns:
+            bool: Whether the point won the match.
+        """
+        table = self._table
+        assert table is not None
+        index = transition // 4
+        player = table.point_codes["winner"][transition]
+        transition = 2 * index + player
+        self._apply_events(index, transition, table.events[transition], player)
+        return self._winner >= 0
+
+    def _apply_events(
+        self, index: int, transition: int, events: int, player: int
+    ) -> None:
+        """Apply the tiebreak, set and match events of a table transition.
+
+        Args:
+            index (int): State index before the point.
+            transition (int): Transition index of the point.
+            events (int): Event flags of the transition.
+            player (int): Player id of the point winner.
+        """
+        if events & TIEBREAK_DEUCE:
+            self._tiebreak_offset += 2
             return
-        # Player 2 wins a game
-        elif (self.player_2_score_index == (len(self.score_map) - 1)) | (
-            self.player_2_score_index == 4 and self.player_1_score_index <= 2
-        ):
-            self.score["player_2_games"] += 1
-            self._reset_points_to_zero()
+
+        table = self._table
+        assert table is not None
+        games = table.set_games[transition]
+        assert games is not None
+        self._set_games.append(games)
+        self._tiebreak_offset = 0
+        if events & MATCH_WON:
+            # A finished match is not in the table, so unpack it by hand
+            state = self._state
+            state[:STATE_SIZE] = table.states[index]
+            state[POINTS:SETS_WON] = [0] * (SETS_WON - POINTS)
+            state[SETS_WON + player] += 1
+            state[SERVER] = 1 - state[SERVER]
+            self._index = -1
+            self._winner = player
+
+    def _win_point_by_rules(self, player: int) -> None:
+        """Update the flat state after a point by applying the scoring rules.
+
+        Args:
+            player (int): Player id (PLAYER_1 or PLAYER_2).
+        """
+        state = self._state
+        state[TOTAL_POINTS_WON + player] += 1
+        if self._flag_counts is not None:
+            self._flag_counts[point_statistics(state, player)] += 1
+        if state[GAMES] == 6 and state[GAMES + 1] == 6:
+            state[TIEBREAK_POINTS + player] += 1
+            self._update_set()
+            return
+
+        # Handle advantage and deuce scenarios
+        opponent = POINTS + 1 - player
+        if state[opponent] == ADVANTAGE:
+            state[opponent] -= 1
             return
+        state[POINTS + player] += 1
+
+        # Update game and set after score change
+        if state[POINTS + player] >= ADVANTAGE and self._update_game():
+            self._update_set()
+
+    def _update_game(self) -> bool:
+        """Check if it is a game.
+
+        Returns:
+            bool: Whether a player won the game.
+        """
+        self._unpack()
+        state = self._state
+        for player in (PLAYER_1, PLAYER_2):
+            points = state[POINTS + player]
+            if points == GAME or (
+                points == ADVANTAGE and state[POINTS + 1 - player] <= 2
+            ):
+                state[GAMES + player] += 1
+                state[SERVER] = 1 - state[SERVER]
+                self._reset_points_to_zero()
+                return True
+        return False
 
     def _reset_points_to_zero(self) -> None:
         """Reset points to zero after a game."""
-        self.player_1_score_index = 0
-        self.player_2_score_index = 0
-        self.score["player_1"] = self.score_map[self.player_1_score_index]
-        self.score["player_2"] = self.score_map[self.player_2_score_index]
+        self._state[POINTS] = self._state[POINTS + 1] = 0
 
     def _is_tiebreak(self) -> bool:
         """Check if it is a tiebreak."""
-        if (self.score["player_1_games"] == 6) & (self.score["player_2_games"] == 6):
-            return True
-        return False
+        self._unpack()
+        return self._state[GAMES] == 6 and self._state[GAMES + 1] == 6
 
     def _reset_games_and_tiebreak_points(self) -> None:
         """Reset games and tiebreak points after a set."""
-        self.score["player_1_games"] = 0
-        self.score["player_2_games"] = 0
-        self.score["player_1_tiebreak_points"] = 0
-        self.score["player_2_tiebreak_points"] = 0
+        state = self._state
+        state[GAMES] = state[GAMES + 1] = 0
+        state[TIEBREAK_POINTS] = state[TIEBREAK_POINTS + 1] = 0
 
     def _update_set(self) -> None:
         """Check if it is a set."""
+        self._unpack()
+        state = self._state
         # Check for tiebreak set win
         if self._is_tiebreak():
-            if (
-                abs(
-                    self.score["player_1_tiebreak_points"]
-                    - self.score["player_2_tiebreak_points"]
-                )
-                >= 2
-            ):
-                if self.score["player_1_tiebreak_points"] >= 7:
-                    self.score["player_1_sets"].append(self.score["player_1_games"] + 1)
-                    self.score["player_2_sets"].append(self.score["player_2_games"])
-                    self.score["player_1_sets_won"] += 1
-                    self._reset_games_and_tiebreak_points()
-                    self._won_match()
-                    return
-                elif self.score["player_2_tiebreak_points"] >= 7:
-                    self.score["player_1_sets"].append(self.score["player_1_games"])
-                    self.score["player_2_sets"].append(self.score["player_2_games"] + 1)
-                    self.score["player_2_sets_won"] += 1
-                    self._reset_games_and_tiebreak_points()
-                    self._won_match()
-                    return
-                return
+            offset, target, tiebreak = TIEBREAK_POINTS, 7, True
+        else:
+            offset, target, tiebreak = GAMES, 6, False
 
-            return
-        # Regular set win
-        elif abs(self.score["player_1_games"] - self.score["player_2_games"]) >= 2:
-            if self.score["player_1_games"] >= 6:
-                self.score["player_1_sets"].append(self.score["player_1_games"])
-                self.score["player_2_sets"].append(self.score["player_2_games"])
-                self.score["player_1_sets_won"] += 1
-                self._reset_games_and_tiebreak_points()
-                self._won_match()
-                return
-            elif self.score["player_2_games"] >= 6:
-                self.score["player_1_sets"].append(self.score["player_1_games"])
-                self.score["player_2_sets"].append(self.score["player_2_games"])
-                self.score["player_2_sets_won"] += 1
-                self._reset_games_and_tiebreak_points()
-                self._won_match()
-                return
-            return
-        return
+        # Regular set win or tiebreak win, both by a margin of two. Only the
+        # leader can win, also in long tiebreaks such as 7-9.
+        if abs(state[offset] - state[offset + 1]) >= 2:
+            leader = PLAYER_1 if state[offset] > state[offset + 1] else PLAYER_2
+            if state[offset + leader] >= target:
+                self._win_set(leader, tiebreak=tiebreak)
+
+    def _win_set(self, player: int, tiebreak: bool) -> None:
+        """Record a set won by the given player.
+
+        Args:
+            player (int): Player id of the set winner.
+            tiebreak (bool): Whether the set was decided by a tiebreak.
+        """
+        state = self._state
+        games = [state[GAMES], state[GAMES + 1]]
+        if tiebreak:
+            games[player] += 1
+            # The receiver of the first tiebreak point serves the next set
+            state[SERVER] = 1 - state[SERVER]
+        self._set_games.append((games[0], games[1]))
+        state[SETS_WON + player] += 1
+        self._reset_games_and_tiebreak_points()
+        self._won_match()
 
     def _won_match(self) -> None:
         """Check if a player won the match."""
-        if self.score["player_1_sets_won"] >= self._nr_of_sets_to_win():
-            self.winner = "player_1"
-        elif self.score["player_2_sets_won"] >= self._nr_of_sets_to_win():
-            self.winner = "player_2"
+        sets_to_win = self._nr_of_sets_to_win()
+        if self._state[SETS_WON + PLAYER_1] >= sets_to_win:
+            self._winner = PLAYER_1
+        elif self._state[SETS_WON + PLAYER_2] >= sets_to_win:
+            self._winner = PLAYER_2
 
     def match_result(self) -> str:
         """Convert the current score to a human-readable format."""
-        if len(self.score["player_1_sets"]) != len(self.score["player_2_sets"]):
-            raise ValueError("Sets length mismatch")
-
-        result = ""
-        for i in range(len(self.score["player_1_sets"])):
-            result += (
-                f"{self.score['player_1_sets'][i]}-{self.score['player_2_sets'][i]},"
-            )
-        return result
+        return "".join(f"{games_1}-{games_2}," for games_1, games_2 in self._set_games)
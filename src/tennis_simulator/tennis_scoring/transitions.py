@@ -0,0 +1,298 @@
+from dataclasses import dataclass
+from functools import cache, cached_property
+
+import numpy as np
+
+from tennis_simulator.tennis_scoring.constants import (
+    ADVANTAGE,
+    GAME,
+    GAMES,
+    POINTS,
+    SERVER,
+    SETS_WON,
+    TIEBREAK_POINTS,
+)
+
+# Events raised by a transition, as bit flags
+GAME_WON = 1
+SET_WON = 2
+MATCH_WON = 4
+# A tiebreak at 8-8 is stored as 6-6; the offset is tracked by the caller.
+# Folding four points keeps the serving order of the tiebreak intact.
+TIEBREAK_DEUCE = 8
+
+# Statistic flags of a point, counted per match when statistics are tracked
+DEUCE = 1
+ADVANTAGE_CONVERTED = 2
+BREAK_POINT = 4
+BREAK = 8
+TIEBREAK_PLAYED = 16
+# Name and flag of every per-match counter
+STATISTIC_FLAGS = (
+    ("deuces", DEUCE),
+    ("advantages_converted", ADVANTAGE_CONVERTED),
+    ("break_points", BREAK_POINT),
+    ("breaks", BREAK),
+    ("tiebreaks", TIEBREAK_PLAYED),
+)
+
+# Length of a state tuple: points, games, tiebreak points and sets per player
+# and the server of the current game
+STATE_SIZE = SERVER + 1
+
+
+def point_server(state: tuple[int, ...] | list[int]) -> int:
+    """Player serving the next point of a state.
+
+    The server alternates every game. In a tiebreak the server of the first
+    point serves once, then both players serve two points in turn.
+
+    Args:
+        state (tuple[int, ...] | list[int]): State tuple or flat state.
+
+    Returns:
+        int: Player id of the server.
+    """
+    server = state[SERVER]
+    if state[GAMES] == 6 and state[GAMES + 1] == 6:
+        points = state[TIEBREAK_POINTS] + state[TIEBREAK_POINTS + 1]
+        return server ^ ((points + 1) // 2 % 2)
+    return server
+
+
+@dataclass(frozen=True)
+class TransitionTable:
+    """Precomputed transitions of the match state after every point.
+
+    A state is a tuple of point indices, games, tiebreak points and sets won
+    per player and the server of the current game, laid out like the first
+    counters of `TennisScore`. The entry of state `s` and point winner `p` is
+    stored at position `2 * s + p`. State 0 starts a match served by player
+    1; `initial` holds the start state for either first server.
+
+    Attributes:
+        best_of_sets (int): Maximum number of sets in a match.
+        states (tuple[tuple[int, ...], ...]): State tuple per state index.
+        index (dict[tuple[int, ...], int]): State index per state tuple.
+        finished (int): Absorbing state index of a finished match.
+        next_state (tuple[int, ...]): Next state index per transition.
+        events (tuple[int, ...]): Event flags per transition.
+        set_games (tuple[tuple[int, int] | None, ...]): Games of the finished
+            set for transitions that raise SET_WON.
+        point_server (tuple[int, ...]): Server of the next point per state.
+        initial (tuple[int, int]): Start state per first server.
+        statistics (tuple[int, ...]): Statistic flags per transition.
+    """
+
+    best_of_sets: int
+    states: tuple[tuple[int, ...], ...]
+    index: dict[tuple[int, ...], int]
+    finished: int
+    next_state: tuple[int, ...]
+    events: tuple[int, ...]
+    set_games: tuple[tuple[int, int] | None, ...]
+    point_server: tuple[int, ...]
+    initial: tuple[int, int]
+    statistics: tuple[int, ...]
+
+    @cached_property
+    def point_codes(self) -> dict[str, tuple[int, ...]]:
+        """Transitions indexed by `4 * state + code` for point outcome codes.
+
+        A code holds the point winner in bit 0 if player 1 serves and in
+        bit 1 if player 2 serves. Looking up the code directly picks the
+        winner for the server of the state, so a point needs no server
+        lookup.
+
+        Returns:
+            dict[str, tuple[int, ...]]: "next_base" with 4 times the next
+                state, "winner" with the point winner, "events" with the
+                SET_WON and TIEBREAK_DEUCE flags and "statistics" with the
+                statistic flags per state and code.
+        """
+        next_base, winners, events, statistics = [], [], [], []
+        for state, server in enumerate(self.point_server):
+            for code in range(4):
+                winner = (code >> server) & 1
+                transition = 2 * state + winner
+                next_base.append(4 * self.next_state[transition])
+                winners.append(winner)
+                events.append(self.events[transition] & (SET_WON | TIEBREAK_DEUCE))
+                statistics.append(self.statistics[transition])
+        return {
+            "next_base": tuple(next_base),
+            "winner": tuple(winners),
+            "events": tuple(events),
+            "statistics": tuple(statistics),
+        }
+
+    @cached_property
+    def arrays(self) -> dict[str, np.ndarray]:
+        """NumPy versions of the table for the batch engine, built once.
+
+        Returns:
+            dict[str, np.ndarray]: "next_state", "events" and "statistics"
+                per transition, "set_games" per transition (zero when no
+                set is won), and
+                "states" and "point_server" per state index, including the
+                finished state.
+        """
+        set_games = [games or (0, 0) for games in self.set_games]
+        states = [*self.states, (0,) * STATE_SIZE]
+        return {
+            "next_state": np.array(self.next_state, dtype=np.int16),
+            "events": np.array(self.events, dtype=np.int8),
+            "statistics": np.array(self.statistics, dtype=np.int8),
+            "set_games": np.array(set_games, dtype=np.int8),
+            "states": np.array(states, dtype=np.int8),
+            "point_server": np.array([*self.point_server, 0], dtype=np.int8),
+        }
+
+
+def advance(
+    state: tuple[int, ...], player: int, sets_to_win: int
+) -> tuple[tuple[int, ...] | None, int, tuple[int, int] | None]:
+    """Apply the scoring rules to one point.
+
+    Args:
+        state (tuple[int, ...]): Current state tuple.
+        player (int): Player id of the point winner.
+        sets_to_win (int): Number of sets needed to win the match.
+
+    Returns:
+        tuple[tuple[int, ...] | None, int, tuple[int, int] | None]: Next state
+            (None once the match is won), event flags and the games of the
+            finished set if a set was won.
+    """
+    score = list(state)
+    opponent = 1 - player
+    events = 0
+    set_won = False
+    tiebreak = score[GAMES] == 6 and score[GAMES + 1] == 6
+
+    if tiebreak:
+        score[TIEBREAK_POINTS + player] += 1
+        points, other = (
+            score[TIEBREAK_POINTS + player],
+            score[TIEBREAK_POINTS + opponent],
+        )
+        if points >= 7 and points - other >= 2:
+            events |= GAME_WON
+            set_won = True
+            # The receiver of the first tiebreak point serves the next set
+            score[SERVER] = 1 - score[SERVER]
+        elif points == other == 8:
+            score[TIEBREAK_POINTS] = score[TIEBREAK_POINTS + 1] = 6
+            events |= TIEBREAK_DEUCE
+    else:
+        # Losing an advantage goes back to deuce
+        if score[POINTS + opponent] == ADVANTAGE:
+            score[POINTS + opponent] -= 1
+        else:
+            score[POINTS + player] += 1
+
+        points, other = score[POINTS + player], score[POINTS + opponent]
+        if points == GAME or (points == ADVANTAGE and other <= 2):
+            events |= GAME_WON
+            score[POINTS] = score[POINTS + 1] = 0
+            score[GAMES + player] += 1
+            score[SERVER] = 1 - score[SERVER]
+            games, other = score[GAMES + player], score[GAMES + opponent]
+            set_won = games >= 6 and games - other >= 2
+
+    if not set_won:
+        return tuple(score), events, None
+
+    set_games = [score[GAMES], score[GAMES + 1]]
+    if tiebreak:
+        set_games[player] += 1
+    events |= SET_WON
+    score[POINTS:SETS_WON] = [0] * (SETS_WON - POINTS)
+    score[SETS_WON + player] += 1
+    if score[SETS_WON + player] >= sets_to_win:
+        return None, events | MATCH_WON, (set_games[0], set_games[1])
+    return tuple(score), events, (set_games[0], set_games[1])
+
+
+def point_statistics(state: tuple[int, ...] | list[int], player: int) -> int:
+    """Statistic flags of one point.
+
+    Args:
+        state (tuple[int, ...] | list[int]): State before the point.
+        player (int): Player id of the point winner.
+
+    Returns:
+        int: DEUCE if the point levels a game at 40-40, BREAK_POINT if the
+            receiver was one point from the game, ADVANTAGE_CONVERTED and
+            BREAK if the game is won from advantage or by the receiver, and
+            TIEBREAK_PLAYED if the point levels the set at 6-6.
+    """
+    games = state[GAMES], state[GAMES + 1]
+    if games == (6, 6):
+        return 0
+    server = state[SERVER]
+    receiver = 1 - server
+    points, other = state[POINTS + player], state[POINTS + 1 - player]
+    flags = 0
+    if state[POINTS + receiver] == ADVANTAGE or (
+        state[POINTS + receiver] == 3 and state[POINTS + server] <= 2
+    ):
+        flags |= BREAK_POINT
+    if other == ADVANTAGE or (points == 2 and other == 3):
+        flags |= DEUCE
+    elif points == ADVANTAGE or (points == 3 and other <= 2):
+        if points == ADVANTAGE:
+            flags |= ADVANTAGE_CONVERTED
+        if player == receiver:
+            flags |= BREAK
+        if games[player] + 1 == 6 and games[1 - player] == 6:
+            flags |= TIEBREAK_PLAYED
+    return flags
+
+
+@cache
+def transition_table(best_of_sets: int = 3) -> TransitionTable:
+    """Generate the transition table by walking all reachable states.
+
+    Args:
+        best_of_sets (int): Maximum number of sets in a match.
+
+    Returns:
+        TransitionTable: Transitions of every reachable state.
+    """
+    sets_to_win = (best_of_sets // 2) + 1
+    initial = tuple((0,) * SERVER + (server,) for server in (0, 1))
+    states = list(initial)
+    index = {state: number for number, state in enumerate(states)}
+    outcomes = []
+
+    # Breadth first search; new states are appended while iterating
+    for state in states:
+        for player in (0, 1):
+            next_state, events, set_games = advance(state, player, sets_to_win)
+            if next_state is not None and next_state not in index:
+                index[next_state] = len(states)
+                states.append(next_state)
+            outcomes.append((next_state, events, set_games))
+
+    finished = len(states)
+    next_states = [
+        finished if next_state is None else index[next_state]
+        for next_state, _, _ in outcomes
+    ]
+    return TransitionTable(
+        best_of_sets=best_of_sets,
+        states=tuple(states),
+        index=index,
+        finished=finished,
+        next_state=(*next_states, finished, finished),
+        events=(*(events for _, events, _ in outcomes), 0, 0),
+        set_games=(*(set_games for _, _, set_games in outcomes), None, None),
+        point_server=tuple(point_server(state) for state in states),
+        initial=(index[initial[0]], index[initial[1]]),
+        statistics=(
+            *(point_statistics(state, player) for state in states for player in (0, 1)),
+            0,
+            0,
+        ),
+    )
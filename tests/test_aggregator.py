@@ -0,0 +1,121 @@
+"""Tests for streaming statistics aggregation."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tennis_simulator.simulation.aggregator import StatisticsAggregator
+from tennis_simulator.simulation.batch import simulate_batch
+from tennis_simulator.simulation.simulator import simulator
+
+
+def test_batch_and_match_aggregation_agree():
+    """Test that adding a batch equals adding its matches one by one."""
+    result = simulate_batch(300, winrate_player_1=0.5, rng=np.random.default_rng(4))
+    per_batch, per_match = StatisticsAggregator(), StatisticsAggregator()
+    per_batch.add_batch(result)
+    for match in range(len(result)):
+        sets = int(result.sets_played[match])
+        per_match.add_match(
+            int(result.winners[match]),
+            tuple(map(tuple, result.set_games[match, :sets].tolist())),
+            tuple(result.points_won[match].tolist()),
+        )
+    assert per_batch.to_statistics() == per_match.to_statistics()
+
+
+def test_score_line_histogram():
+    """Test counters for two fixed matches."""
+    aggregator = StatisticsAggregator()
+    aggregator.add_match(0, ((6, 0), (6, 0)), (48, 0))
+    aggregator.add_match(0, ((6, 0), (6, 0)), (48, 0))
+    aggregator.add_match(1, ((6, 7), (6, 4), (4, 6)), (90, 95))
+
+    statistics = aggregator.to_statistics()
+    assert statistics["score_lines"] == {"6-0,6-0,": 2, "6-7,6-4,4-6,": 1}
+    assert statistics["sets_played"] == {2: 2, 3: 1}
+    assert statistics["player_1_total_points_won"] == 186
+    assert statistics["results"] == []
+
+
+def test_reservoir_merge_does_not_depend_on_order():
+    """Test that merged reservoirs keep the same sample in any order."""
+    aggregators = []
+    for seed in range(3):
+        aggregator = StatisticsAggregator("reservoir", reservoir_size=20, seed=seed)
+        aggregator.add_batch(simulate_batch(100, 0.5, rng=np.random.default_rng(seed)))
+        aggregators.append(aggregator)
+
+    forward = StatisticsAggregator("reservoir", reservoir_size=20)
+    for aggregator in aggregators:
+        forward.merge(aggregator)
+    backward = StatisticsAggregator("reservoir", reservoir_size=20)
+    for aggregator in reversed(aggregators):
+        backward.merge(aggregator)
+
+    assert len(forward.results()) == 20
+    assert forward.results() == backward.results()
+
+
+@pytest.mark.parametrize("engine", ["scalar", "batch"])
+def test_spilled_results(tmp_path: Path, engine: str):
+    """Test that spilled results hold one line per match."""
+    simulation = simulator(winrate_player_1=0.55, seed=1)
+    simulation.run_simulation(
+        120, engine=engine, shard_size=50, keep_results="spill", results_dir=tmp_path
+    )
+
+    paths = simulation.statistics["results_paths"]
+    lines = [line for path in paths for line in Path(path).read_text().splitlines()]
+    assert len(paths) == 3
+    assert len(lines) == 120
+    assert sum(simulation.statistics["score_lines"].values()) == 120
+    assert set(lines) == set(simulation.statistics["score_lines"])
+
+
+def test_spilled_results_of_earlier_runs_are_not_reused(tmp_path: Path):
+    """Test that a smaller rerun into the same directory only lists its own files."""
+    simulation = simulator(winrate_player_1=0.55, seed=1)
+    simulation.run_simulation(
+        200, shard_size=50, keep_results="spill", results_dir=tmp_path
+    )
+    first = simulation.statistics["results_paths"]
+    simulation.run_simulation(
+        60, shard_size=50, keep_results="spill", results_dir=tmp_path
+    )
+
+    paths = simulation.statistics["results_paths"]
+    lines = [line for path in paths for line in Path(path).read_text().splitlines()]
+    assert len(paths) == 2
+    assert len(lines) == 60
+    assert not set(paths) & set(first)
+    assert all(Path(path).exists() for path in first)
+
+
+def test_match_statistics_agree_between_engines():
+    """Test that both engines count deuces, breaks and lengths alike."""
+    means = {}
+    for engine in ("scalar", "batch"):
+        simulation = simulator(winrate_player_1=0.55, seed=3, track_statistics=True)
+        simulation.run_simulation(4000, engine=engine, workers=2, shard_size=1000)
+        match_statistics = simulation.statistics["match_statistics"]
+        assert sum(match_statistics["deuces"]["histogram"].values()) == 4000
+        means[engine] = {
+            name: statistic["mean"] for name, statistic in match_statistics.items()
+        }
+
+    assert means["scalar"].keys() == means["batch"].keys()
+    for name, mean in means["scalar"].items():
+        # Loose relative bound; the counters are sums over many points
+        assert abs(mean - means["batch"][name]) <= 0.05 * max(mean, 1), name
+
+
+def test_match_statistics_only_when_tracked():
+    """Test that untracked runs add no per-match statistics."""
+    simulation = simulator(winrate_player_1=0.55, seed=3)
+    simulation.run_simulation(100, engine="batch")
+    assert "match_statistics" not in simulation.statistics
+
+    with pytest.raises(ValueError, match="track statistics"):
+        simulator(track_statistics=True).run_simulation(10, engine="hierarchical")
@@ -0,0 +1,68 @@
+"""Tests for the vectorized batch simulation engine."""
+
+import numpy as np
+import pytest
+
+from tennis_simulator.simulation.batch import simulate_batch
+from tennis_simulator.simulation.simulator import simulator
+from tennis_simulator.tennis_scoring.tennis_score import PLAYER_1
+
+VALID_SETS = {f"{g}-{o}" for g in (6, 7) for o in range(g - 1)} | {"7-6"}
+VALID_SETS |= {"-".join(reversed(s.split("-"))) for s in VALID_SETS}
+
+
+@pytest.mark.parametrize(
+    "winrate_player_1, best_of_sets, expected_result, expected_points",
+    [
+        pytest.param(1.0, 3, "6-0,6-0,", (48, 0), id="Player 1 Best Of 3"),
+        pytest.param(0.0, 3, "0-6,0-6,", (0, 48), id="Player 2 Best Of 3"),
+        pytest.param(1.0, 5, "6-0,6-0,6-0,", (72, 0), id="Player 1 Best Of 5"),
+    ],
+)
+def test_simulate_batch_deterministic(
+    winrate_player_1: float,
+    best_of_sets: int,
+    expected_result: str,
+    expected_points: tuple[int, int],
+):
+    """Test batch results when one player wins every point."""
+    result = simulate_batch(
+        10, winrate_player_1=winrate_player_1, best_of_sets=best_of_sets
+    )
+    assert result.match_results() == [expected_result] * 10
+    assert result.points_won.tolist() == [list(expected_points)] * 10
+
+
+def test_simulate_batch_valid_score_lines():
+    """Test that every simulated set ends with a valid score."""
+    result = simulate_batch(2000, winrate_player_1=0.5, rng=np.random.default_rng(1))
+    for match_result in result.match_results():
+        sets = match_result.rstrip(",").split(",")
+        assert 2 <= len(sets) <= 3
+        assert set(sets) <= VALID_SETS
+
+
+def test_batch_engine_matches_scalar_engine():
+    """Test that batch and scalar engines agree within sampling error."""
+    number_of_simulations = 3000
+    rates = {}
+    for engine in ("scalar", "batch"):
+        simulation = simulator(winrate_player_1=0.52)
+        simulation.run_simulation(number_of_simulations, engine=engine)
+        assert sum(simulation.statistics["score_lines"].values()) == (
+            number_of_simulations
+        )
+        rates[engine] = simulation.statistics["player_1_wins"] / number_of_simulations
+
+    # Five standard errors of the difference of two proportions
+    standard_error = np.sqrt(2 * 0.25 / number_of_simulations)
+    assert abs(rates["scalar"] - rates["batch"]) < 5 * standard_error
+
+
+def test_batch_winner_has_most_sets():
+    """Test that the recorded winner won the majority of sets."""
+    result = simulate_batch(500, winrate_player_1=0.5, rng=np.random.default_rng(2))
+    sets_won_player_1 = (result.set_games[:, :, 0] > result.set_games[:, :, 1]).sum(
+        axis=1
+    )
+    assert np.all((sets_won_player_1 == 2) == (result.winners == PLAYER_1))
@@ -0,0 +1,75 @@
+"""Tests for the on-disk result cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from tennis_simulator.simulation.aggregator import StatisticsAggregator
+from tennis_simulator.simulation.cache import ResultCache
+from tennis_simulator.simulation.simulator import simulator
+
+
+def _run(number_of_simulations: int, cache: ResultCache | None = None) -> dict:
+    """Statistics of a small seeded batch run."""
+    simulation = simulator(0.55, seed=7)
+    simulation.run_simulation(
+        number_of_simulations, engine="batch", shard_size=500, cache=cache
+    )
+    return simulation.statistics
+
+
+@pytest.mark.parametrize(
+    "sizes",
+    [
+        pytest.param([1000, 2500], id="Top Up"),
+        pytest.param([2250, 2250], id="Repeat With Partial Shard"),
+        pytest.param([2500, 1000], id="Smaller Than Cached"),
+    ],
+)
+def test_cached_runs_match_fresh_runs(tmp_path: Path, sizes: list[int]):
+    """Test that runs from the cache give the statistics of fresh runs."""
+    cache = ResultCache(tmp_path)
+    for size in sizes:
+        assert _run(size, cache) == _run(size)
+
+
+def test_top_up_only_runs_missing_shards(tmp_path: Path):
+    """Test that a larger run keeps the cached shards and stores the new ones."""
+    cache = ResultCache(tmp_path)
+    _run(1000, cache)
+    _run(2750, cache)
+    _run(1500, cache)
+
+    (path,) = tmp_path.glob("*.pkl")
+    number_of_matches, aggregator = cache.load(path.stem)
+    assert number_of_matches == aggregator.number_of_matches == 2500
+
+
+def test_unseeded_runs_are_not_cached(tmp_path: Path):
+    """Test that runs without a seed bypass the cache."""
+    simulator(0.55).run_simulation(100, cache=ResultCache(tmp_path))
+    assert not list(tmp_path.glob("*.pkl"))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path):
+    """Test that the size limit removes the oldest entries first."""
+    aggregator = StatisticsAggregator()
+    aggregator.add_match(0, ((6, 0), (6, 0)), (48, 0))
+    cache = ResultCache(tmp_path, max_bytes=10**9)
+    for number, key in enumerate("abc"):
+        cache.store(key, aggregator)
+        os.utime(tmp_path / f"{key}.pkl", (number, number))
+    cache.load("a")
+
+    cache.max_bytes = 2 * (tmp_path / "a.pkl").stat().st_size
+    cache.store("d", aggregator)
+    assert sorted(path.stem for path in tmp_path.glob("*.pkl")) == ["a", "d"]
+
+
+def test_broken_entry_is_dropped(tmp_path: Path):
+    """Test that an unreadable entry counts as missing."""
+    cache = ResultCache(tmp_path)
+    (tmp_path / "broken.pkl").write_bytes(b"")
+    assert cache.load("broken") is None
+    assert not (tmp_path / "broken.pkl").exists()
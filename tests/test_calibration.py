@@ -0,0 +1,147 @@
+"""Tests for calibrating point win rates from match odds and score lines."""
+
+import numpy as np
+import pytest
+
+from tennis_simulator.analysis.calibration import (
+    calibrate_winrate,
+    fit_score_lines,
+    implied_probability,
+)
+from tennis_simulator.analysis.distributions import (
+    set_score_derivatives,
+    sub_match_distributions,
+)
+from tennis_simulator.analysis.markov import (
+    match_win_derivatives,
+    match_win_probability,
+)
+from tennis_simulator.simulation.batch import simulate_batch
+
+
+@pytest.mark.parametrize(
+    "best_of_sets",
+    [
+        pytest.param(3, id="Best Of 3"),
+        pytest.param(5, id="Best Of 5"),
+    ],
+)
+def test_calibration_inverts_match_probability(best_of_sets: int):
+    """Test that calibrated win rates reproduce their target match odds."""
+    winrates = np.linspace(0.3, 0.7, 17)
+    targets = [match_win_probability(p, best_of_sets) for p in winrates]
+    calibrated = calibrate_winrate(np.array(targets), best_of_sets)
+    np.testing.assert_allclose(calibrated, winrates, atol=1e-10)
+    assert calibrate_winrate(targets[5], best_of_sets) == pytest.approx(
+        winrates[5], abs=1e-10
+    )
+    assert calibrate_winrate(0.5, best_of_sets) == pytest.approx(0.5, abs=1e-12)
+
+
+def test_calibration_rejects_invalid_probability():
+    """Test that targets outside [0, 1] are rejected."""
+    with pytest.raises(ValueError):
+        calibrate_winrate(1.2)
+
+
+def test_match_derivatives_match_finite_differences():
+    """Test the complex-step slope against a central difference."""
+    winrates = np.array([0.35, 0.5, 0.55, 0.62])
+    match, slope = match_win_derivatives(winrates, 3)
+    delta = 1e-6
+    expected = (
+        np.array([match_win_probability(p + delta) for p in winrates])
+        - np.array([match_win_probability(p - delta) for p in winrates])
+    ) / (2 * delta)
+    np.testing.assert_allclose(
+        match, [match_win_probability(p) for p in winrates], atol=1e-14
+    )
+    np.testing.assert_allclose(slope, expected, rtol=1e-6)
+
+
+def test_set_score_derivatives_match_set_distribution():
+    """Test the vectorized set scores against the cached set distribution."""
+    winrates = np.array([0.45, 0.58])
+    games, probabilities, slopes = set_score_derivatives(winrates)
+    np.testing.assert_allclose(probabilities.sum(axis=0), 1.0)
+    np.testing.assert_allclose(slopes.sum(axis=0), 0.0, atol=1e-12)
+    for column, winrate in enumerate(winrates):
+        distribution = sub_match_distributions(float(winrate)).set
+        np.testing.assert_array_equal(games, distribution.games)
+        np.testing.assert_allclose(
+            probabilities[:, column], distribution.probabilities, atol=1e-14
+        )
+
+
+@pytest.mark.parametrize(
+    ("winrate", "best_of_sets"),
+    [
+        pytest.param(0.57, 3, id="Favourite Best Of 3"),
+        pytest.param(0.46, 5, id="Underdog Best Of 5"),
+    ],
+)
+def test_fit_recovers_simulated_win_rate(winrate: float, best_of_sets: int):
+    """Test that fitted win rates of simulated score lines are within a few SE."""
+    result = simulate_batch(2000, winrate, best_of_sets, rng=np.random.default_rng(11))
+    fit = fit_score_lines(result.match_results(), best_of_sets)
+    assert fit.number_of_matches == 2000
+    assert 0 < fit.standard_error < 0.01
+    assert abs(fit.winrate_player_1 - winrate) < 4 * fit.standard_error
+    lower, upper = fit.interval(0.95)
+    assert lower < fit.winrate_player_1 < upper
+
+
+def test_fit_is_a_likelihood_maximum():
+    """Test that the fit has a higher likelihood than its neighbours."""
+    lines = ["6-4,3-6,7-6,", "6-2,6-3,", "4-6,6-7,", "7-5,6-4,"]
+    fit = fit_score_lines(lines)
+    sets = [
+        tuple(int(games) for games in set_score.split("-"))
+        for line in lines
+        for set_score in line.rstrip(",").split(",")
+    ]
+    winrates = fit.winrate_player_1 + np.array([0.0, -1e-3, 1e-3])
+    games, probabilities, _ = set_score_derivatives(winrates)
+    rows = [
+        next(k for k, score in enumerate(games.tolist()) if tuple(score) == played)
+        for played in sets
+    ]
+    log_likelihood = np.log(probabilities[rows]).sum(axis=0)
+    assert log_likelihood[0] == pytest.approx(fit.log_likelihood)
+    assert log_likelihood[0] > log_likelihood[1]
+    assert log_likelihood[0] > log_likelihood[2]
+    assert fit_score_lines(lines * 3).log_likelihood == pytest.approx(
+        3 * fit.log_likelihood
+    )
+
+
+def test_one_sided_lines_fit_on_the_boundary():
+    """Test that only lost games give a win rate of 0 without standard error."""
+    fit = fit_score_lines(["0-6,0-6,"])
+    assert fit.winrate_player_1 == 0.0
+    assert np.isnan(fit.standard_error)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        pytest.param("6-4,8-6,", id="Invalid Set"),
+        pytest.param("6-4,6-3,6-2,", id="Set After The End"),
+        pytest.param("6-4,3-6,", id="Incomplete Match"),
+        pytest.param("six-four,", id="Not A Score"),
+    ],
+)
+def test_fit_rejects_invalid_lines(line: str):
+    """Test that score lines that are not complete matches are rejected."""
+    with pytest.raises(ValueError):
+        fit_score_lines([line])
+
+
+def test_implied_probability_removes_margin():
+    """Test that the bookmaker margin is scaled away."""
+    assert implied_probability(2.0, 2.0) == pytest.approx(0.5)
+    assert implied_probability(1.5, 2.5) == pytest.approx(
+        (1 / 1.5) / (1 / 1.5 + 1 / 2.5)
+    )
+    with pytest.raises(ValueError):
+        implied_probability(0.9, 3.0)
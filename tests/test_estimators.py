@@ -0,0 +1,67 @@
+"""Tests for the variance-reduced match-win rate estimators."""
+
+import numpy as np
+import pytest
+
+from tennis_simulator.simulation.estimators import EstimatorMoments
+from tennis_simulator.simulation.simulator import simulator
+
+
+def test_antithetic_pairs_are_exact_for_even_players():
+    """Test that mirrored matches of even players split every pair."""
+    simulation = simulator(0.5, seed=1)
+    simulation.run_simulation(2000, engine="batch", estimator="antithetic")
+    estimator = simulation.statistics["estimator"]
+    assert estimator["match_win_rate"] == 0.5
+    assert estimator["standard_error"] == 0.0
+    assert estimator["units"] == 1000
+
+
+@pytest.mark.parametrize(
+    "estimator, engine",
+    [
+        pytest.param("antithetic", "batch", id="Antithetic"),
+        pytest.param("control_variate", "batch", id="Control Variate Batch"),
+        pytest.param("control_variate", "scalar", id="Control Variate Scalar"),
+    ],
+)
+def test_estimators_reduce_standard_error(estimator: str, engine: str):
+    """Test a narrower interval than plain Monte Carlo on the same budget."""
+    results = {}
+    for name in ("plain", estimator):
+        simulation = simulator(0.51, seed=2)
+        simulation.run_simulation(4000, engine=engine, estimator=name, confidence=0.999)
+        results[name] = simulation.statistics["estimator"]
+
+    exact = simulation.exact_probabilities().match
+    assert results[estimator]["name"] == estimator
+    assert results[estimator]["standard_error"] < results["plain"]["standard_error"]
+    assert results[estimator]["ci_lower"] <= exact <= results[estimator]["ci_upper"]
+
+
+@pytest.mark.parametrize(
+    "engine, number_of_simulations",
+    [
+        pytest.param("scalar", 100, id="Scalar Engine"),
+        pytest.param("batch", 101, id="Odd Number Of Matches"),
+    ],
+)
+def test_invalid_antithetic_runs(engine: str, number_of_simulations: int):
+    """Test that antithetic runs need the batch engine and whole pairs."""
+    with pytest.raises(ValueError):
+        simulator(0.5).run_simulation(
+            number_of_simulations, engine=engine, estimator="antithetic"
+        )
+
+
+def test_merged_moments_equal_moments_of_all_units():
+    """Test that merging shard sums equals adding all units at once."""
+    rng = np.random.default_rng(3)
+    y, x = rng.random(100), rng.normal(size=100)
+    whole, first, second = (EstimatorMoments(0.5) for _ in range(3))
+    whole.add_many(y, x)
+    first.add_many(y[:40], x[:40])
+    second.add_many(y[40:], x[40:])
+    first.merge(second)
+    for estimator in ("plain", "control_variate"):
+        assert first.estimate(estimator) == pytest.approx(whole.estimate(estimator))
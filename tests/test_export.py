@@ -0,0 +1,68 @@
+"""Tests for the columnar export of per-match results."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tennis_simulator.simulation.batch import simulate_batch
+from tennis_simulator.simulation.export import (
+    ResultWriter,
+    combine_results,
+    load_results,
+)
+from tennis_simulator.simulation.simulator import simulator
+
+
+def test_scalar_and_batch_writes_agree(tmp_path: Path):
+    """Test that writing matches one by one equals writing the batch."""
+    result = simulate_batch(50, winrate_player_1=0.5, rng=np.random.default_rng(3))
+    per_batch = ResultWriter(tmp_path / "batch")
+    per_batch.write_batch(result)
+    per_batch.close()
+    per_match = ResultWriter(tmp_path / "match")
+    for match in range(len(result)):
+        sets = int(result.sets_played[match])
+        per_match.add_match(
+            int(result.winners[match]),
+            tuple(map(tuple, result.set_games[match, :sets].tolist())),
+            tuple(result.points_won[match].tolist()),
+        )
+    per_match.close()
+
+    batch = load_results(combine_results([tmp_path / "batch"], tmp_path / "b"))
+    match = load_results(combine_results([tmp_path / "match"], tmp_path / "m"))
+    for column in batch:
+        np.testing.assert_array_equal(batch[column], match[column])
+
+
+def test_derived_columns(tmp_path: Path):
+    """Test sets won and tiebreak flags of a fixed match."""
+    writer = ResultWriter(tmp_path / "part")
+    writer.add_match(1, ((7, 6), (4, 6), (6, 7)), (80, 85))
+    writer.close()
+
+    columns = load_results(combine_results([tmp_path / "part"], tmp_path / "out"))
+    assert isinstance(columns["winner"], np.memmap)
+    assert columns["winner"].tolist() == [1]
+    assert columns["sets_won"].tolist() == [[1, 2]]
+    assert columns["tiebreaks"].tolist() == [[True, False, True]]
+    assert columns["points_won"].tolist() == [[80, 85]]
+
+
+@pytest.mark.parametrize("engine", ["scalar", "batch"])
+def test_exported_run_matches_statistics(tmp_path: Path, engine: str):
+    """Test that an exported run holds every match in shard order."""
+    simulation = simulator(winrate_player_1=0.55, seed=1)
+    simulation.run_simulation(120, engine=engine, shard_size=50, export_dir=tmp_path)
+
+    columns = load_results(tmp_path)
+    statistics = simulation.statistics
+    assert not (tmp_path / "parts").exists()
+    assert len(columns["winner"]) == 120
+    assert int(np.count_nonzero(columns["winner"] == 0)) == statistics["player_1_wins"]
+    assert columns["points_won"].sum(axis=0).tolist() == [
+        statistics["player_1_total_points_won"],
+        statistics["player_2_total_points_won"],
+    ]
+    assert columns["sets_won"].max(axis=1).tolist() == [2] * 120
@@ -0,0 +1,85 @@
+"""Tests for the hierarchical set-by-set sampler."""
+
+import numpy as np
+import pytest
+
+from tennis_simulator.analysis.distributions import sub_match_distributions
+from tennis_simulator.analysis.markov import solve_match
+from tennis_simulator.simulation.batch import simulate_batch
+from tennis_simulator.simulation.hierarchical import simulate_hierarchical
+from tennis_simulator.simulation.simulator import simulator
+
+
+@pytest.mark.parametrize("winrate", [0.0, 0.35, 0.5, 0.62, 1.0])
+def test_distributions_agree_with_exact_solver(winrate: float):
+    """Test that the cached distributions sum up to the solver results."""
+    distributions = sub_match_distributions(winrate)
+    exact = solve_match(winrate)
+    sets = distributions.set
+    assert sets.probabilities.sum() == pytest.approx(1)
+    assert sets.probabilities[sets.games[:, 0] > sets.games[:, 1]].sum() == (
+        pytest.approx(exact.set)
+    )
+    assert distributions.game.win == pytest.approx(exact.game)
+    assert distributions.tiebreak.win == pytest.approx(exact.tiebreak)
+    assert distributions.game.conditional.sum(axis=1) == pytest.approx([1, 1])
+
+
+@pytest.mark.parametrize(
+    "winrate_player_1, best_of_sets, expected_result, expected_points",
+    [
+        pytest.param(1.0, 3, "6-0,6-0,", (48, 0), id="Player 1 Best Of 3"),
+        pytest.param(0.0, 5, "0-6,0-6,0-6,", (0, 72), id="Player 2 Best Of 5"),
+    ],
+)
+def test_hierarchical_deterministic(
+    winrate_player_1: float,
+    best_of_sets: int,
+    expected_result: str,
+    expected_points: tuple[int, int],
+):
+    """Test hierarchical results when one player wins every point."""
+    result = simulate_hierarchical(5, winrate_player_1, best_of_sets)
+    assert result.match_results() == [expected_result] * 5
+    assert result.points_won.tolist() == [list(expected_points)] * 5
+
+
+@pytest.mark.parametrize("best_of_sets", [3, 5])
+def test_hierarchical_matches_point_by_point(best_of_sets: int):
+    """Test score lines and points against point-by-point simulation."""
+    number_of_matches, winrate = 40_000, 0.53
+    hierarchical = simulate_hierarchical(
+        number_of_matches, winrate, best_of_sets, rng=np.random.default_rng(1)
+    )
+    batch = simulate_batch(
+        number_of_matches, winrate, best_of_sets, rng=np.random.default_rng(2)
+    )
+    exact = solve_match(winrate, best_of_sets)
+
+    for result in (hierarchical, batch):
+        win_rate = np.mean(result.winners == 0)
+        standard_error = np.sqrt(exact.match * (1 - exact.match) / number_of_matches)
+        assert abs(win_rate - exact.match) < 5 * standard_error
+        mean_points = result.points_won.sum(axis=1).mean()
+        assert mean_points == pytest.approx(exact.expected_match_points, rel=0.01)
+        assert result.points_won[:, 0].sum() / result.points_won.sum() == (
+            pytest.approx(winrate, abs=0.002)
+        )
+
+    # Set score frequencies of the first set
+    for games in ((6, 4), (7, 6), (3, 6)):
+        frequencies = [
+            np.mean(np.all(result.set_games[:, 0] == games, axis=1))
+            for result in (hierarchical, batch)
+        ]
+        assert frequencies[0] == pytest.approx(frequencies[1], abs=0.01)
+
+
+def test_hierarchical_engine_in_simulator():
+    """Test the hierarchical engine through the simulator."""
+    simulation = simulator(0.55, seed=1)
+    simulation.run_simulation(1000, engine="hierarchical", shard_size=300)
+    statistics = simulation.statistics
+    assert statistics["number_of_matches"] == 1000
+    assert sum(statistics["score_lines"].values()) == 1000
+    assert statistics["player_1_wins"] > statistics["player_2_wins"]
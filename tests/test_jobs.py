@@ -0,0 +1,97 @@
+"""Tests for background simulation jobs."""
+
+import threading
+
+import pytest
+
+from tennis_simulator.simulation.jobs import JobRunner
+from tennis_simulator.simulation.simulator import simulator
+
+
+@pytest.fixture
+def runner():
+    """Fixture to create a job runner that is shut down after the test."""
+    job_runner = JobRunner()
+    yield job_runner
+    job_runner.shutdown()
+
+
+def test_job_matches_direct_run(runner: JobRunner):
+    """Test that a job gives the statistics of a direct run."""
+    job_id = runner.submit(simulator(0.55, seed=3), 3000, engine="batch")
+    status = runner.wait(job_id, timeout=60)
+
+    direct = simulator(0.55, seed=3)
+    direct.run_simulation(3000, engine="batch")
+    assert status.state == "done"
+    assert status.progress == 1.0
+    assert status.statistics == direct.statistics
+
+
+def test_progress_is_reported_per_shard():
+    """Test that runs report progress and partial statistics after every shard."""
+    updates = []
+    simulation = simulator(0.55, seed=3)
+    simulation.run_simulation(
+        2500,
+        engine="batch",
+        shard_size=1000,
+        progress=lambda done, total, statistics: updates.append(
+            (done, total, statistics["number_of_matches"])
+        ),
+    )
+    assert updates == [(1000, 2500, 1000), (2000, 2500, 2000), (2500, 2500, 2500)]
+
+
+@pytest.mark.parametrize("adaptive", [False, True])
+def test_cancelled_run_keeps_finished_shards(adaptive: bool):
+    """Test that cancelling stops a run after the current shard."""
+    cancel = threading.Event()
+    simulation = simulator(0.55, seed=3)
+
+    def progress(done: int, total: int, statistics: dict) -> None:
+        if done >= 2000:
+            cancel.set()
+
+    if adaptive:
+        simulation.run_adaptive(
+            target_half_width=1e-4,
+            batch_size=1000,
+            max_simulations=100_000,
+            progress=progress,
+            cancel=cancel,
+        )
+    else:
+        simulation.run_simulation(
+            100_000, engine="batch", shard_size=1000, progress=progress, cancel=cancel
+        )
+    assert simulation.statistics["number_of_matches"] == 2000
+    assert simulation.statistics["cancelled"]
+
+
+def test_cancelled_job(runner: JobRunner):
+    """Test that a cancelled job stops early and reports what it simulated."""
+    job_id = runner.submit(
+        simulator(0.5, seed=1), 1_000_000, engine="batch", shard_size=1000
+    )
+    runner.cancel(job_id)
+    status = runner.wait(job_id, timeout=60)
+
+    assert status.state == "cancelled"
+    # Cancelled while queued, or after its first shard
+    assert status.completed in (0, 1000)
+    assert status.completed == status.statistics.get("number_of_matches", 0)
+
+
+def test_failed_job(runner: JobRunner):
+    """Test that errors of a job are reported instead of raised."""
+    job_id = runner.submit(simulator(0.5), 10, engine="unknown")
+    status = runner.wait(job_id, timeout=60)
+    assert status.state == "failed"
+    assert "Invalid engine" in status.error
+
+
+def test_unknown_job(runner: JobRunner):
+    """Test that unknown job ids are rejected."""
+    with pytest.raises(KeyError, match="Unknown job"):
+        runner.status("missing")
@@ -0,0 +1,108 @@
+"""Tests for live forecasts from the score of a running match."""
+
+import numpy as np
+import pytest
+
+from tennis_simulator.analysis.markov import solve_match, solve_serve_match
+from tennis_simulator.simulation import live
+from tennis_simulator.simulation.live import forecast, live_win_probability
+from tennis_simulator.simulation.simulator import simulator
+from tennis_simulator.tennis_scoring.tennis_score import (
+    PLAYER_1,
+    PLAYER_2,
+    TennisScore,
+)
+
+
+def _score(points: list[int], best_of_sets: int = 3) -> TennisScore:
+    """Score after playing the given point winners."""
+    tennis_score = TennisScore(best_of_sets=best_of_sets)
+    for player in points:
+        tennis_score.win_point(player)
+    return tennis_score
+
+
+@pytest.mark.parametrize(
+    "best_of_sets",
+    [
+        pytest.param(1, id="Best Of 1"),
+        pytest.param(3, id="Best Of 3"),
+        pytest.param(5, id="Best Of 5"),
+    ],
+)
+def test_start_of_match_equals_exact_solver(best_of_sets: int):
+    """Test the win probability at the first point against the Markov solvers."""
+    tennis_score = TennisScore(best_of_sets=best_of_sets)
+    assert live_win_probability(tennis_score, 0.53) == pytest.approx(
+        solve_match(0.53, best_of_sets).match, abs=1e-12
+    )
+
+    tennis_score = TennisScore(best_of_sets=best_of_sets, server=PLAYER_2)
+    assert live_win_probability(tennis_score, (0.62, 0.33)) == pytest.approx(
+        solve_serve_match((0.62, 0.67), best_of_sets, PLAYER_2).match, abs=1e-12
+    )
+
+
+def test_win_probability_is_consistent_between_points():
+    """Test that every score is the average of the scores after its point."""
+    rng = np.random.default_rng(4)
+    winrates = (0.64, 0.41)
+    for _ in range(20):
+        tennis_score = _score(rng.integers(0, 2, rng.integers(0, 250)).tolist())
+        if tennis_score.winner_id is not None:
+            continue
+        player_1 = winrates[tennis_score.server]
+        after = []
+        for player in (PLAYER_1, PLAYER_2):
+            next_score = tennis_score.copy()
+            next_score.win_point(player)
+            after.append(live_win_probability(next_score, winrates))
+        assert live_win_probability(tennis_score, winrates) == pytest.approx(
+            player_1 * after[0] + (1 - player_1) * after[1], abs=1e-12
+        )
+
+
+def test_exact_score_lines_match_simulated_score_lines(monkeypatch):
+    """Test enumerated score lines against the simulation fallback."""
+    # Player 1 leads 6-4, 3-3
+    tennis_score = _score([0] * 16 + [1] * 16 + [0] * 20 + [1] * 12)
+    assert tennis_score.set_scores == ((6, 4),)
+
+    exact = forecast(tennis_score, 0.52)
+    assert exact.number_of_matches == 0
+    assert sum(exact.score_lines.values()) == pytest.approx(1.0)
+    assert all(line.startswith("6-4,") for line in exact.score_lines)
+
+    monkeypatch.setattr(live, "MAX_EXACT_SETS", 0)
+    simulated = forecast(
+        tennis_score, 0.52, number_of_matches=20_000, rng=np.random.default_rng(0)
+    )
+    assert simulated.number_of_matches == 20_000
+    assert simulated.win == exact.win
+    for line, probability in list(exact.score_lines.items())[:10]:
+        standard_error = np.sqrt(probability * (1 - probability) / 20_000)
+        assert abs(simulated.score_lines.get(line, 0.0) - probability) < (
+            5 * standard_error
+        )
+
+
+def test_finished_match_forecast():
+    """Test that a finished match has a certain outcome."""
+    tennis_score = _score([PLAYER_2] * 48)
+    result = forecast(tennis_score, 0.9)
+    assert result.win == 0.0
+    assert result.score_lines == {"0-6,0-6,": 1.0}
+
+
+def test_simulator_forecast_uses_its_point_model():
+    """Test that the simulator forecasts with its serve win rates and format."""
+    simulation = simulator(serve_winrates=(0.7, 0.6), best_of_sets=5, seed=1)
+    tennis_score = _score([PLAYER_1] * 48, best_of_sets=5)
+    result = simulation.forecast(tennis_score)
+    assert result.win == pytest.approx(
+        live_win_probability(tennis_score, (0.7, 0.4)), abs=1e-12
+    )
+    assert result.number_of_matches == 0
+
+    with pytest.raises(ValueError, match="match format"):
+        simulation.forecast(TennisScore())
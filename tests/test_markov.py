@@ -0,0 +1,123 @@
+"""Tests for the exact Markov chain match solver."""
+
+import numpy as np
+import pytest
+
+from tennis_simulator.analysis.markov import (
+    match_win_probabilities,
+    match_win_probability,
+    solve_match,
+    solve_serve_match,
+)
+from tennis_simulator.simulation.batch import simulate_batch
+from tennis_simulator.tennis_scoring.tennis_score import PLAYER_1
+
+
+@pytest.mark.parametrize(
+    "winrate_player_1, expected_game",
+    [
+        pytest.param(0.5, 0.5, id="Even"),
+        pytest.param(0.6, 0.735729, id="Favourite"),
+        pytest.param(1.0, 1.0, id="Always Wins"),
+        pytest.param(0.0, 0.0, id="Never Wins"),
+    ],
+)
+def test_game_win_probability(winrate_player_1: float, expected_game: float):
+    """Test game win probabilities against known values."""
+    assert solve_match(winrate_player_1).game == pytest.approx(expected_game, abs=1e-6)
+
+
+@pytest.mark.parametrize("best_of_sets", [3, 5])
+@pytest.mark.parametrize("winrate_player_1", [0.45, 0.5, 0.52])
+def test_match_probability_is_symmetric(winrate_player_1: float, best_of_sets: int):
+    """Test that swapping the players swaps the match win probability."""
+    assert match_win_probability(winrate_player_1, best_of_sets) == pytest.approx(
+        1 - match_win_probability(1 - winrate_player_1, best_of_sets)
+    )
+
+
+def test_expected_lengths_for_a_whitewash():
+    """Test expected lengths when player 1 wins every point."""
+    probabilities = solve_match(1.0, best_of_sets=5)
+    assert probabilities.match == 1.0
+    assert probabilities.expected_match_sets == 3
+    assert probabilities.expected_match_games == 18
+    assert probabilities.expected_match_points == 72
+
+
+@pytest.mark.parametrize("best_of_sets", [3, 5])
+def test_solver_matches_monte_carlo(best_of_sets: int):
+    """Test exact results against the batch engine within sampling error."""
+    number_of_matches = 20000
+    probabilities = solve_match(0.52, best_of_sets)
+    result = simulate_batch(
+        number_of_matches, 0.52, best_of_sets, rng=np.random.default_rng(3)
+    )
+
+    match_rate = np.mean(result.winners == PLAYER_1)
+    standard_error = np.sqrt(probabilities.match * (1 - probabilities.match))
+    assert abs(match_rate - probabilities.match) < 5 * standard_error / np.sqrt(
+        number_of_matches
+    )
+
+    points = result.points_won.sum(axis=1)
+    assert abs(points.mean() - probabilities.expected_match_points) < 5 * (
+        points.std() / np.sqrt(number_of_matches)
+    )
+
+
+@pytest.mark.parametrize("best_of_sets", [3, 5])
+@pytest.mark.parametrize("winrate_player_1", [0.45, 0.5, 0.6])
+def test_serve_solver_without_serve_advantage(
+    winrate_player_1: float, best_of_sets: int
+):
+    """Test that equal rates on both serves give the constant-rate solution."""
+    constant = solve_match(winrate_player_1, best_of_sets)
+    serve = solve_serve_match(
+        (winrate_player_1, 1 - winrate_player_1), best_of_sets, first_server=1
+    )
+    assert serve.match == pytest.approx(constant.match)
+    assert serve.set == pytest.approx((constant.set, constant.set))
+    assert serve.expected_match_points == pytest.approx(constant.expected_match_points)
+    assert serve.expected_match_games == pytest.approx(constant.expected_match_games)
+
+
+def test_serve_solver_swaps_players():
+    """Test that swapping players and first server swaps the match probability."""
+    forward = solve_serve_match((0.66, 0.61), first_server=0)
+    backward = solve_serve_match((0.61, 0.66), first_server=1)
+    assert forward.match == pytest.approx(1 - backward.match)
+    assert forward.hold_player_1 == pytest.approx(backward.hold_player_2)
+
+
+@pytest.mark.parametrize("best_of_sets", [3, 5])
+def test_serve_solver_matches_monte_carlo(best_of_sets: int):
+    """Test serve-aware exact results against the batch engine."""
+    number_of_matches = 20000
+    probabilities = solve_serve_match((0.64, 0.6), best_of_sets, first_server=1)
+    result = simulate_batch(
+        number_of_matches,
+        (0.64, 0.4),
+        best_of_sets,
+        rng=np.random.default_rng(8),
+        first_server=1,
+    )
+
+    match_rate = np.mean(result.winners == PLAYER_1)
+    standard_error = np.sqrt(probabilities.match * (1 - probabilities.match))
+    assert abs(match_rate - probabilities.match) < 5 * standard_error / np.sqrt(
+        number_of_matches
+    )
+
+    points = result.points_won.sum(axis=1)
+    assert abs(points.mean() - probabilities.expected_match_points) < 5 * (
+        points.std() / np.sqrt(number_of_matches)
+    )
+
+
+@pytest.mark.parametrize("best_of_sets", [3, 5])
+def test_vectorized_match_probabilities(best_of_sets: int):
+    """Test that the array solver agrees with the scalar solver."""
+    winrates = np.linspace(0, 1, 21)
+    expected = [match_win_probability(float(rate), best_of_sets) for rate in winrates]
+    assert match_win_probabilities(winrates, best_of_sets) == pytest.approx(expected)
@@ -0,0 +1,44 @@
+"""Tests for sharded and parallel simulation runs."""
+
+import pytest
+
+from tennis_simulator.simulation.parallel import plan_shards
+from tennis_simulator.simulation.simulator import simulator
+
+
+@pytest.mark.parametrize(
+    "number_of_simulations, shard_size, expected_sizes",
+    [
+        pytest.param(10, 5, [5, 5], id="Even Shards"),
+        pytest.param(12, 5, [5, 5, 2], id="Remainder Shard"),
+        pytest.param(3, 5, [3], id="Single Shard"),
+        pytest.param(0, 5, [], id="No Shards"),
+    ],
+)
+def test_plan_shards(
+    number_of_simulations: int, shard_size: int, expected_sizes: list[int]
+):
+    """Test splitting a run into shards."""
+    shards = plan_shards(number_of_simulations, seed=1, shard_size=shard_size)
+    assert [size for size, _ in shards] == expected_sizes
+
+
+@pytest.mark.parametrize("engine", ["scalar", "batch"])
+def test_same_seed_same_statistics_for_any_worker_count(engine: str):
+    """Test that a seeded run does not depend on the number of workers."""
+    statistics = []
+    for workers in (1, 2):
+        simulation = simulator(winrate_player_1=0.55, seed=42)
+        simulation.run_simulation(
+            number_of_simulations=250,
+            engine=engine,
+            workers=workers,
+            shard_size=60,
+            keep_results="reservoir",
+            reservoir_size=100,
+        )
+        statistics.append(simulation.statistics)
+
+    assert statistics[0] == statistics[1]
+    assert statistics[0]["number_of_matches"] == 250
+    assert len(statistics[0]["results"]) == 100
@@ -0,0 +1,111 @@
+"""Tests for block-wise point generation of the scalar engine."""
+
+import random
+
+import numpy as np
+import pytest
+
+from tennis_simulator.analysis.markov import solve_serve_match
+from tennis_simulator.simulation.point_stream import PointStream
+from tennis_simulator.tennis_scoring.tennis_score import PLAYER_1, TennisScore
+
+
+def _codes(number_of_points: int, serve_aware: bool, seed: int) -> bytes:
+    """Random point outcome codes, with equal bits unless serve aware."""
+    rng = random.Random(seed)
+    if serve_aware:
+        return bytes(rng.randrange(4) for _ in range(number_of_points))
+    return bytes(3 * rng.randrange(2) for _ in range(number_of_points))
+
+
+@pytest.mark.parametrize("serve_aware", [False, True])
+@pytest.mark.parametrize("best_of_sets", [3, 5])
+def test_play_points_matches_win_point(serve_aware: bool, best_of_sets: int):
+    """Test that playing a block equals playing its points one by one."""
+    for seed in range(30):
+        outcomes = _codes(2000, serve_aware, seed)
+        blocked = TennisScore(best_of_sets=best_of_sets, server=seed % 2)
+        single = TennisScore(best_of_sets=best_of_sets, server=seed % 2)
+
+        # Small blocks also split matches across block boundaries
+        position = 0
+        while blocked.winner_id is None:
+            position = blocked.play_points(
+                outcomes[: position + 7], position, serve_aware
+            )
+        for code in outcomes:
+            if single.winner_id is not None:
+                break
+            single.win_point((code >> single.server) & 1)
+
+        assert position == sum(single.total_points_won)
+        assert blocked.total_points_won == single.total_points_won
+        assert blocked.match_result() == single.match_result()
+        assert blocked.winner_id == single.winner_id
+
+
+def test_play_points_counts_block_without_server():
+    """Test that constant-rate blocks count the points won per block."""
+    outcomes = _codes(5000, serve_aware=False, seed=1)
+    tennis_score = TennisScore()
+    position = tennis_score.play_points(outcomes)
+
+    player_2_points = outcomes[:position].count(3)
+    assert tennis_score.total_points_won == (
+        position - player_2_points,
+        player_2_points,
+    )
+
+
+def test_play_points_from_a_score_outside_the_table():
+    """Test that scores outside the table fall back to the scoring rules."""
+    tennis_score = TennisScore()
+    tennis_score._state[4:6] = [20, 20]
+    tennis_score._state[2:4] = [6, 6]
+    position = tennis_score.play_points(bytes([3, 3]))
+
+    assert position == 2
+    assert tennis_score.match_result() == "6-7,"
+    assert tennis_score.total_points_won == (0, 2)
+
+
+@pytest.mark.parametrize(
+    "serve_winrates",
+    [
+        pytest.param((0.6, 0.4), id="Constant Win Rate"),
+        pytest.param((0.66, 0.6), id="Serve Aware"),
+    ],
+)
+def test_stream_matches_exact_solution(serve_winrates: tuple[float, float]):
+    """Test the match-win rate of streamed matches against the exact solver."""
+    number_of_matches = 3000
+    winrates = (serve_winrates[0], 1 - serve_winrates[1])
+    stream = PointStream(np.random.default_rng(2), winrates, block_size=1000)
+    wins = sum(
+        stream.play(TennisScore()).winner_id == PLAYER_1
+        for _ in range(number_of_matches)
+    )
+
+    match = solve_serve_match(serve_winrates).match
+    standard_error = (match * (1 - match) / number_of_matches) ** 0.5
+    assert stream.serve_aware == (winrates[0] != winrates[1])
+    assert abs(wins / number_of_matches - match) < 5 * standard_error
+
+
+@pytest.mark.parametrize("serve_aware", [False, True])
+def test_play_points_tracks_statistics_like_win_point(serve_aware: bool):
+    """Test that blocks count the same per-match statistics as single points."""
+    for seed in range(20):
+        outcomes = _codes(2000, serve_aware, seed)
+        blocked = TennisScore(server=seed % 2, track_statistics=True)
+        single = TennisScore(server=seed % 2, track_statistics=True)
+
+        position = 0
+        while blocked.winner_id is None:
+            position = blocked.play_points(
+                outcomes[: position + 7], position, serve_aware
+            )
+        for code in outcomes[:position]:
+            single.win_point((code >> single.server) & 1)
+
+        assert blocked.match_statistics == single.match_statistics
@@ -0,0 +1,93 @@
+"""Tests for the per-phase profile of simulation runs."""
+
+import json
+import pstats
+from pathlib import Path
+
+import pytest
+
+from tennis_simulator.simulation.profiling import RunProfile, write_report
+from tennis_simulator.simulation.simulator import simulator
+
+
+@pytest.mark.parametrize(
+    ("engine", "phases"),
+    [
+        pytest.param("scalar", {"points", "scoring", "statistics"}, id="Scalar"),
+        pytest.param("batch", {"simulate", "statistics"}, id="Batch"),
+        pytest.param("hierarchical", {"simulate", "statistics"}, id="Hierarchical"),
+    ],
+)
+def test_profile_reports_engine_phases(engine: str, phases: set[str]):
+    """Test that every engine reports its phases, matches and points."""
+    simulation = simulator(0.6, seed=1, profile=True)
+    simulation.run_simulation(300, engine=engine, shard_size=100)
+    report = simulation.statistics["profile"]
+
+    assert phases | {"merge", "score_lines"} == set(report["phases"])
+    assert report["shards"] == 3
+    assert report["matches"] == 300
+    assert report["points"] == (
+        simulation.statistics["player_1_total_points_won"]
+        + simulation.statistics["player_2_total_points_won"]
+    )
+    assert report["phases"]["merge"]["calls"] == 3
+    assert report["matches_per_second"] > 0
+    assert sum(phase["share"] for phase in report["phases"].values()) == (
+        pytest.approx(1.0)
+    )
+
+
+def test_profile_does_not_change_results():
+    """Test that profiled runs give the statistics of unprofiled runs."""
+    profiled = simulator(0.6, seed=1, profile=True)
+    plain = simulator(0.6, seed=1)
+    profiled.run_simulation(200, shard_size=50)
+    plain.run_simulation(200, shard_size=50)
+
+    assert "profile" not in plain.statistics
+    profiled.statistics.pop("profile")
+    assert profiled.statistics == plain.statistics
+
+
+def test_profile_of_adaptive_run():
+    """Test that adaptive runs report the batches they merged."""
+    simulation = simulator(0.6, seed=1, profile=True)
+    simulation.run_adaptive(target_half_width=0.05, batch_size=100, max_simulations=500)
+    report = simulation.statistics["profile"]
+    assert report["matches"] >= simulation.statistics["number_of_matches"]
+    assert report["phases"]["merge"]["calls"] == (
+        simulation.statistics["number_of_matches"] // 100
+    )
+
+
+def test_profiles_merge():
+    """Test that merged profiles add their phases and counters."""
+    first, second = RunProfile(), RunProfile()
+    first.add("points", 1_000, calls=2, allocated_blocks=3)
+    second.add("points", 500, calls=1)
+    second.add("scoring", 1_500)
+    second.matches, second.points = 10, 90
+
+    report = first.merge(second).to_report()
+    assert report["phases"]["points"] == {
+        "seconds": 1.5e-6,
+        "calls": 3,
+        "share": 0.5,
+        "allocated_blocks": 3,
+    }
+    assert list(report["phases"]) == ["points", "scoring"]
+    assert (report["matches"], report["points"]) == (10, 90)
+
+
+def test_report_and_pstats_files(tmp_path: Path):
+    """Test the JSON report and the cProfile dump of a run."""
+    pstats_path = tmp_path / "run.pstats"
+    simulation = simulator(0.6, seed=1, profile=True, pstats_path=pstats_path)
+    simulation.run_simulation(50)
+
+    write_report(simulation.statistics["profile"], tmp_path / "profile.json")
+    report = json.loads((tmp_path / "profile.json").read_text())
+    assert report == simulation.statistics["profile"]
+    functions = {name for _, _, name in pstats.Stats(str(pstats_path)).stats}
+    assert "play_points" in functions
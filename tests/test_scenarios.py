@@ -0,0 +1,243 @@
+"""Tests for YAML scenario files and the scenario runner."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tennis_simulator.config.read import ConfigManager
+from tennis_simulator.simulation import scenarios
+from tennis_simulator.simulation.scenarios import (
+    Scenario,
+    ScenarioResult,
+    load_scenarios,
+    run_scenarios,
+)
+from tennis_simulator.simulation.simulator import simulator
+
+SCENARIO_FILE = """
+workers: 1
+shard_size: 100
+defaults:
+  number_of_simulations: 250
+  seed: 3
+scenarios:
+  - name: favourite
+    winrate_player_1: 0.56
+  - winrate_player_1: 0.5
+    best_of_sets: 5
+    engine: scalar
+  - name: serve
+    serve_winrates: [0.64, 0.62]
+    seed: 4
+"""
+
+
+@pytest.fixture
+def scenario_file(tmp_path: Path) -> Path:
+    """Scenario file with three scenarios."""
+    path = tmp_path / "scenarios.yml"
+    path.write_text(SCENARIO_FILE)
+    return path
+
+
+def test_load_applies_defaults(scenario_file: Path, tmp_path: Path):
+    """Test that defaults fill every scenario and unnamed ones get numbers."""
+    plan = load_scenarios(scenario_file, tmp_path / "cache")
+    assert (plan.workers, plan.shard_size) == (1, 100)
+    assert plan.scenarios[0] == Scenario(
+        name="favourite", winrate_player_1=0.56, number_of_simulations=250, seed=3
+    )
+    assert plan.scenarios[1].name == "1"
+    assert plan.scenarios[1].engine == "scalar"
+    assert plan.scenarios[2].serve_winrates == (0.64, 0.62)
+    assert plan.scenarios[2].seed == 4
+
+
+def test_validated_file_is_cached_by_mtime(
+    scenario_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that an unchanged file is not validated again, even in a new process."""
+    cache_dir = tmp_path / "cache"
+    plan = load_scenarios(scenario_file, cache_dir)
+    assert load_scenarios(scenario_file, cache_dir) is plan
+
+    # A new process only has the cache on disk and never validates again
+    monkeypatch.setattr(scenarios, "_loaded", {})
+
+    def fail(path: Path) -> None:
+        raise AssertionError("The file was validated again")
+
+    monkeypatch.setattr("tennis_simulator.config.read.load_scenario_file", fail)
+    assert load_scenarios(scenario_file, cache_dir) == plan
+
+    # A changed file is validated again
+    monkeypatch.undo()
+    scenario_file.write_text(SCENARIO_FILE.replace("250", "120"))
+    changed = load_scenarios(scenario_file, cache_dir)
+    assert changed.scenarios[0].number_of_simulations == 120
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param("scenarios:\n  - engine: gpu\n", id="Unknown Engine"),
+        pytest.param("scenarios:\n  - winrate: 0.5\n", id="Unknown Field"),
+        pytest.param("scenarios:\n  - winrate_player_1: 1.5\n", id="Win Rate Range"),
+        pytest.param("scenarios: []\n", id="No Scenarios"),
+        pytest.param(
+            "scenarios:\n  - engine: hierarchical\n    serve_winrates: [0.6, 0.6]\n",
+            id="Hierarchical Serve",
+        ),
+        pytest.param(
+            "scenarios:\n  - engine: hierarchical\n    track_statistics: true\n",
+            id="Hierarchical Statistics",
+        ),
+        pytest.param(
+            "scenarios:\n  - estimator: antithetic\n    engine: scalar\n",
+            id="Antithetic Scalar",
+        ),
+        pytest.param(
+            "scenarios:\n  - estimator: antithetic\n    number_of_simulations: 51\n",
+            id="Antithetic Odd Count",
+        ),
+        pytest.param(
+            "shard_size: 51\nscenarios:\n  - estimator: antithetic\n",
+            id="Antithetic Odd Shard",
+        ),
+        pytest.param(
+            "scenarios:\n  - estimator: control_variate\n"
+            "    serve_winrates: [0.6, 0.6]\n",
+            id="Control Variate Serve",
+        ),
+        pytest.param("scenarios: [\n", id="Invalid YAML"),
+    ],
+)
+def test_invalid_files_are_rejected(tmp_path: Path, content: str):
+    """Test that invalid scenario files raise a ValueError."""
+    path = tmp_path / "invalid.yml"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        load_scenarios(path, None)
+
+
+@pytest.mark.parametrize(
+    "workers",
+    [
+        pytest.param(1, id="In Process"),
+        pytest.param(2, id="Shared Pool"),
+    ],
+)
+def test_scenarios_equal_single_runs(scenario_file: Path, workers: int):
+    """Test that every scenario gives the statistics of a single seeded run."""
+    plan = load_scenarios(scenario_file, None)
+    results = {
+        result.scenario.name: result for result in run_scenarios(plan, workers=workers)
+    }
+    assert set(results) == {"favourite", "1", "serve"}
+
+    for scenario in plan.scenarios:
+        simulation = simulator(
+            scenario.winrate_player_1,
+            best_of_sets=scenario.best_of_sets,
+            seed=scenario.seed,
+            serve_winrates=scenario.serve_winrates,
+        )
+        simulation.run_simulation(
+            scenario.number_of_simulations, engine=scenario.engine, shard_size=100
+        )
+        assert results[scenario.name].statistics == simulation.statistics
+
+
+def test_command_line_streams_json_lines(scenario_file: Path, tmp_path: Path):
+    """Test that the CLI writes one summary line per scenario."""
+    output = tmp_path / "results.jsonl"
+    scenarios.main(
+        [
+            str(scenario_file),
+            "--no-cache",
+            "--config-cache-dir",
+            str(tmp_path / "cache"),
+            "--output",
+            str(output),
+        ]
+    )
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row["name"] for row in rows] == ["favourite", "1", "serve"]
+    assert all(row["number_of_matches"] == 250 for row in rows)
+    assert rows[0]["estimate"]["name"] == "plain"
+
+
+@pytest.mark.parametrize(
+    "statistics",
+    [
+        pytest.param(False, id="Summary"),
+        pytest.param(True, id="Statistics"),
+    ],
+)
+def test_command_line_writes_nan_as_null(
+    scenario_file: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    statistics: bool,
+):
+    """Test that undefined estimates of an empty run are written as null."""
+    result = ScenarioResult(
+        scenario=Scenario(name="empty"),
+        statistics={
+            "number_of_matches": 0,
+            "player_1_wins": 0,
+            "player_1_total_points_won": 0,
+            "player_2_total_points_won": 0,
+            "estimator": {
+                "name": "plain",
+                "estimate": float("nan"),
+                "standard_error": float("nan"),
+            },
+        },
+        seconds=0.0,
+    )
+    monkeypatch.setattr(scenarios, "run_scenarios", lambda *args, **kwargs: [result])
+    output = tmp_path / "results.jsonl"
+    arguments = [str(scenario_file), "--no-cache", "--output", str(output)]
+    arguments += ["--config-cache-dir", str(tmp_path / "cache")]
+    scenarios.main([*arguments, "--statistics"] if statistics else arguments)
+
+    line = output.read_text()
+    assert "NaN" not in line
+    row = json.loads(line)
+    estimate = row["estimator"] if statistics else row["estimate"]
+    assert estimate["estimate"] is None
+    assert statistics or row["mean_points"] is None
+
+
+def test_cached_startup_skips_heavy_imports(scenario_file: Path, tmp_path: Path):
+    """Test that loading a cached scenario file imports no heavy packages."""
+    cache_dir = tmp_path / "cache"
+    load_scenarios(scenario_file, cache_dir)
+    code = (
+        "import sys\n"
+        "from tennis_simulator.simulation.scenarios import load_scenarios\n"
+        f"load_scenarios({str(scenario_file)!r}, {str(cache_dir)!r})\n"
+        "print(sorted(m for m in ('numpy', 'yaml', 'pydantic', 'streamlit')"
+        " if m in sys.modules))\n"
+    )
+    source = str(Path(scenarios.__file__).parents[2])
+    loaded = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": source},
+    )
+    assert loaded.stdout.strip() == "[]"
+
+
+def test_config_manager_validates_config_folder():
+    """Test that the config folder loads into the pydantic models."""
+    config = ConfigManager(Path(__file__).parents[1] / "config")
+    config.load_config()
+    assert config.get().tennis_scoring.fifteen == "15"
+    assert config.get().simulation_parameters.court_type == "clay"
@@ -0,0 +1,106 @@
+"""Tests for simulator instrumentation, adaptive runs and serve win rates."""
+
+import logging
+
+import pytest
+
+from tennis_simulator.simulation.simulator import simulator
+
+
+@pytest.mark.parametrize(
+    "instrumentation, expected_records",
+    [
+        pytest.param("off", 0, id="Off"),
+        pytest.param("summary", 2, id="Summary Per Shard And Run"),
+        pytest.param("trace", 5, id="Sampled Traces And Summary"),
+    ],
+)
+def test_instrumentation_records(
+    caplog: pytest.LogCaptureFixture, instrumentation: str, expected_records: int
+):
+    """Test the number of log records at every instrumentation level."""
+    simulation = simulator(0.6, seed=1, instrumentation=instrumentation, trace_every=10)
+    with caplog.at_level(logging.INFO, logger="simulation"):
+        simulation.run_simulation(30, engine="scalar")
+    assert len(caplog.records) == expected_records
+
+
+def test_instrumentation_does_not_change_results():
+    """Test that tracing leaves the simulated statistics unchanged."""
+    traced = simulator(0.6, seed=1, instrumentation="trace", trace_every=1)
+    silent = simulator(0.6, seed=1)
+    traced.run_simulation(50)
+    silent.run_simulation(50)
+    assert traced.statistics == silent.statistics
+
+
+def test_invalid_instrumentation():
+    """Test that an unknown instrumentation level is rejected."""
+    with pytest.raises(ValueError, match="Invalid instrumentation"):
+        simulator(instrumentation="verbose")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_adaptive_run_stops_at_target(workers: int):
+    """Test that an adaptive run stops once the interval is narrow enough."""
+    simulation = simulator(0.55, seed=5)
+    simulation.run_adaptive(target_half_width=0.02, workers=workers, batch_size=200)
+
+    adaptive = simulation.statistics["adaptive"]
+    number_of_matches = simulation.statistics["number_of_matches"]
+    assert adaptive["converged"]
+    assert adaptive["half_width"] <= 0.02
+    assert number_of_matches % 200 == 0
+    # One batch fewer would not have been enough
+    assert number_of_matches > 200
+    assert adaptive["ci_lower"] <= adaptive["match_win_rate"] <= adaptive["ci_upper"]
+    estimator = simulation.statistics["estimator"]
+    assert estimator["name"] == "plain"
+    assert estimator["match_win_rate"] == pytest.approx(adaptive["match_win_rate"])
+
+
+def test_adaptive_run_is_worker_independent():
+    """Test that a seeded adaptive run uses the same matches for any workers."""
+    statistics = []
+    for workers in (1, 3):
+        simulation = simulator(0.5, seed=7)
+        simulation.run_adaptive(target_half_width=0.03, workers=workers, batch_size=150)
+        statistics.append(simulation.statistics)
+    assert statistics[0] == statistics[1]
+
+
+def test_adaptive_run_respects_max_simulations():
+    """Test that an unreachable target stops at max_simulations."""
+    simulation = simulator(0.5, seed=1)
+    simulation.run_adaptive(
+        target_half_width=0.001, batch_size=300, max_simulations=1000
+    )
+    assert simulation.statistics["number_of_matches"] == 1000
+    assert not simulation.statistics["adaptive"]["converged"]
+
+
+@pytest.mark.parametrize("engine", ["scalar", "batch"])
+def test_serve_winrates_match_exact_solution(engine: str):
+    """Test serve-aware runs of both engines against the exact solver."""
+    number_of_matches = 4000
+    simulation = simulator(serve_winrates=(0.62, 0.58), first_server=1, seed=2)
+    simulation.run_simulation(number_of_matches, engine=engine)
+
+    match = simulation.exact_probabilities().match
+    match_rate = simulation.statistics["player_1_wins"] / number_of_matches
+    standard_error = (match * (1 - match) / number_of_matches) ** 0.5
+    assert abs(match_rate - match) < 5 * standard_error
+
+
+@pytest.mark.parametrize(
+    "engine, estimator",
+    [
+        pytest.param("hierarchical", "plain", id="Hierarchical Engine"),
+        pytest.param("batch", "control_variate", id="Control Variate"),
+    ],
+)
+def test_serve_winrates_reject_constant_rate_methods(engine: str, estimator: str):
+    """Test that methods built on one point win rate reject serve win rates."""
+    simulation = simulator(serve_winrates=(0.62, 0.58), seed=2)
+    with pytest.raises(ValueError, match="one point win rate"):
+        simulation.run_simulation(10, engine=engine, estimator=estimator)
@@ -0,0 +1,121 @@
+"""Tests for resumable spooled runs."""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from tennis_simulator.simulation.simulator import simulator
+from tennis_simulator.simulation.spool import Spool, main
+
+
+def _simulation() -> simulator:
+    """Seeded simulator shared by the spool tests."""
+    return simulator(0.55, seed=11)
+
+
+def _fresh_statistics(engine: str) -> dict:
+    """Statistics of the same run without a spool."""
+    simulation = _simulation()
+    simulation.run_simulation(2200, engine=engine, shard_size=500)
+    return simulation.statistics
+
+
+@pytest.mark.parametrize(
+    "engine, workers",
+    [
+        pytest.param("batch", 1, id="Batch"),
+        pytest.param("scalar", 1, id="Scalar"),
+        pytest.param("batch", 2, id="Batch Two Workers"),
+    ],
+)
+def test_spooled_run_matches_run_simulation(tmp_path: Path, engine: str, workers: int):
+    """Test that the reduced shards equal an in-memory run with the same seed."""
+    simulation = _simulation()
+    simulation.run_spooled(
+        tmp_path, 2200, engine=engine, workers=workers, shard_size=500
+    )
+    assert simulation.statistics == _fresh_statistics(engine)
+    status = Spool(tmp_path).status()
+    assert (status.total, status.done, status.claimed) == (5, 5, 0)
+
+
+def test_interrupted_run_resumes_missing_shards(tmp_path: Path):
+    """Test that a restarted job keeps the shards that are already done."""
+    cancel = threading.Event()
+    cancel.set()
+    simulation = _simulation()
+    simulation.run_spooled(tmp_path, 2200, shard_size=500, cancel=cancel)
+    assert simulation.statistics["cancelled"]
+    assert simulation.statistics["number_of_matches"] == 0
+
+    # A worker on another node stops after two shards
+    assert Spool(tmp_path).work(max_shards=2) == 2
+    done = sorted((tmp_path / "done").glob("*.pkl"))
+    modified = [path.stat().st_mtime_ns for path in done]
+
+    simulation.run_spooled(tmp_path, 2200, shard_size=500)
+    assert simulation.statistics == _fresh_statistics("batch")
+    assert [path.stat().st_mtime_ns for path in done] == modified
+
+
+@pytest.mark.parametrize(
+    "workers",
+    [
+        pytest.param(1, id="In Process"),
+        pytest.param(2, id="Two Workers"),
+    ],
+)
+def test_cancel_stops_local_workers(tmp_path: Path, workers: int):
+    """Test that a set cancel event stops the local workers of any count."""
+    cancel = threading.Event()
+    cancel.set()
+    simulation = _simulation()
+    simulation.run_spooled(
+        tmp_path, 2200, workers=workers, shard_size=500, cancel=cancel
+    )
+    assert simulation.statistics["cancelled"]
+    assert Spool(tmp_path).status().done == 0
+
+
+def test_unseeded_runs_are_not_spooled(tmp_path: Path):
+    """Test that a run without a seed cannot be spooled."""
+    with pytest.raises(ValueError, match="seed"):
+        simulator(0.55).run_spooled(tmp_path, 1000, shard_size=500)
+    assert not (tmp_path / "job.pkl").exists()
+
+
+def test_spool_rejects_other_parameters(tmp_path: Path):
+    """Test that a spool cannot be resumed with different parameters."""
+    _simulation().run_spooled(tmp_path, 1000, shard_size=500)
+    with pytest.raises(ValueError, match="other parameters"):
+        simulator(0.6, seed=11).run_spooled(tmp_path, 1000, shard_size=500)
+
+
+def test_expired_claims_are_taken_over(tmp_path: Path):
+    """Test that live claims are skipped and expired claims are run."""
+    cancel = threading.Event()
+    cancel.set()
+    _simulation().run_spooled(tmp_path, 1500, shard_size=500, cancel=cancel)
+    claims = tmp_path / "claims"
+    (claims / "000000").write_text("crashed worker")
+    expired = time.time() - 120
+    os.utime(claims / "000000", (expired, expired))
+    (claims / "000001").write_text("running worker")
+
+    spool = Spool(tmp_path, lease_seconds=60)
+    assert spool.work() == 2
+    status = spool.status()
+    assert (status.done, status.claimed, status.complete) == (2, 1, False)
+    assert len(list(spool.results())) == 2
+
+
+def test_command_line_worker(tmp_path: Path):
+    """Test that the command line worker runs the open shards of a job."""
+    cancel = threading.Event()
+    cancel.set()
+    _simulation().run_spooled(tmp_path, 1500, shard_size=500, cancel=cancel)
+    main([str(tmp_path), "--max-shards", "2"])
+    assert Spool(tmp_path).status().done == 2
@@ -0,0 +1,83 @@
+"""Tests for win-rate sweeps with common random numbers."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tennis_simulator.analysis.confidence import wilson_interval
+from tennis_simulator.simulation.batch import simulate_batch, simulate_grid
+from tennis_simulator.simulation.sweep import main, sweep, winrate_grid
+
+
+def test_grid_points_share_random_numbers():
+    """Test that equal win rates in one grid produce identical matches."""
+    first, second = simulate_grid(200, [0.55, 0.55], rng=np.random.default_rng(1))
+    assert first.match_results() == second.match_results()
+    np.testing.assert_array_equal(first.points_won, second.points_won)
+
+
+def test_single_point_grid_equals_batch():
+    """Test that a one-point grid replays the batch engine stream."""
+    (grid,) = simulate_grid(200, [0.6], rng=np.random.default_rng(2))
+    batch = simulate_batch(200, 0.6, rng=np.random.default_rng(2))
+    assert grid.match_results() == batch.match_results()
+
+
+@pytest.mark.parametrize(
+    "start, stop, step, expected",
+    [
+        pytest.param(0.4, 0.5, 0.05, [0.4, 0.45, 0.5], id="Inclusive Stop"),
+        pytest.param(0.4, 0.41, 0.005, [0.4, 0.405, 0.41], id="Rounded Steps"),
+        pytest.param(0.5, 0.5, 0.1, [0.5], id="Single Point"),
+    ],
+)
+def test_winrate_grid(start: float, stop: float, step: float, expected: list[float]):
+    """Test building a win-rate grid."""
+    assert winrate_grid(start, stop, step) == expected
+
+
+@pytest.mark.parametrize(
+    "successes, trials",
+    [
+        pytest.param(0, 100, id="No Successes"),
+        pytest.param(50, 100, id="Half"),
+        pytest.param(100, 100, id="All Successes"),
+    ],
+)
+def test_wilson_interval_contains_estimate(successes: int, trials: int):
+    """Test that the interval is inside [0, 1] and contains the estimate."""
+    lower, upper = wilson_interval(successes, trials)
+    assert 0 <= lower <= successes / trials <= upper <= 1
+    assert upper - lower > 0
+
+
+def test_sweep_is_worker_independent_and_covers_exact_values():
+    """Test a seeded sweep over two formats against the exact solver."""
+    kwargs = {
+        "winrates_player_1": [0.48, 0.5, 0.52],
+        "best_of_sets": (3, 5),
+        "number_of_simulations": 2000,
+        "seed": 3,
+        "shard_size": 700,
+        "confidence": 0.999,
+    }
+    points = sweep(**kwargs, workers=1)
+    assert points == sweep(**kwargs, workers=2)
+    assert [(p.best_of_sets, p.winrate_player_1) for p in points] == [
+        (sets, winrate) for sets in (3, 5) for winrate in (0.48, 0.5, 0.52)
+    ]
+    for point in points:
+        assert point.ci_lower <= point.exact_match_win_probability <= point.ci_upper
+
+
+def test_sweep_cli_writes_csv(tmp_path: Path):
+    """Test that the command line writes one CSV row per grid point."""
+    output = tmp_path / "sweep.csv"
+    main(
+        ["--start", "0.5", "--stop", "0.6", "--step", "0.05", "--simulations", "50"]
+        + ["--seed", "1", "--output", str(output)]
+    )
+    lines = output.read_text().splitlines()
+    assert lines[0].startswith("winrate_player_1,best_of_sets")
+    assert len(lines) == 4
@@ -1,9 +1,13 @@
 """Tests for tennis scoring module."""
 
-from typing import List
+from typing import Any, List
 import pytest
 
-from src.tennis_simulator.tennis_scoring.tennis_score import TennisScore
+from src.tennis_simulator.tennis_scoring.tennis_score import (
+    PLAYER_1,
+    PLAYER_2,
+    TennisScore,
+)
 
 
 @pytest.fixture
@@ -102,6 +106,7 @@ def test_update_set_standard(
         pytest.param(7, 5, [[7], [6]], id="Tiebreak Player 1 Wins"),
         pytest.param(5, 7, [[6], [7]], id="Tiebreak Player 2 Wins"),
         pytest.param(10, 9, [[], []], id="Tiebreak - Extended"),
+        pytest.param(7, 9, [[6], [7]], id="Tiebreak Player 2 Wins - Extended"),
         pytest.param(5, 1, [[], []], id="Tiebreak - Not Finished"),
         pytest.param(0, 6, [[], []], id="Tiebreak - Not Finished"),
     ],
@@ -120,3 +125,154 @@ def test_update_set_tiebreak(
     tennis_score._update_set()
     assert tennis_score.score["player_1_sets"] == expected[0]
     assert tennis_score.score["player_2_sets"] == expected[1]
+
+
+@pytest.mark.parametrize(
+    "players, expected_score",
+    [
+        pytest.param(
+            ["player_1", "player_2", "player_1"],
+            [30, 15],
+            id="Regular Points",
+        ),
+        pytest.param(
+            ["player_1"] * 3 + ["player_2"] * 3 + ["player_1", "player_2"],
+            [40, 40],
+            id="Back To Deuce",
+        ),
+        pytest.param(
+            ["player_1"] * 3 + ["player_2"] * 4,
+            [40, "Advantage"],
+            id="Advantage Player 2",
+        ),
+    ],
+)
+def test_deuce_and_advantage(
+    tennis_score: TennisScore, players: list[str], expected_score: list[Any]
+):
+    """Test point sequences through deuce and advantage."""
+    for player in players:
+        tennis_score._update_score(player)
+    assert [tennis_score.score["player_1"], tennis_score.score["player_2"]] == (
+        expected_score
+    )
+
+
+def test_score_view_renders_dict():
+    """Test that the score view renders the full score dict."""
+    tennis_score = TennisScore()
+    for _ in range(25):
+        tennis_score.win_point(PLAYER_1)
+    tennis_score.win_point(PLAYER_2)
+
+    assert dict(tennis_score.score) == {
+        "player_1": 15,
+        "player_2": 15,
+        "player_1_games": 0,
+        "player_2_games": 0,
+        "player_1_tiebreak_points": 0,
+        "player_2_tiebreak_points": 0,
+        "player_1_sets": [6],
+        "player_2_sets": [0],
+        "player_1_sets_won": 1,
+        "player_2_sets_won": 0,
+        "player_1_total_points_won": 25,
+        "player_2_total_points_won": 1,
+    }
+
+
+def test_copy_is_independent():
+    """Test that a snapshot does not change with the original score."""
+    tennis_score = TennisScore()
+    for _ in range(24):
+        tennis_score.win_point(PLAYER_1)
+    snapshot = tennis_score.copy()
+    for _ in range(24):
+        tennis_score.win_point(PLAYER_1)
+
+    assert snapshot.match_result() == "6-0,"
+    assert snapshot.winner is None
+    assert tennis_score.match_result() == "6-0,6-0,"
+    assert tennis_score.winner == "player_1"
+    assert tennis_score.winner_id == PLAYER_1
+
+
+def test_invalid_player_identifier(tennis_score: TennisScore):
+    """Test that unknown player identifiers are rejected."""
+    with pytest.raises(ValueError, match="Invalid player identifier"):
+        tennis_score._update_score("player_3")
+
+
+def test_server_alternates_games_and_tiebreak_points():
+    """Test the serving order through a tiebreak and into the next set."""
+    tennis_score = TennisScore(server=PLAYER_2)
+    servers = []
+    for game in range(12):
+        servers.append(tennis_score.server)
+        for _ in range(4):
+            tennis_score.win_point(game % 2)
+    assert servers == [PLAYER_2, PLAYER_1] * 6
+
+    tiebreak_servers = []
+    for point in range(20):
+        tiebreak_servers.append(tennis_score.server)
+        tennis_score.win_point(point % 2)
+    tiebreak_servers.append(tennis_score.server)
+    for _ in range(2):
+        tennis_score.win_point(PLAYER_1)
+
+    assert tiebreak_servers[:7] == [PLAYER_2, PLAYER_1, PLAYER_1, PLAYER_2] + [
+        PLAYER_2,
+        PLAYER_1,
+        PLAYER_1,
+    ]
+    assert tiebreak_servers[20] == PLAYER_2
+    assert tennis_score.match_result() == "7-6,"
+    # Player 1 received the first tiebreak point and serves the next set
+    assert tennis_score.server == PLAYER_1
+
+
+def test_match_statistics_of_a_deuce_game():
+    """Test deuce, advantage and break counters of a game won by the receiver."""
+    tennis_score = TennisScore(track_statistics=True)
+    # 0-40, back to deuce, advantage player 1 lost, advantage player 2 won
+    for player in [PLAYER_2] * 3 + [PLAYER_1] * 3 + [PLAYER_2, PLAYER_1]:
+        tennis_score.win_point(player)
+    tennis_score.win_point(PLAYER_2)
+    tennis_score.win_point(PLAYER_2)
+
+    assert tennis_score.match_statistics == {
+        "points": 10,
+        "games": 1,
+        "deuces": 2,
+        "advantages_converted": 1,
+        "break_points": 5,
+        "breaks": 1,
+        "tiebreaks": 0,
+    }
+    assert TennisScore().match_statistics is None
+
+
+def test_match_statistics_count_tiebreaks():
+    """Test that a tiebreak is counted once when the set reaches 6-6."""
+    tennis_score = TennisScore(track_statistics=True)
+    for game in range(12):
+        for _ in range(4):
+            tennis_score.win_point(game % 2)
+    for _ in range(7):
+        tennis_score.win_point(PLAYER_1)
+
+    statistics = tennis_score.match_statistics
+    assert tennis_score.match_result() == "7-6,"
+    assert statistics["tiebreaks"] == 1
+    assert statistics["games"] == 13
+    # Every game is held by its server
+    assert statistics["breaks"] == statistics["break_points"] == 0
+
+
+def test_winner_is_assignable(tennis_score: TennisScore):
+    """Test that the winner can still be set by its player identifier."""
+    tennis_score.winner = "player_2"
+    assert (tennis_score.winner, tennis_score.winner_id) == ("player_2", PLAYER_2)
+    tennis_score.winner = None
+    assert tennis_score.winner_id is None
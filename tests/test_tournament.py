@@ -0,0 +1,95 @@
+"""Tests for knockout tournament simulation."""
+
+import numpy as np
+import pytest
+
+from tennis_simulator.analysis.markov import match_win_probability
+from tennis_simulator.simulation.tournament import (
+    BYE,
+    exact_advancement,
+    head_to_head,
+    simulate_tournament,
+)
+
+
+def _strengths(players: int) -> np.ndarray:
+    """Point win rates of players with evenly spaced skill levels."""
+    skill = np.linspace(0.05, -0.05, players)
+    return 0.5 + skill[:, None] - skill[None, :]
+
+
+def test_head_to_head_matches_solver():
+    """Test head-to-head probabilities against the match solver."""
+    strengths = _strengths(6)
+    probabilities = head_to_head(strengths, best_of_sets=5)
+
+    assert probabilities + probabilities.T == pytest.approx(np.ones((6, 6)))
+    assert probabilities[1, 4] == pytest.approx(
+        match_win_probability(strengths[1, 4], best_of_sets=5)
+    )
+
+
+def test_head_to_head_with_serve_strengths():
+    """Test that serve strengths without serve advantage match point strengths."""
+    strengths = _strengths(4)
+    serve = head_to_head(1 - strengths.T, serve=True)
+    assert serve == pytest.approx(head_to_head(strengths))
+
+
+def test_head_to_head_rejects_inconsistent_strengths():
+    """Test that point strengths of a pairing must add up to one."""
+    strengths = _strengths(4)
+    strengths[3, 0] = 0.5
+    with pytest.raises(ValueError, match="add up to one"):
+        head_to_head(strengths)
+    # Serve strengths of a pairing are independent
+    head_to_head(strengths, serve=True)
+
+
+@pytest.mark.parametrize(
+    "bracket",
+    [
+        pytest.param(None, id="Full Draw"),
+        pytest.param([0, BYE, 2, 3, 4, 5, BYE, 7], id="Draw With Byes"),
+    ],
+)
+def test_simulation_matches_exact_advancement(bracket: list[int] | None):
+    """Test simulated advancement against the exact bracket recursion."""
+    probabilities = head_to_head(_strengths(8))
+    exact = exact_advancement(probabilities, bracket)
+    result = simulate_tournament(probabilities, bracket, 40_000, seed=3)
+
+    assert result.rounds == 3
+    assert exact.advancement.sum(axis=0)[1:] == pytest.approx([4, 2, 1])
+    assert np.abs(result.advancement - exact.advancement).max() < 0.015
+
+
+def test_byes_advance_their_opponent():
+    """Test that a player drawn against a bye reaches the second round."""
+    result = exact_advancement(head_to_head(_strengths(3)), [0, BYE, 1, 2])
+    assert result.advancement[0, 1] == 1.0
+    assert result.title.sum() == pytest.approx(1.0)
+
+
+def test_simulation_is_worker_independent():
+    """Test that a seeded simulation does not depend on the worker count."""
+    probabilities = head_to_head(_strengths(16))
+    serial = simulate_tournament(probabilities, None, 3000, seed=1, shard_size=1000)
+    parallel = simulate_tournament(
+        probabilities, None, 3000, seed=1, workers=2, shard_size=1000
+    )
+    np.testing.assert_array_equal(serial.advancement, parallel.advancement)
+
+
+@pytest.mark.parametrize(
+    "bracket, message",
+    [
+        pytest.param([0, 1, 2], "power of two", id="Bracket Size"),
+        pytest.param([0, 1, 1, 2], "only enter", id="Duplicate Player"),
+        pytest.param([0, 1, 2, 9], "player ids", id="Unknown Player"),
+    ],
+)
+def test_invalid_bracket(bracket: list[int], message: str):
+    """Test that malformed draws are rejected."""
+    with pytest.raises(ValueError, match=message):
+        simulate_tournament(head_to_head(_strengths(4)), bracket, 10)
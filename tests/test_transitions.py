@@ -0,0 +1,69 @@
+"""Tests for the precomputed scoring transition table."""
+
+import random
+
+import pytest
+
+from tennis_simulator.tennis_scoring.tennis_score import TennisScore
+from tennis_simulator.tennis_scoring.transitions import (
+    MATCH_WON,
+    SET_WON,
+    STATE_SIZE,
+    TIEBREAK_DEUCE,
+    transition_table,
+)
+
+
+@pytest.mark.parametrize(
+    "best_of_sets, expected_states",
+    # Scores within a set per sets won, for either server of the current game
+    [
+        pytest.param(3, 738 * 4 * 2, id="Best Of 3"),
+        pytest.param(5, 738 * 9 * 2, id="Best Of 5"),
+    ],
+)
+def test_number_of_states(best_of_sets: int, expected_states: int):
+    """Test the size of the reachable state space."""
+    assert len(transition_table(best_of_sets).states) == expected_states
+
+
+@pytest.mark.parametrize("best_of_sets", [3, 5])
+def test_table_matches_tennis_score_rules(best_of_sets: int):
+    """Test every state and point winner against the TennisScore rules."""
+    table = transition_table(best_of_sets)
+    for index, state in enumerate(table.states):
+        for player in (0, 1):
+            tennis_score = TennisScore(best_of_sets=best_of_sets)
+            tennis_score._state[:STATE_SIZE] = state
+            tennis_score._win_point_by_rules(player)
+
+            transition = 2 * index + player
+            events = table.events[transition]
+            expected_state = list(tennis_score._state[:STATE_SIZE])
+            if events & TIEBREAK_DEUCE:
+                expected_state[4:6] = [6, 6]
+            if events & MATCH_WON:
+                assert table.next_state[transition] == table.finished
+                assert tennis_score.winner_id == player
+            else:
+                assert table.states[table.next_state[transition]] == tuple(
+                    expected_state
+                )
+            expected_sets = tennis_score._set_games or [None]
+            assert table.set_games[transition] == expected_sets[0]
+            assert bool(events & SET_WON) == bool(tennis_score._set_games)
+
+
+def test_packed_score_matches_rules():
+    """Test table driven points against rule driven points for whole matches."""
+    rng = random.Random(5)
+    for _ in range(200):
+        packed, rules = TennisScore(), TennisScore()
+        while packed.winner is None:
+            player = int(rng.random() < 0.5)
+            packed.win_point(player)
+            rules._win_point_by_rules(player)
+            assert dict(packed.copy().score) == dict(rules.score)
+            assert packed.server == rules.server
+        assert packed.winner == rules.winner
+        assert packed.match_result() == rules.match_result()